@@ -6,6 +6,9 @@ e boas-vindas para o usuário.
 """
 
 import streamlit as st
+from core.image_utils import resolve_image
+from core.metrics import page_span, span
+from core.warmup import start_background_warmup
 
 # Configuração da página (deve ser o primeiro comando Streamlit)
 st.set_page_config(
@@ -14,21 +17,35 @@ st.set_page_config(
     layout="centered"
 )
 
-st.title("🌟 Bem-vinda ao App de Aprendizagem! 🌟")
 
-# Personalização simples
-# nome = st.text_input("Qual o seu nome, minha estrela?", "Exploradora")
-nome = "Paulinha"
+def main():
+    """Função principal para renderizar a página inicial."""
+    # Aquece o processo em segundo plano (só na primeira visita ao servidor)
+    start_background_warmup()
 
-st.header(f"Olá, {nome}! Vamos aprender juntos?")
+    st.title("🌟 Bem-vinda ao App de Aprendizagem! 🌟")
 
-# Você pode trocar esta imagem por uma sua em assets/images/
-st.image("assets/images/paulinha.jpg", width=300)
+    # Personalização simples
+    # nome = st.text_input("Qual o seu nome, minha estrela?", "Exploradora")
+    nome = "Paulinha"
+
+    st.header(f"Olá, {nome}! Vamos aprender juntos?")
+
+    # Você pode trocar esta imagem por uma sua em assets/images/
+    imagem = resolve_image("assets/images/paulinha.jpg")
+    if imagem:
+        with span("image.render"):
+            st.image(imagem, width=300)
+
+    st.info(
+        "Use o menu à esquerda (clique na setinha `>` no canto superior esquerdo) "
+        "para escolher uma atividade legal!"
+    )
+
+    if st.button("Começar a Aventura! 🎉"):
+        st.balloons()
 
-st.info(
-    "Use o menu à esquerda (clique na setinha `>` no canto superior esquerdo) "
-    "para escolher uma atividade legal!"
-)
 
-if st.button("Começar a Aventura! 🎉"):
-    st.balloons()
+if __name__ == "__main__":
+    with page_span(__file__):
+        main()
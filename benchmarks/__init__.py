@@ -0,0 +1 @@
+"""Scripts de medição de desempenho (não são carregados pelas páginas)."""
@@ -0,0 +1,319 @@
+"""Benchmark das páginas, rodando sem navegador (AppTest).
+
+Simula crianças usando cada página (`0_🏠_Bem_Vinda.py` e `pages/`)
+com o `streamlit.testing.v1.AppTest` e o motor de TTS falso (`stub`),
+e mede para cada interação (carregar a página, trocar a sílaba, clicar
+em uma opção, montar a frase, enviar o ditado...):
+- a latência das execuções do script (percentis 50 e 95);
+- quantas vezes o script rodou por ação (cada `st.rerun` conta);
+- quantos bytes de mídia (áudio e imagem) foram enviados pelo Streamlit.
+  Imagens e áudios servidos por URL estática (ver `core.media_registry`)
+  não passam pelo Streamlit e não contam.
+
+Os resultados são comparados com uma linha de base gravada (por padrão
+`benchmarks/baselines/bench_pages.json`); uma piora além da tolerância
+faz o comando terminar com código 1.
+
+Uso:
+    python -m benchmarks.bench_pages [--iterations 10]
+    python -m benchmarks.bench_pages --update-baseline
+
+As latências dependem da máquina: grave a linha de base na mesma
+máquina em que o benchmark vai rodar.
+"""
+
+import os
+import tempfile
+
+# O ambiente precisa estar pronto antes de importar o `core`: TTS falso,
+# sorteios reproduzíveis, caches/banco em uma pasta temporária e sem o
+# aquecimento em segundo plano (que disputaria a CPU com as medições)
+_WORKDIR = tempfile.mkdtemp(prefix="bench_pages_")
+os.environ.setdefault("ALFABETIZACAO_TTS_BACKENDS", "stub")
+os.environ.setdefault("ALFABETIZACAO_CHALLENGE_SEED", "0")
+os.environ.setdefault("ALFABETIZACAO_WARMUP", "0")
+os.environ.setdefault("ALFABETIZACAO_AUDIO_DISK_CACHE_DIR", os.path.join(_WORKDIR, "audio"))
+os.environ.setdefault("ALFABETIZACAO_PROGRESS_DB", os.path.join(_WORKDIR, "progress.sqlite3"))
+os.environ.setdefault("ALFABETIZACAO_MEDIA_DIR", os.path.join(_WORKDIR, "media"))
+
+import argparse  # noqa: E402
+import json  # noqa: E402
+import sys  # noqa: E402
+import time  # noqa: E402
+from collections import defaultdict  # noqa: E402
+from pathlib import Path  # noqa: E402
+from typing import Any, Callable, Dict, List, Optional  # noqa: E402
+
+import numpy as np  # noqa: E402
+import streamlit  # noqa: E402
+from streamlit.runtime.scriptrunner import script_runner  # noqa: E402
+from streamlit.testing.v1 import AppTest  # noqa: E402
+
+from core import config  # noqa: E402
+from core.challenge_store import get_challenge_store  # noqa: E402
+
+BASELINE_PATH = Path(__file__).resolve().parent / "baselines" / "bench_pages.json"
+
+
+class _Probe:
+    """Conta as execuções do script e os bytes de mídia enviados."""
+
+    def __init__(self):
+        self.runs = 0
+        self.media_bytes = 0
+
+    def reset(self):
+        self.runs = 0
+        self.media_bytes = 0
+
+    def install(self):
+        original_exec = script_runner.exec_func_with_error_handling
+
+        def counting_exec(*args, **kwargs):
+            self.runs += 1
+            return original_exec(*args, **kwargs)
+
+        script_runner.exec_func_with_error_handling = counting_exec
+
+        for name in ("audio", "image"):
+            original = getattr(streamlit, name)
+            setattr(streamlit, name, self._measuring(original))
+
+    def _measuring(self, element: Callable[..., Any]) -> Callable[..., Any]:
+        def wrapper(data, *args, **kwargs):
+            self.media_bytes += _media_size(data)
+            return element(data, *args, **kwargs)
+        return wrapper
+
+
+def _media_size(data: Any) -> int:
+    """Bytes que o Streamlit envia para um st.audio/st.image."""
+    if isinstance(data, (bytes, bytearray)):
+        return len(data)
+    if isinstance(data, (str, Path)):
+        text = str(data)
+        if text.startswith(("http://", "https://", "/")) and not os.path.exists(text):
+            return 0  # URL: o navegador baixa direto, sem passar pelo Streamlit
+        path = Path(text)
+        if not path.is_absolute():
+            path = config.PROJECT_ROOT / path
+        return path.stat().st_size if path.is_file() else 0
+    return 0
+
+
+def _page(prefix: str) -> str:
+    if prefix == "0":
+        return str(config.PROJECT_ROOT / "0_🏠_Bem_Vinda.py")
+    return str(next((config.PROJECT_ROOT / "pages").glob(f"{prefix}_*.py")))
+
+
+def _challenge(at: AppTest, game_key: str) -> Dict[str, Any]:
+    index = at.session_state[f"{game_key}_challenge_index"]
+    return get_challenge_store().get(game_key).challenges[index]
+
+
+def _button(at: AppTest, label: str):
+    return next(b for b in at.button if b.label.startswith(label))
+
+
+# --- Cenários: cada função recebe a página carregada e uma função
+# `step(nome, ação)` que mede uma interação ---
+
+def _home(at, step):
+    step("começar", lambda: _button(at, "Começar").click().run())
+
+
+def _letters(at, step):
+    letters = at.selectbox[0].options
+    step("trocar_letra", lambda: at.selectbox[0].select(letters[1]).run())
+    step("ouvir_palavra", lambda: _button(at, "Ouvir a palavra").click().run())
+
+
+def _syllables(at, step):
+    consonants, vowels = at.radio[0], at.radio[1]
+    step("trocar_consoante", lambda: consonants.set_value(consonants.options[1]).run())
+    step("trocar_vogal", lambda: vowels.set_value(vowels.options[2]).run())
+
+
+def _complete_word(at, step):
+    challenge = _challenge(at, "complete_word")
+    wrong = next(o for o in challenge["options"] if o != challenge["correct"])
+    step("opção_errada", lambda: at.button(key=f"complete_word_{wrong}").click().run())
+    step("opção_certa", lambda: at.button(
+        key=f"complete_word_{challenge['correct']}").click().run())
+    step("próxima", lambda: _button(at, "Próxima").click().run())
+
+
+def _image_to_word(at, step):
+    challenge = _challenge(at, "image_to_word")
+
+    def submit(answer):
+        at.text_input[0].input(answer)
+        return _button(at, "Verificar").click().run()
+
+    step("enviar_errado", lambda: submit("xyz"))
+    step("enviar_certo", lambda: submit(challenge["correct"]))
+    step("próxima", lambda: _button(at, "Próxima").click().run())
+
+
+def _scramble_sentence(at, step):
+    challenge = _challenge(at, "scramble_sentence")
+    for word in challenge["correct"].split():
+        step("clicar_palavra", lambda: next(
+            b for b in at.button if b.label == word).click().run())
+    step("verificar", lambda: _button(at, "Verificar").click().run())
+    step("próxima", lambda: _button(at, "Próxima").click().run())
+
+
+def _dictation(at, step):
+    challenge = _challenge(at, "dictation")
+    step("ouvir_frase", lambda: _button(at, "Ouvir a frase").click().run())
+
+    def submit():
+        at.text_input[0].input(challenge["correct"])
+        return _button(at, "Verificar").click().run()
+
+    step("enviar_ditado", submit)
+    step("próximo", lambda: _button(at, "Próximo").click().run())
+
+
+def _dashboard(at, step):
+    pass
+
+
+SCENARIOS = {
+    "home": ("0", _home),
+    "letters": ("1", _letters),
+    "syllables": ("2", _syllables),
+    "complete_word": ("3", _complete_word),
+    "image_to_word": ("4", _image_to_word),
+    "scramble_sentence": ("5", _scramble_sentence),
+    "dictation": ("6", _dictation),
+    "dashboard": ("7", _dashboard),
+}
+
+
+def run_benchmark(iterations: int,
+                  scenarios: Optional[List[str]] = None) -> Dict[str, Dict[str, float]]:
+    """Roda os cenários e resume as medições de cada interação.
+
+    Cada iteração é uma sessão nova (um novo AppTest), como uma criança
+    abrindo a página; os caches do processo (áudio, conteúdo) continuam
+    aquecidos entre as iterações, como em um servidor em uso.
+
+    Returns:
+        Para cada "cenário/interação": amostras, latência p50 e p95 (ms),
+        execuções do script por ação e bytes de mídia por ação.
+    """
+    probe = _Probe()
+    probe.install()
+    samples: Dict[str, List[tuple]] = defaultdict(list)
+
+    for name in scenarios or SCENARIOS:
+        prefix, interact = SCENARIOS[name]
+        for _ in range(iterations):
+            def step(action: str, perform: Callable[[], Any]):
+                probe.reset()
+                start = time.perf_counter()
+                at = perform()
+                elapsed = time.perf_counter() - start
+                if at is not None and at.exception:
+                    raise RuntimeError(f"{name}/{action}: {at.exception[0].value}")
+                samples[f"{name}/{action}"].append(
+                    (elapsed, probe.runs, probe.media_bytes)
+                )
+                return at
+
+            at = AppTest.from_file(_page(prefix), default_timeout=60)
+            step("carregar", at.run)
+            interact(at, step)
+
+    results = {}
+    for key, values in samples.items():
+        elapsed, runs, media = (np.array(column, dtype=float) for column in zip(*values))
+        results[key] = {
+            "samples": len(values),
+            "p50_ms": round(float(np.percentile(elapsed, 50)) * 1000, 2),
+            "p95_ms": round(float(np.percentile(elapsed, 95)) * 1000, 2),
+            "runs_per_action": round(float(runs.mean()), 2),
+            "media_bytes_per_action": round(float(media.mean())),
+        }
+    return results
+
+
+def compare(results: Dict[str, Dict[str, float]],
+            baseline: Dict[str, Dict[str, float]],
+            tolerance: float) -> List[str]:
+    """Lista as pioras em relação à linha de base.
+
+    Latência: p50 acima de `(1 + tolerance)` vezes a base (e mais de
+    5 ms). Execuções por ação: qualquer aumento. Mídia: mais de 5% (e
+    mais de 1 KB) acima da base.
+    """
+    regressions = []
+    for key, current in results.items():
+        base = baseline.get(key)
+        if base is None:
+            continue
+        if (current["p50_ms"] > base["p50_ms"] * (1 + tolerance)
+                and current["p50_ms"] - base["p50_ms"] > 5):
+            regressions.append(f"{key}: p50 {base['p50_ms']} -> {current['p50_ms']} ms")
+        if current["runs_per_action"] > base["runs_per_action"] + 0.01:
+            regressions.append(f"{key}: execuções/ação {base['runs_per_action']} "
+                               f"-> {current['runs_per_action']}")
+        base_media = base["media_bytes_per_action"]
+        if current["media_bytes_per_action"] > max(base_media * 1.05, base_media + 1024):
+            regressions.append(f"{key}: mídia/ação {base_media} "
+                               f"-> {current['media_bytes_per_action']} bytes")
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Ponto de entrada da linha de comando."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=10,
+                        help="Sessões por cenário (padrão: %(default)s)")
+    parser.add_argument("--scenario", action="append", choices=sorted(SCENARIOS),
+                        help="Roda só este cenário (pode repetir)")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH,
+                        help="Arquivo da linha de base (padrão: %(default)s)")
+    parser.add_argument("--update-baseline", action="store_true",
+                        help="Grava os resultados como a nova linha de base")
+    parser.add_argument("--tolerance", type=float, default=0.5,
+                        help="Piora aceita na latência p50 (padrão: %(default)s = 50%%)")
+    args = parser.parse_args(argv)
+
+    results = run_benchmark(args.iterations, args.scenario)
+
+    print(f"{'interação':<36} {'p50 ms':>8} {'p95 ms':>8} {'exec/ação':>10} {'mídia KB':>9}")
+    for key, r in results.items():
+        print(f"{key:<36} {r['p50_ms']:>8.1f} {r['p95_ms']:>8.1f} "
+              f"{r['runs_per_action']:>10.2f} {r['media_bytes_per_action'] / 1024:>9.1f}")
+
+    if args.update_baseline:
+        baseline = {}
+        if args.baseline.exists() and args.scenario:
+            baseline = json.loads(args.baseline.read_text("utf-8"))
+        baseline.update(results)
+        args.baseline.parent.mkdir(parents=True, exist_ok=True)
+        args.baseline.write_text(json.dumps(baseline, indent=2, ensure_ascii=False) + "\n",
+                                 "utf-8")
+        print(f"\nLinha de base gravada em {args.baseline}")
+        return 0
+
+    if not args.baseline.exists():
+        print(f"\nSem linha de base em {args.baseline} (use --update-baseline).")
+        return 0
+    regressions = compare(results, json.loads(args.baseline.read_text("utf-8")),
+                          args.tolerance)
+    if regressions:
+        print("\nPioras em relação à linha de base:")
+        for regression in regressions:
+            print(f"  - {regression}")
+        return 1
+    print("\nSem pioras em relação à linha de base.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
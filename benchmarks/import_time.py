@@ -0,0 +1,82 @@
+"""Relatório do tempo de importação de cada página.
+
+Carrega cada página (`0_🏠_Bem_Vinda.py` e `pages/`) em um processo
+novo com `python -X importtime`, sem rodar o `main()` dela, e mostra o
+tempo total das importações e os pacotes que mais pesaram. É o custo
+que a primeira criança a abrir a página paga em um servidor recém
+iniciado (antes do aquecimento de `core.warmup`).
+
+Uso:
+    python -m benchmarks.import_time [--top 5]
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Carrega a página como módulo: o `if __name__ == "__main__"` não roda
+_LOADER = "import runpy, sys; runpy.run_path(sys.argv[1], run_name='import_time')"
+
+
+def page_files() -> List[Path]:
+    """Lista as páginas da aplicação, na ordem do menu."""
+    return sorted(ROOT.glob("0_*.py")) + sorted((ROOT / "pages").glob("*.py"))
+
+
+def parse_importtime(stderr: str) -> Dict[str, float]:
+    """Soma o tempo próprio (em segundos) de cada pacote de primeiro nível.
+
+    Args:
+        stderr: A saída de erro de um `python -X importtime`.
+
+    Returns:
+        Um dicionário pacote -> segundos.
+    """
+    packages: Dict[str, float] = defaultdict(float)
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:"):].split("|")
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue  # Cabeçalho da tabela
+        package = fields[2].strip().split(".")[0]
+        packages[package] += int(fields[0]) / 1_000_000
+    return dict(packages)
+
+
+def measure_page(page: Path) -> Dict[str, float]:
+    """Importa a página em um processo novo e retorna o tempo por pacote."""
+    env = dict(os.environ, ALFABETIZACAO_TTS_BACKENDS="stub")
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", _LOADER, str(page)],
+        cwd=ROOT, env=env, capture_output=True, text=True, check=True,
+    )
+    return parse_importtime(result.stderr)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Ponto de entrada da linha de comando."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--top", type=int, default=5,
+                        help="Quantos pacotes mostrar por página (padrão: %(default)s)")
+    args = parser.parse_args(argv)
+
+    for page in page_files():
+        packages = measure_page(page)
+        top: List[Tuple[str, float]] = sorted(
+            packages.items(), key=lambda item: item[1], reverse=True
+        )[:args.top]
+        print(f"{page.name}: {sum(packages.values()) * 1000:.0f} ms")
+        for package, seconds in top:
+            print(f"    {package:<24} {seconds * 1000:>8.1f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
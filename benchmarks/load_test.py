@@ -0,0 +1,577 @@
+"""Teste de carga: quantas crianças ao mesmo tempo um servidor aguenta.
+
+Sobe o app localmente (`streamlit run`) e simula N crianças, divididas
+entre vários processos. Cada criança é uma sessão de verdade, pelo
+mesmo websocket do navegador: abre a página inicial e joga os módulos
+1 a 6 (escolhe letras e sílabas, clica nas opções, digita respostas,
+monta frases), esperando um "tempo de pensar" entre uma ação e outra.
+Os cliques dentro de fragmentos rodam só o fragmento, como no navegador.
+
+As crianças não sabem as respostas: chutam entre as respostas do
+conteúdo (`core.catalog`) até acertar, como uma criança errando e
+tentando de novo.
+
+A carga sobe em níveis (`--learners 10,20,40`). Para cada nível, o
+relatório mostra:
+- a vazão (ações por segundo) e os percentis 50/95/99 da latência de
+  cada ação (do envio até o fim da execução do script);
+- o uso de CPU do servidor e a memória (RSS) no pico, com o
+  crescimento por sessão;
+- os erros (exceções nas páginas e ações sem resposta).
+
+O ponto de saturação é o primeiro nível em que o percentil 95 passa do
+limite (`--slo`) ou em que a vazão por criança cai mais de 20% em
+relação ao primeiro nível (o servidor deixou de acompanhar a carga).
+Para medir a capacidade de um núcleo, prenda o servidor a um só com
+`--server-cpus 0` e rode as crianças nos outros núcleos.
+
+A memória e a CPU do servidor são lidas de `/proc` (só no Linux).
+
+Uso:
+    python -m benchmarks.load_test --learners 10,20,40,80 --duration 60 --stub-tts
+    python -m benchmarks.load_test --learners 30 --server-cpus 0 --json carga.json
+    python -m benchmarks.load_test --url http://localhost:8501 --learners 20
+"""
+
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.request
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from streamlit.proto.BackMsg_pb2 import BackMsg
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+from streamlit.proto.WidgetStates_pb2 import WidgetState
+from websockets.asyncio.client import connect
+
+ROOT = Path(__file__).resolve().parent.parent
+HOME_PAGE = ROOT / "0_🏠_Bem_Vinda.py"
+
+# Quanto uma ação pode esperar pela resposta do servidor antes de contar como erro
+ACTION_TIMEOUT = 30.0
+# Rodadas de cada jogo antes de a criança trocar de página
+ROUNDS_PER_PAGE = 3
+# Queda da vazão por criança (em relação ao primeiro nível) que indica saturação
+SATURATION_DROP = 0.2
+
+_FINISHED_EARLY = ForwardMsg.ScriptFinishedStatus.FINISHED_EARLY_FOR_RERUN
+_WIDGET_TYPES = ("button", "radio", "selectbox", "text_input")
+
+# Uma medição: (ação, segundos, ok)
+Sample = Tuple[str, float, bool]
+
+
+class Widget:
+    """Um widget da página, como o navegador o conhece."""
+
+    __slots__ = ("kind", "id", "label", "options", "fragment_id", "disabled", "is_submit")
+
+    def __init__(self, kind: str, proto: Any, fragment_id: str):
+        self.kind = kind
+        self.id = proto.id
+        self.label = proto.label
+        self.options = list(getattr(proto, "options", ()))
+        self.fragment_id = fragment_id
+        self.disabled = proto.disabled
+        self.is_submit = kind == "button" and proto.is_form_submitter
+
+
+class LearnerSession:
+    """Uma criança simulada: uma sessão do Streamlit por websocket.
+
+    Guarda os widgets da página atual (atualizados a cada execução,
+    inteira ou só de um fragmento) e os valores já escolhidos, que vão
+    em toda execução, como o navegador faz.
+    """
+
+    def __init__(self, ws, name: str, samples: List[Sample]):
+        self.ws = ws
+        self.name = name
+        self.samples = samples
+        self.pages: Dict[str, str] = {}
+        self.page_hash = ""
+        self.widgets: Dict[str, Widget] = {}
+        self.values: Dict[str, WidgetState] = {}
+
+    async def rerun(self, action: str, trigger: Optional[Widget] = None,
+                    page_hash: Optional[str] = None) -> bool:
+        """Pede uma execução e espera o fim dela, medindo a latência.
+
+        Args:
+            action: O nome da ação no relatório (ex: "3/opção").
+            trigger: O botão clicado (None para só mandar os valores).
+            page_hash: Troca de página (None para ficar na atual).
+
+        Returns:
+            True se a execução terminou sem exceções na página.
+        """
+        if page_hash is not None and page_hash != self.page_hash:
+            self.page_hash = page_hash
+            self.values.clear()
+        msg = BackMsg()
+        client = msg.rerun_script
+        client.query_string = f"aluno={self.name}"
+        client.page_script_hash = self.page_hash
+        client.widget_states.widgets.extend(self.values.values())
+        if trigger is not None:
+            client.widget_states.widgets.append(WidgetState(id=trigger.id, trigger_value=True))
+            client.fragment_id = trigger.fragment_id
+
+        start = time.perf_counter()
+        await self.ws.send(msg.SerializeToString())
+        try:
+            ok = await asyncio.wait_for(self._read_run(), ACTION_TIMEOUT)
+        except asyncio.TimeoutError:
+            ok = False
+        self.samples.append((action, time.perf_counter() - start, ok))
+        return ok
+
+    async def _read_run(self) -> bool:
+        ok = True
+        while True:
+            msg = ForwardMsg()
+            msg.ParseFromString(await self.ws.recv())
+            kind = msg.WhichOneof("type")
+            if kind == "new_session":
+                # Começo de uma execução: os widgets dela serão mandados de novo
+                fragments = set(msg.new_session.fragment_ids_this_run)
+                self.widgets = {} if not fragments else {
+                    key: w for key, w in self.widgets.items() if w.fragment_id not in fragments
+                }
+            elif kind == "navigation":
+                self.pages = {p.page_name: p.page_script_hash for p in msg.navigation.app_pages}
+            elif kind == "delta" and msg.delta.WhichOneof("type") == "new_element":
+                element = msg.delta.new_element
+                element_type = element.WhichOneof("type")
+                if element_type in _WIDGET_TYPES:
+                    widget = Widget(element_type, getattr(element, element_type),
+                                    msg.delta.fragment_id)
+                    self.widgets[widget.id] = widget
+                elif element_type == "exception":
+                    ok = False
+            elif kind == "script_finished" and msg.script_finished != _FINISHED_EARLY:
+                return ok
+
+    def find(self, label: str) -> Optional[Widget]:
+        """Acha um widget habilitado pelo começo do rótulo."""
+        for widget in self.widgets.values():
+            if widget.label.startswith(label) and not widget.disabled:
+                return widget
+        return None
+
+    def set_value(self, widget: Widget, value: str):
+        """Escolhe o valor de um widget (vale para as próximas execuções)."""
+        self.values[widget.id] = WidgetState(id=widget.id, string_value=value)
+
+
+# ---
+# Roteiros de cada página (o que uma criança faz nela)
+# ---
+
+class Answers:
+    """As respostas do conteúdo, de onde as crianças tiram os chutes."""
+
+    def __init__(self):
+        from core.catalog import get_catalog
+
+        catalog = get_catalog()
+        self.words = [item["correct"] for item in catalog.module("image_to_word").items]
+        self.dictation = [item["correct"] for item in catalog.module("dictation").items]
+        self.sentences = [item["correct"] for item in catalog.module("scramble_sentence").items]
+
+
+async def _letters(learner, rng, answers, think):
+    select = next(w for w in learner.widgets.values() if w.kind == "selectbox")
+    learner.set_value(select, rng.choice(select.options))
+    await learner.rerun("1/letra")
+    await think()
+    button = learner.find("Ouvir a palavra")
+    if button:
+        await learner.rerun("1/ouvir", button)
+
+
+async def _syllables(learner, rng, answers, think):
+    for radio in [w for w in learner.widgets.values() if w.kind == "radio"]:
+        learner.set_value(radio, rng.choice(radio.options))
+        await learner.rerun("2/sílaba")
+        await think()
+
+
+async def _complete_word(learner, rng, answers, think):
+    for _ in range(ROUNDS_PER_PAGE):
+        while not learner.find("Próxima"):
+            options = [w for w in learner.widgets.values()
+                       if w.id.endswith(f"complete_word_{w.label}") and not w.disabled]
+            if not options or not await learner.rerun("3/opção", rng.choice(options)):
+                return
+            await think()
+        await learner.rerun("3/próxima", learner.find("Próxima"))
+        await think()
+
+
+async def _typed_answer(learner, rng, think, page: str, guesses: List[str], next_label: str,
+                        listen: Optional[str] = None):
+    for _ in range(ROUNDS_PER_PAGE):
+        if listen and learner.find(listen):
+            await learner.rerun(f"{page}/ouvir", learner.find(listen))
+            await think()
+        for guess in rng.sample(guesses, len(guesses)):
+            field = next(w for w in learner.widgets.values() if w.kind == "text_input")
+            submit = next(w for w in learner.widgets.values() if w.is_submit)
+            learner.set_value(field, guess)
+            if not await learner.rerun(f"{page}/enviar", submit):
+                return
+            await think()
+            if learner.find(next_label):
+                break
+        button = learner.find(next_label)
+        if not button:
+            return
+        await learner.rerun(f"{page}/próxima", button)
+        await think()
+
+
+async def _image_to_word(learner, rng, answers, think):
+    await _typed_answer(learner, rng, think, "4", answers.words, "Próxima")
+
+
+async def _dictation(learner, rng, answers, think):
+    await _typed_answer(learner, rng, think, "6", answers.dictation, "Próximo",
+                        listen="Ouvir a frase")
+
+
+async def _scramble_sentence(learner, rng, answers, think):
+    for _ in range(ROUNDS_PER_PAGE):
+        tokens = sorted(w.label for w in learner.widgets.values() if "_token_" in w.id)
+        sentence = next((s for s in answers.sentences if sorted(s.split()) == tokens), None)
+        if sentence is None:
+            return
+        for word in sentence.split():
+            button = next(w for w in learner.widgets.values()
+                          if "_token_" in w.id and w.label == word)
+            if not await learner.rerun("5/palavra", button):
+                return
+            await think()
+        await learner.rerun("5/verificar", learner.find("Verificar"))
+        await think()
+        button = learner.find("Próxima")
+        if not button:
+            return
+        await learner.rerun("5/próxima", button)
+        await think()
+
+
+# Página (nome no menu) -> (número da página, roteiro)
+PLAYS: Dict[str, Tuple[str, Callable]] = {
+    "Conhecendo as Letras": ("1", _letters),
+    "Formando Sílabas": ("2", _syllables),
+    "Complete a Palavra": ("3", _complete_word),
+    "O que e isso": ("4", _image_to_word),
+    "Organize a Frase": ("5", _scramble_sentence),
+    "Ditado de Frases": ("6", _dictation),
+}
+
+
+async def _play(url: str, name: str, deadline: float, think_range: Tuple[float, float],
+                rng: random.Random, answers: Answers, samples: List[Sample]):
+    """Uma criança jogando até o fim do nível."""
+    async def think():
+        await asyncio.sleep(rng.uniform(*think_range))
+
+    # As crianças não chegam todas no mesmo instante
+    await asyncio.sleep(rng.uniform(0, think_range[1]))
+    stream = url.replace("http", "ws", 1).rstrip("/") + "/_stcore/stream"
+    try:
+        async with connect(stream, max_size=None) as ws:
+            learner = LearnerSession(ws, name, samples)
+            await learner.rerun("0/abrir")
+            while time.monotonic() < deadline:
+                page = rng.choice(list(PLAYS))
+                number, script = PLAYS[page]
+                await think()
+                if await learner.rerun(f"{number}/navegar", page_hash=learner.pages[page]):
+                    await script(learner, rng, answers, think)
+    except Exception as e:  # Conexão caída, página diferente do esperado...
+        samples.append((f"erro/{type(e).__name__}", 0.0, False))
+
+
+async def _visit_pages(url: str):
+    stream = url.replace("http", "ws", 1).rstrip("/") + "/_stcore/stream"
+    async with connect(stream, max_size=None) as ws:
+        learner = LearnerSession(ws, "aquecimento", [])
+        await learner.rerun("0/abrir")
+        for page in PLAYS:
+            await learner.rerun("navegar", page_hash=learner.pages[page])
+
+
+def warm_up_server(url: str):
+    """Abre cada página uma vez, para o primeiro nível não medir as importações."""
+    asyncio.run(_visit_pages(url))
+
+
+def _worker(url: str, names: List[str], duration: float,
+            think_range: Tuple[float, float], seed: int) -> List[Sample]:
+    """Processo de carga: roda as suas crianças em um laço assíncrono."""
+    answers = Answers()
+    samples: List[Sample] = []
+    deadline = time.monotonic() + duration
+
+    async def main():
+        await asyncio.gather(*(
+            _play(url, name, deadline, think_range, random.Random(f"{seed}-{name}"),
+                  answers, samples)
+            for name in names
+        ))
+
+    asyncio.run(main())
+    return samples
+
+
+# ---
+# Servidor
+# ---
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_server(port: int, workdir: Path, stub_tts: bool,
+                 cpus: Optional[Sequence[int]] = None) -> subprocess.Popen:
+    """Sobe o app com `streamlit run` e espera ele responder.
+
+    Args:
+        port: A porta do servidor.
+        workdir: Pasta dos caches de áudio e do registro de progresso.
+        stub_tts: Se True, usa o motor de TTS falso (sem internet).
+        cpus: Núcleos onde o servidor pode rodar (None = todos).
+
+    Raises:
+        RuntimeError: Se o servidor não responder em 60 segundos.
+    """
+    env = dict(os.environ,
+               ALFABETIZACAO_AUDIO_DISK_CACHE_DIR=str(workdir / "audio"),
+               ALFABETIZACAO_PROGRESS_DB=str(workdir / "progress.sqlite3"))
+    if stub_tts:
+        env["ALFABETIZACAO_TTS_BACKENDS"] = "stub"
+    command = [sys.executable, "-m", "streamlit", "run", str(HOME_PAGE),
+               "--server.headless", "true", "--server.port", str(port),
+               "--browser.gatherUsageStats", "false"]
+    preexec = (lambda: os.sched_setaffinity(0, cpus)) if cpus else None
+    server = subprocess.Popen(command, cwd=ROOT, env=env, preexec_fn=preexec,
+                              stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+    health = f"http://127.0.0.1:{port}/_stcore/health"
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        try:
+            with urllib.request.urlopen(health, timeout=1) as response:
+                if response.status == 200:
+                    return server
+        except OSError:
+            time.sleep(0.2)
+    server.kill()
+    raise RuntimeError("O servidor não respondeu em 60 segundos.")
+
+
+class ServerMonitor:
+    """Amostra a memória (RSS) e o tempo de CPU do servidor, via `/proc`."""
+
+    def __init__(self, pid: int, interval: float = 0.5):
+        self.pid = pid
+        self.interval = interval
+        self.peak_rss = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._sample, daemon=True)
+
+    def rss(self) -> int:
+        """A memória residente do servidor agora, em bytes."""
+        with open(f"/proc/{self.pid}/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+        return 0
+
+    def cpu_seconds(self) -> float:
+        """O tempo de CPU (usuário + sistema) gasto pelo servidor até agora."""
+        with open(f"/proc/{self.pid}/stat") as f:
+            fields = f.read().rsplit(")", 1)[1].split()
+        return (int(fields[11]) + int(fields[12])) / os.sysconf("SC_CLK_TCK")
+
+    def _sample(self):
+        while not self._stop.wait(self.interval):
+            self.peak_rss = max(self.peak_rss, self.rss())
+
+    def __enter__(self):
+        self.peak_rss = self.rss()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._sample, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+
+
+# ---
+# Níveis de carga e relatório
+# ---
+
+def run_level(url: str, learners: int, processes: int, duration: float,
+              think_range: Tuple[float, float], seed: int,
+              monitor: Optional[ServerMonitor] = None) -> Dict[str, Any]:
+    """Roda um nível de carga e resume as medições.
+
+    Returns:
+        Um dicionário com "learners", "actions", "throughput", "p50",
+        "p95", "p99", "errors", "by_action" e, com o monitor,
+        "cpu_percent", "rss_peak" e "rss_per_session" (bytes).
+    """
+    names = [f"carga-{seed}-{i}" for i in range(learners)]
+    chunks = [names[i::processes] for i in range(processes) if names[i::processes]]
+    rss_before = monitor.rss() if monitor else 0
+    cpu_before = monitor.cpu_seconds() if monitor else 0.0
+    start = time.monotonic()
+
+    context = multiprocessing.get_context("spawn")
+    with context.Pool(len(chunks)) as pool:
+        if monitor:
+            with monitor:
+                results = pool.starmap(_worker, [(url, chunk, duration, think_range, seed)
+                                                 for chunk in chunks])
+        else:
+            results = pool.starmap(_worker, [(url, chunk, duration, think_range, seed)
+                                             for chunk in chunks])
+    elapsed = time.monotonic() - start
+    samples = [sample for result in results for sample in result]
+
+    latencies = np.array([seconds for _, seconds, ok in samples if ok]) if samples else np.array([])
+    summary: Dict[str, Any] = {
+        "learners": learners,
+        "actions": len(latencies),
+        "throughput": len(latencies) / elapsed,
+        "errors": sum(1 for _, _, ok in samples if not ok),
+    }
+    for name, q in (("p50", 50), ("p95", 95), ("p99", 99)):
+        summary[name] = float(np.percentile(latencies, q)) if len(latencies) else float("nan")
+
+    by_action: Dict[str, List[float]] = {}
+    for action, seconds, ok in samples:
+        if ok:
+            by_action.setdefault(action, []).append(seconds)
+    summary["by_action"] = {
+        action: {"count": len(values), "p50": float(np.percentile(values, 50)),
+                 "p95": float(np.percentile(values, 95))}
+        for action, values in sorted(by_action.items())
+    }
+    if monitor:
+        summary["cpu_percent"] = (monitor.cpu_seconds() - cpu_before) / elapsed * 100
+        summary["rss_peak"] = monitor.peak_rss
+        summary["rss_per_session"] = max(0, monitor.peak_rss - rss_before) / learners
+    return summary
+
+
+def saturation_point(levels: List[Dict[str, Any]], slo: float) -> Optional[Dict[str, Any]]:
+    """Acha o primeiro nível saturado (ver o começo do módulo), ou None."""
+    if not levels:
+        return None
+    base = levels[0]["throughput"] / levels[0]["learners"]
+    for level in levels:
+        per_learner = level["throughput"] / level["learners"]
+        if level["p95"] > slo or per_learner < base * (1 - SATURATION_DROP):
+            return level
+    return None
+
+
+def print_report(levels: List[Dict[str, Any]], slo: float):
+    """Mostra a tabela dos níveis e o ponto de saturação."""
+    print(f"{'crianças':>9} {'ações/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} "
+          f"{'erros':>6} {'CPU %':>6} {'RSS MB':>8} {'KB/sessão':>10}")
+    for level in levels:
+        memory = (f"{level['cpu_percent']:>6.0f} {level['rss_peak'] / 2**20:>8.1f} "
+                  f"{level['rss_per_session'] / 1024:>10.0f}") if "cpu_percent" in level else (
+                  f"{'—':>6} {'—':>8} {'—':>10}")
+        print(f"{level['learners']:>9} {level['throughput']:>8.1f} "
+              f"{level['p50'] * 1000:>8.1f} {level['p95'] * 1000:>8.1f} "
+              f"{level['p99'] * 1000:>8.1f} {level['errors']:>6} {memory}")
+
+    saturated = saturation_point(levels, slo)
+    if saturated is None:
+        print(f"\nSem saturação até {levels[-1]['learners']} crianças "
+              f"(p95 até {slo * 1000:.0f} ms).")
+    else:
+        print(f"\nSaturação com {saturated['learners']} crianças "
+              f"(p95 {saturated['p95'] * 1000:.0f} ms, limite {slo * 1000:.0f} ms).")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Ponto de entrada da linha de comando."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--learners", default="10,20,40",
+                        help="Crianças de cada nível, separadas por vírgula (padrão: %(default)s)")
+    parser.add_argument("--duration", type=float, default=60.0,
+                        help="Segundos de cada nível (padrão: %(default)s)")
+    parser.add_argument("--processes", type=int, default=max(1, (os.cpu_count() or 2) - 1),
+                        help="Processos que simulam as crianças (padrão: %(default)s)")
+    parser.add_argument("--think", default="2,6",
+                        help="Tempo de pensar entre ações, mín,máx em segundos "
+                             "(padrão: %(default)s)")
+    parser.add_argument("--slo", type=float, default=1.0,
+                        help="Limite do p95 da latência, em segundos (padrão: %(default)s)")
+    parser.add_argument("--stub-tts", action="store_true",
+                        help="Usa o motor de TTS falso no servidor (sem internet)")
+    parser.add_argument("--server-cpus",
+                        help="Núcleos do servidor, separados por vírgula (ex: 0)")
+    parser.add_argument("--url", help="Usa um servidor já rodando (sem medir RSS e CPU)")
+    parser.add_argument("--seed", type=int, default=0, help="Semente das crianças")
+    parser.add_argument("--json", type=Path, help="Grava os resultados neste arquivo")
+    args = parser.parse_args(argv)
+
+    levels_to_run = [int(n) for n in args.learners.split(",")]
+    think_min, think_max = (float(s) for s in args.think.split(","))
+    cpus = [int(c) for c in args.server_cpus.split(",")] if args.server_cpus else None
+
+    server = monitor = None
+    url = args.url
+    if url is None:
+        port = _free_port()
+        workdir = Path(tempfile.mkdtemp(prefix="load_test_"))
+        server = start_server(port, workdir, args.stub_tts, cpus)
+        url = f"http://127.0.0.1:{port}"
+        monitor = ServerMonitor(server.pid)
+    try:
+        warm_up_server(url)
+        levels = []
+        for learners in levels_to_run:
+            print(f"Nível: {learners} crianças por {args.duration:.0f} s...", flush=True)
+            levels.append(run_level(url, learners, min(args.processes, learners),
+                                    args.duration, (think_min, think_max),
+                                    args.seed, monitor))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+    print()
+    print_report(levels, args.slo)
+    if args.json:
+        args.json.write_text(json.dumps({"slo": args.slo, "levels": levels},
+                                        ensure_ascii=False, indent=2), "utf-8")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,123 @@
+"""Mede a memória por sessão do estado dos jogos.
+
+Compara o formato antigo do st.session_state (com a lista inteira de
+desafios em `{jogo}_data` e o desafio atual como dict em
+`{jogo}_challenge`) com o atual (só índice, status e sorteio, com os
+desafios no armazenamento compartilhado do processo).
+
+Para cada formato são criadas N sessões com um catálogo sintético e
+medidos:
+- os bytes alocados por sessão (tracemalloc), ou seja, o custo em um
+  único processo;
+- o tamanho do estado serializado (pickle) por sessão, que é o que
+  ocupa ao copiar ou persistir o estado de uma sessão.
+
+Uso:
+    python -m benchmarks.session_memory [--challenges 5000] [--sessions 30]
+"""
+
+import argparse
+import pickle
+import random
+import sys
+import tracemalloc
+from types import SimpleNamespace
+from typing import Any, Callable, Dict, List, Optional
+
+from core import game_logic
+from core.challenge_store import get_challenge_store
+
+GAME_KEY = "complete_word"
+
+
+def make_challenges(count: int) -> List[Dict[str, Any]]:
+    """Gera um catálogo sintético no formato do Módulo 3."""
+    rng = random.Random(0)
+    syllables = ["BA", "CA", "DA", "FA", "GA", "LA", "MA", "NA", "PA", "TA"]
+    challenges = []
+    for i in range(count):
+        correct, *others = rng.sample(syllables, 3)
+        rest = "".join(rng.sample(syllables, 2))
+        challenges.append({
+            "id": f"palavra-{i}",
+            "image": f"assets/images/palavra_{i}.jpg",
+            "prompt": f"__ {rest}",
+            "options": [correct] + others,
+            "correct": correct,
+            "full_word": correct + rest,
+        })
+    return challenges
+
+
+def current_session(challenges: List[Dict[str, Any]], seed: int) -> Dict[str, Any]:
+    """Estado de uma sessão no formato atual, com um desafio sorteado."""
+    session: Dict[str, Any] = {}
+    original_st = game_logic.st
+    game_logic.st = SimpleNamespace(session_state=session)
+    try:
+        game_logic.initialize_game_state(GAME_KEY, challenges, seed=seed)
+        game_logic.get_new_challenge(GAME_KEY)
+    finally:
+        game_logic.st = original_st
+    return session
+
+
+def legacy_session(challenges: List[Dict[str, Any]], seed: int) -> Dict[str, Any]:
+    """Estado de uma sessão no formato antigo, com um desafio sorteado.
+
+    É o formato atual mais a lista de desafios e uma cópia do desafio
+    atual, como era guardado antes do armazenamento compartilhado.
+    """
+    session = current_session(challenges, seed)
+    index = session[f"{GAME_KEY}_challenge_index"]
+    session[f"{GAME_KEY}_challenge"] = dict(challenges[index])
+    session[f"{GAME_KEY}_data"] = challenges
+    session[f"{GAME_KEY}_audio_field"] = None
+    return session
+
+
+def measure(build: Callable[[List[Dict[str, Any]], int], Dict[str, Any]],
+            challenges: List[Dict[str, Any]], sessions: int) -> Dict[str, float]:
+    """Cria `sessions` sessões e retorna os bytes médios por sessão."""
+    build(challenges, -1)  # Registra o conteúdo compartilhado fora da medição
+
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    states = [build(challenges, seed) for seed in range(sessions)]
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    allocated = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+
+    pickled = sum(len(pickle.dumps(state)) for state in states)
+    return {"allocated": allocated / sessions, "pickled": pickled / sessions}
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Ponto de entrada da linha de comando."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--challenges", type=int, default=5000,
+                        help="Tamanho do catálogo sintético (padrão: %(default)s)")
+    parser.add_argument("--sessions", type=int, default=30,
+                        help="Quantidade de sessões (padrão: %(default)s)")
+    args = parser.parse_args(argv)
+
+    # O prefetch de áudio e o registro de progresso não fazem parte da medição
+    game_logic.prefetch_challenge_audio = lambda game_key, challenge: None
+    game_logic.get_progress_store = lambda: None
+
+    challenges = make_challenges(args.challenges)
+    shared = len(pickle.dumps(get_challenge_store().register(GAME_KEY, challenges)
+                              .source))
+
+    print(f"{args.challenges} desafios, {args.sessions} sessões "
+          f"(conteúdo compartilhado: {shared / 1024:.0f} KB por processo)")
+    print(f"{'formato':<10} {'alocado/sessão':>16} {'pickle/sessão':>16}")
+    for name, build in (("antigo", legacy_session), ("atual", current_session)):
+        result = measure(build, challenges, args.sessions)
+        print(f"{name:<10} {result['allocated'] / 1024:>13.1f} KB "
+              f"{result['pickled'] / 1024:>13.1f} KB")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,375 @@
+"""Módulo de análise do progresso das crianças.
+
+Calcula, a partir das respostas gravadas pelo `core.progress_store`,
+as estatísticas do painel do professor (por criança ou da turma):
+- acerto por letra inicial e por sílaba;
+- as sílabas mais confundidas no "Complete a Palavra";
+- a distribuição do tempo de resposta em cada jogo;
+- a taxa de erro de cada palavra no ditado.
+
+As respostas ficam na memória em colunas NumPy (um vetor por campo),
+com os textos trocados por códigos inteiros (ex: cada criança vira um
+número). Assim as contas são feitas de uma vez sobre as colunas
+(`np.bincount`, máscaras) em vez de um laço em Python por resposta.
+
+A leitura do banco é incremental: cada `refresh` só busca as respostas
+novas, e os resultados ficam em cache até chegar alguma resposta nova.
+"""
+
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from core import config
+from core.answer_matching import word_errors
+from core.catalog import SCHEMAS, CatalogError, get_catalog
+from core.progress_store import open_readonly
+
+# Jogos em que a resposta é uma palavra (acerto por letra inicial)
+LETTER_GAMES = ("complete_word", "image_to_word")
+
+# Limites (em segundos) das faixas do histograma de tempo de resposta
+LATENCY_BINS = (0, 2, 4, 6, 8, 10, 15, 20, 30, 60, np.inf)
+
+# Quantas respostas são lidas do banco por vez
+_READ_CHUNK = 50_000
+
+_QUERY = (
+    "SELECT id, learner, game_key, challenge_id, answer, correct, latency_ms"
+    " FROM attempts WHERE id > ? ORDER BY id LIMIT ?"
+)
+
+
+class _Vocabulary:
+    """Troca textos por códigos inteiros (0, 1, 2...) e vice-versa."""
+
+    def __init__(self):
+        self.codes: Dict[str, int] = {}
+        self.values: List[str] = []
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def code(self, value: str) -> int:
+        code = self.codes.get(value)
+        if code is None:
+            code = self.codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+    def encode(self, values) -> np.ndarray:
+        return np.fromiter((self.code(v) for v in values), dtype=np.int32)
+
+
+class _Column:
+    """Vetor NumPy que cresce por blocos (dobrando a capacidade)."""
+
+    def __init__(self, dtype, fill=0):
+        self._data = np.full(1024, fill, dtype=dtype)
+        self._fill = fill
+        self.size = 0
+
+    @property
+    def values(self) -> np.ndarray:
+        return self._data[:self.size]
+
+    def extend(self, values: np.ndarray):
+        end = self.size + len(values)
+        if end > len(self._data):
+            grown = np.full(max(end, 2 * len(self._data)), self._fill,
+                            dtype=self._data.dtype)
+            grown[:self.size] = self.values
+            self._data = grown
+        self._data[self.size:end] = values
+        self.size = end
+
+
+def _accuracy_table(keys: np.ndarray, correct: np.ndarray,
+                    labels: List[str]) -> List[Dict[str, Any]]:
+    """Agrupa por código (ignorando -1) e calcula tentativas e acerto."""
+    valid = keys >= 0
+    keys, correct = keys[valid], correct[valid]
+    attempts = np.bincount(keys, minlength=len(labels))
+    hits = np.bincount(keys, weights=correct, minlength=len(labels))
+    seen = np.nonzero(attempts)[0]
+    return [{"label": labels[k], "attempts": int(attempts[k]),
+             "accuracy": float(hits[k] / attempts[k])} for k in seen]
+
+
+class AnalyticsEngine:
+    """Colunas das respostas gravadas e as agregações do painel."""
+
+    def __init__(self, db_path: Path):
+        self.db_path = Path(db_path)
+        self.last_id = 0
+        self.version = 0  # Muda a cada leitura com respostas novas
+        self._lock = threading.Lock()
+        self._cache: Dict[Tuple[Any, ...], Tuple[int, Any]] = {}
+
+        self.learners = _Vocabulary()
+        self.games = _Vocabulary()
+        self.challenges = _Vocabulary()  # "jogo/id"
+        self.answers = _Vocabulary()
+        self.letters = _Vocabulary()
+        self.syllables = _Vocabulary()
+        self.words = _Vocabulary()
+
+        # Uma linha por resposta
+        self._learner = _Column(np.int32)
+        self._game = _Column(np.int32)
+        self._challenge = _Column(np.int32)
+        self._answer = _Column(np.int32)
+        self._correct = _Column(np.float64)
+        self._latency = _Column(np.float64, np.nan)  # Segundos
+
+        # Uma linha por desafio (código de `challenges`); -1 = não se aplica
+        self._challenge_letter = _Column(np.int32, -1)
+        self._challenge_syllable = _Column(np.int32, -1)
+
+        # Uma linha por palavra de cada resposta do ditado
+        self._word_row = _Column(np.int64)  # A resposta (linha) de origem
+        self._word = _Column(np.int32)
+        self._word_error = _Column(np.float64)
+        # (frase, resposta ou None se certa) -> códigos das palavras e erros
+        self._dictation_words: Dict[Tuple[str, Optional[str]],
+                                    Tuple[List[int], List[float]]] = {}
+
+    def __len__(self) -> int:
+        return self._learner.size
+
+    # --- Leitura incremental ---
+
+    def refresh(self) -> int:
+        """Lê as respostas gravadas desde a última leitura.
+
+        Returns:
+            Quantas respostas novas foram lidas.
+        """
+        if not self.db_path.exists():
+            return 0
+        added = 0
+        with self._lock:
+            connection = open_readonly(self.db_path)
+            try:
+                while True:
+                    rows = connection.execute(_QUERY, (self.last_id, _READ_CHUNK)).fetchall()
+                    if not rows:
+                        break
+                    self._ingest(rows)
+                    added += len(rows)
+                    if len(rows) < _READ_CHUNK:
+                        break
+            finally:
+                connection.close()
+            if added:
+                self.version += 1
+        return added
+
+    def _ingest(self, rows: List[Tuple[Any, ...]]):
+        ids, learners, games, challenge_ids, answers, correct, latency = zip(*rows)
+        first_row = len(self)
+        challenge_codes = self.challenges.encode(
+            f"{g}/{c}" for g, c in zip(games, challenge_ids)
+        )
+        self._describe_new_challenges()
+
+        self._learner.extend(self.learners.encode(learners))
+        self._game.extend(self.games.encode(games))
+        self._challenge.extend(challenge_codes)
+        self._answer.extend(self.answers.encode(a.strip().upper() for a in answers))
+        self._correct.extend(np.array(correct, dtype=np.float64))
+        self._latency.extend(np.array(
+            [np.nan if ms is None else ms / 1000 for ms in latency], dtype=np.float64
+        ))
+        self._ingest_dictation_words(rows, first_row)
+        self.last_id = ids[-1]
+
+    def _catalog_item(self, game: str, challenge_id: str) -> Optional[Any]:
+        if game not in SCHEMAS:
+            return None
+        try:
+            return get_catalog().module(game).get(challenge_id)
+        except CatalogError:
+            return None
+
+    def _describe_new_challenges(self):
+        """Preenche a letra e a sílaba dos desafios vistos pela 1ª vez."""
+        letters, syllables = [], []
+        for key in self.challenges.values[self._challenge_letter.size:]:
+            game, challenge_id = key.split("/", 1)
+            item = self._catalog_item(game, challenge_id)
+            letter = syllable = -1
+            if item is not None and game in LETTER_GAMES:
+                found = SCHEMAS[game]["letter"](item)
+                letter = self.letters.code(found) if found else -1
+            if item is not None and game == "complete_word":
+                syllable = self.syllables.code(item["correct"].upper())
+            letters.append(letter)
+            syllables.append(syllable)
+        self._challenge_letter.extend(np.array(letters, dtype=np.int32))
+        self._challenge_syllable.extend(np.array(syllables, dtype=np.int32))
+
+    def _ingest_dictation_words(self, rows: List[Tuple[Any, ...]], first_row: int):
+        """Marca, palavra a palavra, o que foi errado em cada ditado.
+
+        Feito uma vez, na leitura, com a mesma comparação da verificação
+        (ver `core.answer_matching`): acentos e pontuação não contam.
+        Esta etapa não é vetorizada: o alinhamento das palavras roda em
+        Python, mas só uma vez por par (frase, resposta) distinto; as
+        respostas repetidas (e todas as certas) reaproveitam o resultado.
+        """
+        word_rows, words, errors = [], [], []
+        for offset, (_, _, game, challenge_id, answer, correct, _) in enumerate(rows):
+            if game != "dictation":
+                continue
+            item = self._catalog_item(game, challenge_id)
+            if item is None:
+                continue
+            codes, wrong_words = self._dictation_word_errors(
+                item["correct"], None if correct else answer)
+            word_rows.extend([first_row + offset] * len(codes))
+            words.extend(codes)
+            errors.extend(wrong_words)
+        if words:
+            self._word_row.extend(np.array(word_rows, dtype=np.int64))
+            self._word.extend(np.array(words, dtype=np.int32))
+            self._word_error.extend(np.array(errors, dtype=np.float64))
+
+    def _dictation_word_errors(self, sentence: str,
+                               answer: Optional[str]) -> Tuple[List[int], List[float]]:
+        """Códigos das palavras da frase e 1.0/0.0 para cada uma errada (com cache).
+
+        `answer` é None para uma resposta certa (nenhuma palavra errada).
+        """
+        key = (sentence, answer)
+        cached = self._dictation_words.get(key)
+        if cached is None:
+            expected = ["".join(c for c in w if c.isalnum()).lower()
+                        for w in sentence.split() if any(c.isalnum() for c in w)]
+            wrong_words = ([False] * len(expected) if answer is None
+                           else word_errors(sentence, answer))
+            pairs = list(zip(expected, wrong_words))
+            cached = ([self.words.code(word) for word, _ in pairs],
+                      [1.0 if wrong else 0.0 for _, wrong in pairs])
+            self._dictation_words[key] = cached
+        return cached
+
+    # --- Agregações (com cache até a próxima resposta nova) ---
+
+    def _cached(self, name: str, learner: Optional[str],
+                compute: Callable[[np.ndarray], Any]) -> Any:
+        """Calcula (ou reaproveita) uma agregação para uma criança ou a turma."""
+        key = (name, learner)
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached is not None and cached[0] == self.version:
+                return cached[1]
+            learners = self._learner.values
+            if learner is None:
+                rows = np.ones(len(learners), dtype=bool)
+            elif learner in self.learners.codes:
+                rows = learners == self.learners.codes[learner]
+            else:
+                rows = np.zeros(len(learners), dtype=bool)
+            result = compute(rows)
+            self._cache[key] = (self.version, result)
+        return result
+
+    def learner_ids(self) -> List[str]:
+        """Retorna as crianças que já responderam algo."""
+        return sorted(self.learners.values)
+
+    def summary(self, learner: Optional[str] = None) -> Dict[str, Any]:
+        """Totais: respostas, acerto, tempo mediano e crianças."""
+        def compute(rows):
+            correct = self._correct.values[rows]
+            latency = self._latency.values[rows]
+            has_latency = ~np.isnan(latency)
+            return {
+                "attempts": int(rows.sum()),
+                "accuracy": float(correct.mean()) if len(correct) else None,
+                "median_latency": (float(np.median(latency[has_latency]))
+                                   if has_latency.any() else None),
+                "learners": len(np.unique(self._learner.values[rows])),
+            }
+        return self._cached("summary", learner, compute)
+
+    def accuracy_by_letter(self, learner: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Acerto por letra inicial da palavra (jogos de palavras)."""
+        def compute(rows):
+            letters = self._challenge_letter.values[self._challenge.values[rows]]
+            return _accuracy_table(letters, self._correct.values[rows],
+                                   self.letters.values)
+        return self._cached("letter", learner, compute)
+
+    def accuracy_by_syllable(self, learner: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Acerto por sílaba que completa a palavra ("Complete a Palavra")."""
+        def compute(rows):
+            syllables = self._challenge_syllable.values[self._challenge.values[rows]]
+            return _accuracy_table(syllables, self._correct.values[rows],
+                                   self.syllables.values)
+        return self._cached("syllable", learner, compute)
+
+    def confused_syllables(self, learner: Optional[str] = None,
+                           top: int = 10) -> List[Dict[str, Any]]:
+        """Os pares (sílaba certa, sílaba escolhida) mais frequentes nos erros."""
+        def compute(rows):
+            wrong = rows & (self._correct.values == 0)
+            expected = self._challenge_syllable.values[self._challenge.values[wrong]]
+            chosen = self._answer.values[wrong]
+            valid = expected >= 0
+            pairs = expected[valid].astype(np.int64) * len(self.answers) + chosen[valid]
+            keys, counts = np.unique(pairs, return_counts=True)
+            order = np.argsort(-counts, kind="stable")[:top]
+            return [{"expected": self.syllables.values[keys[i] // len(self.answers)],
+                     "chosen": self.answers.values[keys[i] % len(self.answers)],
+                     "count": int(counts[i])} for i in order]
+        return self._cached(f"confused:{top}", learner, compute)
+
+    def latency_distribution(self, learner: Optional[str] = None) -> Dict[str, Dict[str, Any]]:
+        """Tempo de resposta de cada jogo: percentis e histograma (segundos)."""
+        def compute(rows):
+            result = {}
+            latency = self._latency.values
+            games = self._game.values
+            for code, game in enumerate(self.games.values):
+                values = latency[rows & (games == code)]
+                values = values[~np.isnan(values)]
+                if not len(values):
+                    continue
+                p50, p90 = np.percentile(values, [50, 90])
+                counts, _ = np.histogram(values, bins=LATENCY_BINS)
+                result[game] = {"attempts": len(values), "p50": float(p50),
+                                "p90": float(p90), "histogram": counts.tolist()}
+            return result
+        return self._cached("latency", learner, compute)
+
+    def dictation_word_errors(self, learner: Optional[str] = None,
+                              top: int = 15) -> List[Dict[str, Any]]:
+        """As palavras do ditado com maior taxa de erro."""
+        def compute(rows):
+            in_rows = rows[self._word_row.values]
+            table = _accuracy_table(self._word.values[in_rows],
+                                    1 - self._word_error.values[in_rows],
+                                    self.words.values)
+            for entry in table:
+                entry["error_rate"] = 1 - entry.pop("accuracy")
+            table.sort(key=lambda e: (-e["error_rate"], -e["attempts"]))
+            return table[:top]
+        return self._cached(f"words:{top}", learner, compute)
+
+
+_engine: Optional[AnalyticsEngine] = None
+_engine_lock = threading.Lock()
+
+
+def get_analytics_engine() -> Optional[AnalyticsEngine]:
+    """Retorna o motor único do processo (None se o registro estiver desativado)."""
+    global _engine
+    if _engine is None and config.PROGRESS_DB:
+        with _engine_lock:
+            if _engine is None:
+                _engine = AnalyticsEngine(config.PROGRESS_DB)
+    return _engine
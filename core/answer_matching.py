@@ -0,0 +1,325 @@
+"""Módulo de comparação de respostas escritas.
+
+Compara o que a criança escreveu com a resposta certa sem exigir
+acentos, maiúsculas ou pontuação ("elefánte", "Elefante!" e "elefante"
+são a mesma palavra), e diz onde estão os erros para que a página possa
+mostrar uma dica (letra trocada, letra faltando, palavra a mais...).
+
+1.  As respostas certas de cada jogo são preparadas uma única vez
+    (`prepared_answers`): a forma "dobrada" (Unicode NFD, sem acentos,
+    em minúsculas, sem pontuação) e a tabela de bits do algoritmo de
+    Myers.
+2.  A distância de edição usa o algoritmo bit a bit de Myers: uma
+    passada pela resposta, com operações sobre inteiros, em vez da
+    tabela completa de programação dinâmica.
+3.  Só quando a resposta não é igual, um alinhamento palavra a palavra
+    (e, dentro das palavras trocadas, letra a letra) diz o que errou.
+"""
+
+import threading
+import unicodedata
+from functools import lru_cache
+from typing import Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from core.challenge_store import get_challenge_store
+
+# Tipos de diferença de uma palavra ou letra
+OK = "ok"            # Igual
+ACCENT = "accent"    # Igual, a não ser por acento/maiúscula
+WRONG = "wrong"      # Trocada
+MISSING = "missing"  # Faltou
+EXTRA = "extra"      # Sobrou
+
+# Respostas muito maiores que a certa não são alinhadas (o alinhamento
+# cresce com o produto dos tamanhos): viram uma única palavra errada
+MAX_LENGTH_RATIO = 3
+
+
+def fold_char(char: str) -> str:
+    """Forma "dobrada" de um caractere: sem acento e em minúscula."""
+    decomposed = unicodedata.normalize("NFD", char.lower())
+    return "".join(c for c in decomposed if not unicodedata.combining(c))
+
+
+def fold(text: str) -> str:
+    """Forma "dobrada" de um texto: sem acentos, pontuação e espaços extras."""
+    return " ".join(_fold_words(text))
+
+
+def _fold_words(text: str) -> List[str]:
+    words = []
+    for word in text.split():
+        folded = "".join(c for c in fold_char(word) if c.isalnum())
+        if folded:
+            words.append(folded)
+    return words
+
+
+def _words(text: str) -> List[str]:
+    """As palavras do texto original que não são só pontuação."""
+    return [w for w in text.split() if any(c.isalnum() for c in w)]
+
+
+class PreparedAnswer(NamedTuple):
+    """Uma resposta certa já preparada para comparação."""
+    text: str               # Como está no conteúdo
+    folded: str             # Forma dobrada
+    peq: Dict[str, int]     # Myers: letra -> bits das posições em que aparece
+
+
+@lru_cache(maxsize=4096)
+def prepare(text: str) -> PreparedAnswer:
+    """Prepara uma resposta certa (resultado guardado em cache)."""
+    folded = fold(text)
+    peq: Dict[str, int] = {}
+    for position, char in enumerate(folded):
+        peq[char] = peq.get(char, 0) | (1 << position)
+    return PreparedAnswer(text, folded, peq)
+
+
+def myers_distance(pattern: PreparedAnswer, text: str) -> int:
+    """Distância de edição (Levenshtein) entre a resposta certa e `text`.
+
+    Algoritmo bit a bit de Myers (na formulação de Hyyrö): as colunas
+    da tabela de programação dinâmica são guardadas como vetores de
+    bits (inteiros do Python), então cada letra de `text` custa umas
+    poucas operações, sem laço sobre as letras da resposta certa.
+
+    Args:
+        pattern: A resposta certa preparada.
+        text: O texto já dobrado (ver `fold`).
+    """
+    m = len(pattern.folded)
+    if m == 0:
+        return len(text)
+    full = (1 << m) - 1
+    last = 1 << (m - 1)
+    peq = pattern.peq
+    pv, mv, score = full, 0, m
+    for char in text:
+        eq = peq.get(char, 0)
+        xv = eq | mv
+        xh = (((eq & pv) + pv) ^ pv) | eq
+        ph = (mv | ~(xh | pv)) & full
+        mh = pv & xh
+        if ph & last:
+            score += 1
+        elif mh & last:
+            score -= 1
+        ph = ((ph << 1) | 1) & full
+        mh = (mh << 1) & full
+        pv = (mh | ~(xv | ph)) & full
+        mv = ph & xv
+    return score
+
+
+class WordDiff(NamedTuple):
+    """A diferença em uma palavra da resposta."""
+    op: str  # OK, ACCENT, WRONG, MISSING ou EXTRA
+    expected: str  # A palavra certa ("" se EXTRA)
+    given: str  # A palavra escrita ("" se MISSING)
+    letters: Tuple[Tuple[str, str, str], ...] = ()  # (op, certa, escrita) se WRONG/ACCENT
+
+
+class MatchResult(NamedTuple):
+    """O resultado da comparação de uma resposta."""
+    correct: bool  # Igual, a não ser por acentos, maiúsculas ou pontuação
+    exact: bool  # Igual também nos acentos (maiúsculas e espaços não contam)
+    distance: int  # Letras a trocar/incluir/remover para acertar
+    words: Tuple[WordDiff, ...]  # Vazio se a resposta for exata
+
+
+def _align(expected: Sequence[str], given: Sequence[str],
+           cost: Callable[[str, str], float]) -> List[Tuple[str, int, int]]:
+    """Alinha duas sequências (programação dinâmica com caminho de volta).
+
+    Args:
+        expected: A sequência certa (letras ou palavras).
+        given: A sequência escrita.
+        cost: O custo de trocar um item pelo outro (0 = iguais). Faltar
+              ou sobrar um item custa 1.
+
+    Returns:
+        Uma lista de (op, i, j) com op em OK, WRONG, MISSING ou EXTRA e
+        as posições em `expected` e `given` (-1 quando não se aplica).
+    """
+    n, m = len(expected), len(given)
+    costs = [[cost(e, g) for g in given] for e in expected]
+    dist = [[0.0] * (m + 1) for _ in range(n + 1)]
+    for i in range(1, n + 1):
+        dist[i][0] = i
+    for j in range(1, m + 1):
+        dist[0][j] = j
+    for i in range(1, n + 1):
+        row, previous, row_costs = dist[i], dist[i - 1], costs[i - 1]
+        for j in range(1, m + 1):
+            row[j] = min(previous[j - 1] + row_costs[j - 1],
+                         previous[j] + 1, row[j - 1] + 1)
+
+    ops = []
+    i, j = n, m
+    while i or j:
+        if i and j and dist[i][j] == dist[i - 1][j - 1] + costs[i - 1][j - 1]:
+            i, j = i - 1, j - 1
+            ops.append((OK if costs[i][j] == 0 else WRONG, i, j))
+        elif i and dist[i][j] == dist[i - 1][j] + 1:
+            i -= 1
+            ops.append((MISSING, i, -1))
+        else:
+            j -= 1
+            ops.append((EXTRA, -1, j))
+    ops.reverse()
+    return ops
+
+
+def _letter_cost(a: str, b: str) -> float:
+    return 0.0 if fold_char(a) == fold_char(b) else 1.0
+
+
+def _word_cost(a: str, b: str) -> float:
+    """Custo de trocar uma palavra (dobrada) pela outra.
+
+    Proporcional às letras diferentes, para que "cachoro" se alinhe com
+    "cachorro"; palavras com mais da metade das letras diferentes custam
+    mais que faltar uma e sobrar outra, e não são alinhadas.
+    """
+    if a == b:
+        return 0.0
+    ratio = myers_distance(prepare(a), b) / max(len(a), len(b))
+    return 2 * ratio if ratio <= 0.5 else 3.0
+
+
+def _letter_diff(expected: str, given: str) -> Tuple[Tuple[str, str, str], ...]:
+    """Alinha as letras de duas palavras (acento diferente vira ACCENT)."""
+    letters = []
+    for op, i, j in _align(expected, given, _letter_cost):
+        e = expected[i] if i >= 0 else ""
+        g = given[j] if j >= 0 else ""
+        if op == OK and e.lower() != g.lower():
+            op = ACCENT
+        letters.append((op, e, g))
+    return tuple(letters)
+
+
+def match_answer(expected: PreparedAnswer, answer: str) -> MatchResult:
+    """Compara uma resposta com a resposta certa preparada.
+
+    O caminho comum (resposta certa) custa só a dobra da resposta e uma
+    comparação; o alinhamento só é calculado quando há diferenças.
+    """
+    exact = " ".join(answer.lower().split()) == " ".join(expected.text.lower().split())
+    if exact:
+        return MatchResult(True, True, 0, ())
+
+    folded = fold(answer)
+    correct = folded == expected.folded
+    distance = 0 if correct else myers_distance(expected, folded)
+
+    if len(folded) > MAX_LENGTH_RATIO * len(expected.folded) + 10:
+        return MatchResult(False, False, distance,
+                           (WordDiff(WRONG, expected.text, answer.strip()),))
+
+    expected_words, given_words = _words(expected.text), _words(answer)
+    words = []
+    for op, i, j in _align([fold(w) for w in expected_words],
+                           [fold(w) for w in given_words], _word_cost):
+        e = expected_words[i] if i >= 0 else ""
+        g = given_words[j] if j >= 0 else ""
+        if op in (OK, WRONG):
+            e_clean = "".join(c for c in e if c.isalnum())
+            g_clean = "".join(c for c in g if c.isalnum())
+            if op == OK and e_clean.lower() == g_clean.lower():
+                words.append(WordDiff(OK, e, g))
+                continue
+            letters = _letter_diff(e_clean, g_clean)
+            words.append(WordDiff(ACCENT if op == OK else WRONG, e, g, letters))
+        else:
+            words.append(WordDiff(op, e, g))
+
+    # Sem diferenças de letras (ex: só pontuação ou maiúsculas)
+    exact = all(w.op == OK for w in words)
+    return MatchResult(correct, exact, distance, tuple(words))
+
+
+_prepared: Dict[Tuple[str, str], Tuple[object, Tuple[PreparedAnswer, ...]]] = {}
+_prepared_lock = threading.Lock()
+
+
+def prepared_answers(game_key: str, field: str = "correct") -> Tuple[PreparedAnswer, ...]:
+    """Retorna as respostas certas de um jogo, preparadas uma única vez.
+
+    As respostas acompanham os desafios do `core.challenge_store`: se o
+    conteúdo for registrado de novo, são preparadas de novo.
+
+    Args:
+        game_key: A chave do jogo (já registrado no armazenamento).
+        field: O campo do desafio com a resposta certa.
+    """
+    challenges = get_challenge_store().get(game_key).challenges
+    cached = _prepared.get((game_key, field))
+    if cached is None or cached[0] is not challenges:
+        with _prepared_lock:
+            cached = _prepared.get((game_key, field))
+            if cached is None or cached[0] is not challenges:
+                cached = (challenges, tuple(prepare(c[field]) for c in challenges))
+                _prepared[(game_key, field)] = cached
+    return cached[1]
+
+
+def _escape(text: str) -> str:
+    """Escapa o que o markdown do Streamlit interpretaria na resposta escrita."""
+    return "".join("\\" + c if c in "\\`*_[]~:$#<>|" else c for c in text)
+
+
+def diagnostic_markdown(result: MatchResult, reveal: bool = False) -> Optional[str]:
+    """Mostra a resposta escrita marcando os erros (markdown do Streamlit).
+
+    Letras trocadas ou a mais ficam em vermelho, letras e palavras que
+    faltaram viram "_" vermelhos e acentos diferentes ficam em laranja.
+
+    Args:
+        result: O resultado de `match_answer`.
+        reveal: Se True, mostra a letra certa no lugar do "_" e das trocas.
+
+    Returns:
+        O texto em markdown, ou None se não houver o que marcar.
+    """
+    if not result.words:
+        return None
+    parts = []
+    for word in result.words:
+        if word.op == OK:
+            parts.append(_escape(word.given))
+        elif word.op == MISSING:
+            parts.append(f":red[**{_escape(word.expected) if reveal else '___'}**]")
+        elif word.op in (EXTRA, WRONG) and not word.letters:
+            parts.append(f":red[~~{_escape(word.given)}~~]")
+        else:
+            letters = []
+            for op, e, g in word.letters:
+                if op == OK:
+                    letters.append(g)
+                elif op == ACCENT:
+                    letters.append(f":orange[**{e if reveal else g}**]")
+                elif op == WRONG:
+                    letters.append(f":red[**{e if reveal else g}**]")
+                elif op == MISSING:
+                    letters.append(f":red[**{e if reveal else '_'}**]")
+                else:
+                    letters.append(f":red[~~{g}~~]")
+            parts.append("".join(letters))
+    return " ".join(parts)
+
+
+def word_errors(expected: str, answer: str) -> List[bool]:
+    """Para cada palavra da resposta certa, diz se a criança errou.
+
+    Acentos e pontuação não contam como erro, como na verificação.
+    """
+    result = match_answer(prepare(expected), answer)
+    count = len(_words(expected))
+    if not result.words:
+        return [False] * count
+    errors = [w.op in (WRONG, MISSING) for w in result.words if w.op != EXTRA]
+    # Resposta longa demais para alinhar: todas as palavras contam como erro
+    return errors if len(errors) == count else [True] * count
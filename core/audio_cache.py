@@ -0,0 +1,329 @@
+"""Módulo de cache de áudio em camadas.
+
+Guarda os MP3s gerados pelo TTS para que palavras e sílabas repetidas
+não precisem de uma nova ida à internet. A chave é um hash do conteúdo
+(texto, idioma, velocidade e voz), então o mesmo áudio é reaproveitado
+por todas as sessões do servidor.
+
+Camadas:
+1.  Memória: um LRU com orçamento em bytes (respostas em microssegundos).
+2.  Pacote de áudio: MP3s pré-gerados no deploy (ver `core.audio_pack`),
+    somente leitura.
+3.  Disco: uma pasta de arquivos `.mp3` que sobrevive a reinícios do
+    servidor, com remoção dos arquivos mais antigos quando passa do limite.
+"""
+
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Optional
+
+from core import config
+
+
+def make_audio_key(text: str, lang: str, slow: bool, voice: Optional[str]) -> str:
+    """Calcula a chave de cache (hash SHA-256) de um pedido de áudio.
+
+    Args:
+        text: O texto a ser falado.
+        lang: O código do idioma (ex: "pt-br").
+        slow: Se a fala é lenta.
+        voice: A voz/sotaque usada pelo TTS (ou None para a padrão).
+
+    Returns:
+        A chave hexadecimal que identifica unicamente este áudio.
+    """
+    raw = "\x1f".join([text, lang, "1" if slow else "0", voice or ""])
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class MemoryLRUCache:
+    """Cache LRU em memória limitado pelo total de bytes armazenados."""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+        self.evictions = 0
+        self._items: "OrderedDict[str, bytes]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Retorna o áudio da chave (marcando-o como recente) ou None."""
+        with self._lock:
+            data = self._items.get(key)
+            if data is not None:
+                self._items.move_to_end(key)
+            return data
+
+    def put(self, key: str, data: bytes):
+        """Guarda um áudio, removendo os menos usados se passar do orçamento.
+
+        Itens maiores que o orçamento inteiro não são guardados.
+        """
+        if len(data) > self.max_bytes:
+            return
+        with self._lock:
+            old = self._items.pop(key, None)
+            if old is not None:
+                self.current_bytes -= len(old)
+            self._items[key] = data
+            self.current_bytes += len(data)
+            while self.current_bytes > self.max_bytes:
+                _, evicted = self._items.popitem(last=False)
+                self.current_bytes -= len(evicted)
+                self.evictions += 1
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+
+class DiskCache:
+    """Cache persistente em disco, um arquivo `<chave>.mp3` por áudio.
+
+    O tamanho total é controlado pela data de último uso (mtime) dos
+    arquivos: ao passar do limite, os arquivos usados há mais tempo
+    são apagados primeiro.
+    """
+
+    SUFFIX = ".mp3"
+
+    def __init__(self, directory: Path, max_bytes: int):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.evictions = 0
+        self._sizes: Optional[Dict[str, int]] = None  # Índice carregado sob demanda
+        self._current_bytes = 0
+        self._lock = threading.Lock()
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}{self.SUFFIX}"
+
+    def _load_index(self):
+        """Varre a pasta uma única vez para conhecer o tamanho atual."""
+        if self._sizes is not None:
+            return
+        self._sizes = {}
+        self._current_bytes = 0
+        if self.directory.is_dir():
+            for entry in os.scandir(self.directory):
+                if entry.name.endswith(self.SUFFIX):
+                    size = entry.stat().st_size
+                    self._sizes[entry.name[:-len(self.SUFFIX)]] = size
+                    self._current_bytes += size
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Lê o áudio do disco (atualizando seu último uso) ou retorna None."""
+        path = self._path(key)
+        try:
+            data = path.read_bytes()
+        except OSError:
+            return None
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return data
+
+    def put(self, key: str, data: bytes):
+        """Grava o áudio de forma atômica e aplica o limite de tamanho."""
+        if len(data) > self.max_bytes:
+            return
+        with self._lock:
+            self._load_index()
+            self.directory.mkdir(parents=True, exist_ok=True)
+            path = self._path(key)
+            tmp_path = path.with_suffix(f".{threading.get_ident()}.tmp")
+            try:
+                tmp_path.write_bytes(data)
+                os.replace(tmp_path, path)
+            except OSError:
+                # Disco cheio ou sem permissão: o cache em disco é opcional
+                tmp_path.unlink(missing_ok=True)
+                return
+            self._current_bytes += len(data) - self._sizes.get(key, 0)
+            self._sizes[key] = len(data)
+            if self._current_bytes > self.max_bytes:
+                self._evict()
+
+    def _evict(self):
+        """Apaga os arquivos usados há mais tempo até caber no limite."""
+        by_age = []
+        for key in self._sizes:
+            try:
+                by_age.append((self._path(key).stat().st_mtime, key))
+            except OSError:
+                by_age.append((0.0, key))
+        by_age.sort()
+
+        for _, key in by_age:
+            if self._current_bytes <= self.max_bytes:
+                break
+            self._path(key).unlink(missing_ok=True)
+            self._current_bytes -= self._sizes.pop(key)
+            self.evictions += 1
+
+    @property
+    def current_bytes(self) -> int:
+        with self._lock:
+            self._load_index()
+            return self._current_bytes
+
+
+# Versão do formato do manifesto do pacote de áudio
+AUDIO_PACK_FORMAT = 1
+AUDIO_PACK_MANIFEST = "manifest.json"
+
+
+class AudioPack:
+    """Leitor (somente leitura) de um pacote de áudio pré-gerado.
+
+    O pacote é uma pasta com um `manifest.json` e um arquivo
+    `<chave>.mp3` por texto. O manifesto é lido uma única vez, na
+    primeira busca; um pacote ausente ou de outro formato é tratado
+    como vazio.
+    """
+
+    def __init__(self, directory: Path):
+        self.directory = Path(directory)
+        self._entries: Optional[Dict[str, dict]] = None
+        self.version: Optional[str] = None
+
+    def _load_manifest(self) -> Dict[str, dict]:
+        if self._entries is None:
+            entries = {}
+            try:
+                manifest = json.loads(
+                    (self.directory / AUDIO_PACK_MANIFEST).read_text("utf-8")
+                )
+                if manifest.get("format") == AUDIO_PACK_FORMAT:
+                    entries = manifest.get("entries", {})
+                    self.version = manifest.get("version")
+            except (OSError, ValueError):
+                pass
+            self._entries = entries
+        return self._entries
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._load_manifest()
+
+    def __len__(self) -> int:
+        return len(self._load_manifest())
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Lê o áudio da chave se ele estiver no pacote, senão None."""
+        entry = self._load_manifest().get(key)
+        if entry is None:
+            return None
+        try:
+            return (self.directory / entry["file"]).read_bytes()
+        except OSError:
+            return None
+
+
+class AudioCache:
+    """Combina as camadas de memória, pacote e disco com contadores de uso.
+
+    A busca tenta primeiro a memória, depois o pacote pré-gerado e por
+    fim o disco; um acerto no pacote ou no disco "promove" o áudio para
+    a memória.
+    """
+
+    def __init__(self, memory: MemoryLRUCache, disk: Optional[DiskCache],
+                 pack: Optional[AudioPack] = None):
+        self.memory = memory
+        self.disk = disk
+        self.pack = pack
+        self.memory_hits = 0
+        self.pack_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        # Os contadores são atualizados por várias threads (sessões,
+        # pré-carregamento, trechos, aquecimento): `+=` sem lock perde somas
+        self._counter_lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Busca um áudio pela chave nas duas camadas."""
+        data = self.memory.get(key)
+        if data is not None:
+            with self._counter_lock:
+                self.memory_hits += 1
+            return data
+
+        if self.pack is not None:
+            data = self.pack.get(key)
+            if data is not None:
+                with self._counter_lock:
+                    self.pack_hits += 1
+                self.memory.put(key, data)
+                return data
+
+        if self.disk is not None:
+            data = self.disk.get(key)
+            if data is not None:
+                with self._counter_lock:
+                    self.disk_hits += 1
+                self.memory.put(key, data)
+                return data
+
+        with self._counter_lock:
+            self.misses += 1
+        return None
+
+    def put(self, key: str, data: bytes):
+        """Guarda um áudio recém-gerado nas duas camadas."""
+        self.memory.put(key, data)
+        if self.disk is not None:
+            self.disk.put(key, data)
+
+    def stats(self) -> Dict[str, int]:
+        """Retorna os contadores para dimensionar o cache em sala de aula.
+
+        Returns:
+            Um dicionário com acertos por camada, faltas, remoções e o
+            uso atual de bytes de cada camada.
+        """
+        with self._counter_lock:
+            counters = {
+                "memory_hits": self.memory_hits,
+                "pack_hits": self.pack_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+            }
+        return {
+            **counters,
+            "memory_evictions": self.memory.evictions,
+            "disk_evictions": self.disk.evictions if self.disk else 0,
+            "memory_items": len(self.memory),
+            "pack_items": len(self.pack) if self.pack else 0,
+            "memory_bytes": self.memory.current_bytes,
+            "disk_bytes": self.disk.current_bytes if self.disk else 0,
+        }
+
+
+_audio_cache: Optional[AudioCache] = None
+_audio_cache_lock = threading.Lock()
+
+
+def get_audio_cache() -> AudioCache:
+    """Retorna o cache de áudio único do processo (criado na 1ª chamada).
+
+    O cache é compartilhado entre todas as sessões, pois os módulos do
+    pacote `core` são importados uma única vez pelo servidor Streamlit.
+    """
+    global _audio_cache
+    if _audio_cache is None:
+        with _audio_cache_lock:
+            if _audio_cache is None:
+                disk = None
+                if config.AUDIO_DISK_CACHE_BYTES > 0:
+                    disk = DiskCache(config.AUDIO_DISK_CACHE_DIR,
+                                     config.AUDIO_DISK_CACHE_BYTES)
+                _audio_cache = AudioCache(
+                    MemoryLRUCache(config.AUDIO_MEMORY_CACHE_BYTES),
+                    disk,
+                    AudioPack(config.AUDIO_PACK_DIR),
+                )
+    return _audio_cache
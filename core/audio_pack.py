@@ -0,0 +1,212 @@
+"""Módulo gerador do pacote de áudio offline.
+
+Percorre todo o conteúdo do `data_manager` que o app pode falar
+(letras, palavras, as 80 sílabas, palavras e frases dos jogos) e
+gera os MP3s de uma vez, em paralelo, em uma pasta versionada com
+um `manifest.json`. O `generate_audio_mp3` consulta esse pacote antes
+de ir à internet, então um deploy com o pacote pronto começa com
+latência zero de TTS.
+
+A geração é incremental: áudios que já estão no pacote (mesma chave
+de texto, idioma, velocidade e voz) são reaproveitados e só o
+conteúdo novo é sintetizado.
+
+Uso:
+    python -m core.audio_pack            # gera/atualiza o pacote
+    python -m core.audio_pack --list     # só lista os textos
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from core import config
+from core import data_manager
+from core.audio_cache import AUDIO_PACK_FORMAT, AUDIO_PACK_MANIFEST
+
+
+def collect_speakable_texts() -> List[str]:
+    """Lista (sem repetições, em ordem estável) todo texto que o app fala.
+
+    Returns:
+        Os textos de letras, palavras de exemplo, sílabas, palavras
+        completas e frases de todos os módulos.
+    """
+    texts = []
+
+    # Módulo 1: a letra e a palavra de exemplo
+    for letter, example in data_manager.LETTER_EXAMPLES.items():
+        texts.append(letter)
+        texts.append(example["word"])
+
+    # Módulo 2: a matriz completa consoante x vogal
+    for consonant in data_manager.SYLLABLE_CONSONANTS:
+        for vowel in data_manager.SYLLABLE_VOWELS:
+            texts.append(consonant + vowel)
+
+    # Módulos 3 a 6: os áudios tocados pelos jogos
+    texts.extend(c["full_word"] for c in data_manager.COMPLETE_WORD_CHALLENGES)
+    texts.extend(c["correct"] for c in data_manager.IMAGE_TO_WORD_CHALLENGES)
+    texts.extend(c["correct"] for c in data_manager.SENTENCE_SCRAMBLE_CHALLENGES)
+    texts.extend(c["sentence"] for c in data_manager.DICTATION_CHALLENGES)
+
+    return list(dict.fromkeys(texts))
+
+
+def _load_manifest(pack_dir: Path) -> Dict[str, dict]:
+    """Lê as entradas do manifesto atual (vazio se não existir/for de outro formato)."""
+    try:
+        manifest = json.loads((pack_dir / AUDIO_PACK_MANIFEST).read_text("utf-8"))
+    except (OSError, ValueError):
+        return {}
+    if manifest.get("format") != AUDIO_PACK_FORMAT:
+        return {}
+    return manifest.get("entries", {})
+
+
+def _pack_version(entries: Dict[str, dict]) -> str:
+    """Versão do pacote: um hash curto do conjunto de chaves e conteúdos."""
+    digest = hashlib.sha256()
+    for key in sorted(entries):
+        digest.update(key.encode("ascii"))
+        digest.update(entries[key]["sha256"].encode("ascii"))
+    return digest.hexdigest()[:12]
+
+
+def render_audio_pack(pack_dir: Optional[Path] = None,
+                      texts: Optional[List[str]] = None,
+                      workers: Optional[int] = None,
+                      force: bool = False,
+                      lang: Optional[str] = None,
+                      voice: Optional[str] = None) -> Dict[str, int]:
+    """Gera (ou atualiza) o pacote de áudio em paralelo.
+
+    O pacote é gerado pelo motor preferido da configuração
+    (`config.TTS_BACKENDS`), sem cair nos motores alternativos.
+
+    Args:
+        pack_dir: A pasta do pacote (padrão: `config.AUDIO_PACK_DIR`).
+        texts: Os textos a gerar (padrão: `collect_speakable_texts()`).
+        workers: Quantas sínteses simultâneas (padrão: `config.AUDIO_PACK_WORKERS`).
+        force: Se True, gera tudo de novo mesmo o que já está no pacote.
+        lang: O idioma (padrão: `config.TTS_LANG`).
+        voice: A voz do TTS (padrão: `config.TTS_VOICE`).
+
+    Returns:
+        Um resumo com o total de textos, quantos foram gerados,
+        reaproveitados e quantos falharam, e quantos áudios antigos
+        foram apagados.
+    """
+    # Importado aqui para que ler o pacote não dependa do TTS
+    from core.audio_utils import audio_cache_key, synthesize_mp3
+
+    pack_dir = Path(pack_dir or config.AUDIO_PACK_DIR)
+    texts = collect_speakable_texts() if texts is None else texts
+    workers = max(1, workers or config.AUDIO_PACK_WORKERS)
+    lang = lang or config.TTS_LANG
+    voice = voice or config.TTS_VOICE or None
+
+    pack_dir.mkdir(parents=True, exist_ok=True)
+    previous = {} if force else _load_manifest(pack_dir)
+
+    entries: Dict[str, dict] = {}
+    pending = {}
+    for text in texts:
+        key = audio_cache_key(text, lang, False, voice)
+        old = previous.get(key)
+        if old is not None and (pack_dir / old["file"]).is_file():
+            entries[key] = old
+        else:
+            pending[key] = text
+
+    def _render(key: str, text: str) -> dict:
+        audio_bytes = synthesize_mp3(text, lang, False, voice)
+        file_name = f"{key}.mp3"
+        tmp_path = pack_dir / f"{file_name}.tmp"
+        tmp_path.write_bytes(audio_bytes)
+        os.replace(tmp_path, pack_dir / file_name)
+        return {
+            "text": text,
+            "file": file_name,
+            "bytes": len(audio_bytes),
+            "sha256": hashlib.sha256(audio_bytes).hexdigest(),
+        }
+
+    failed = 0
+    # Pool limitado: evita abrir dezenas de conexões ao Google de uma vez
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(_render, key, text): key
+                   for key, text in pending.items()}
+        for future in as_completed(futures):
+            key = futures[future]
+            try:
+                entries[key] = future.result()
+            except Exception as e:
+                failed += 1
+                print(f"Falha ao gerar '{pending[key]}': {e}", file=sys.stderr)
+
+    manifest = {
+        "format": AUDIO_PACK_FORMAT,
+        "version": _pack_version(entries),
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "lang": lang,
+        "voice": voice,
+        "entries": dict(sorted(entries.items())),
+    }
+    tmp_manifest = pack_dir / f"{AUDIO_PACK_MANIFEST}.tmp"
+    tmp_manifest.write_text(json.dumps(manifest, ensure_ascii=False, indent=2), "utf-8")
+    os.replace(tmp_manifest, pack_dir / AUDIO_PACK_MANIFEST)
+
+    # Remove do disco os áudios que o novo manifesto não usa (conteúdo que
+    # saiu do app, ou de um manifesto ignorado com `force`)
+    used = {entry["file"] for entry in entries.values()}
+    removed = 0
+    for path in pack_dir.glob("*.mp3"):
+        if path.name not in used:
+            path.unlink(missing_ok=True)
+            removed += 1
+
+    return {
+        "total": len(texts),
+        "rendered": len(pending) - failed,
+        "reused": len(entries) - (len(pending) - failed),
+        "failed": failed,
+        "removed": removed,
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Ponto de entrada da linha de comando."""
+    parser = argparse.ArgumentParser(
+        description="Gera o pacote de áudio offline com todo o conteúdo do app."
+    )
+    parser.add_argument("--output", type=Path, default=config.AUDIO_PACK_DIR,
+                        help="Pasta do pacote (padrão: %(default)s)")
+    parser.add_argument("--workers", type=int, default=config.AUDIO_PACK_WORKERS,
+                        help="Sínteses simultâneas (padrão: %(default)s)")
+    parser.add_argument("--force", action="store_true",
+                        help="Gera tudo de novo, ignorando o pacote existente")
+    parser.add_argument("--list", action="store_true",
+                        help="Apenas lista os textos que seriam gerados")
+    args = parser.parse_args(argv)
+
+    if args.list:
+        for text in collect_speakable_texts():
+            print(text)
+        return 0
+
+    summary = render_audio_pack(args.output, workers=args.workers, force=args.force)
+    print(f"Pacote em {args.output}: {summary['total']} textos, "
+          f"{summary['rendered']} gerados, {summary['reused']} reaproveitados, "
+          f"{summary['failed']} falhas, {summary['removed']} áudios antigos apagados.")
+    return 1 if summary["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,198 @@
+"""Módulo do sprite de áudio das sílabas (Módulo 2).
+
+Em vez de gerar e enviar um áudio novo a cada clique nos botões de
+consoante e vogal, os 80 clipes (consoante x vogal) são juntados uma
+única vez em um só MP3, com um índice de onde cada sílaba começa e
+termina. O navegador baixa esse sprite uma vez por sessão, por meio de
+um pequeno componente (`core/components/syllable_player`), e cada
+seleção só envia o trecho da sílaba escolhida.
+
+O sprite é salvo em disco junto do componente e reaproveitado entre
+reinícios enquanto os áudios de origem não mudarem. Sem um sprite salvo,
+ele é montado em segundo plano no primeiro acesso (enquanto isso, a
+página toca cada sílaba do jeito tradicional); o ideal é gerá-lo no
+deploy com:
+    python -m core.audio_sprite
+"""
+
+import hashlib
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import streamlit.components.v1 as components
+
+from core import config
+from core import mp3_utils
+from core.audio_utils import audio_cache_key, fetch_audio
+from core.data_manager import SYLLABLE_CONSONANTS, SYLLABLE_VOWELS
+
+COMPONENT_DIR = Path(__file__).resolve().parent / "components" / "syllable_player"
+SPRITE_DIR = COMPONENT_DIR / "sprites"
+SPRITE_INDEX = SPRITE_DIR / "index.json"
+
+# Silêncio entre as sílabas, para que o fim de um trecho não "vaze" no outro
+SPRITE_GAP_SECONDS = 0.25
+
+_syllable_player = components.declare_component("syllable_player", path=str(COMPONENT_DIR))
+
+_sprite: Optional[Dict] = None
+_sprite_lock = threading.Lock()
+_sprite_builder: Optional[threading.Thread] = None
+# Até quando (time.monotonic()) uma montagem que falhou não é tentada de novo
+_sprite_retry_at = 0.0
+
+
+def list_syllables() -> List[str]:
+    """Lista as 80 sílabas do Módulo 2, na ordem do sprite."""
+    return [c + v for c in SYLLABLE_CONSONANTS for v in SYLLABLE_VOWELS]
+
+
+def _sources_digest(syllables: List[str]) -> str:
+    """Hash das chaves de áudio das sílabas: muda se a voz/motor mudar."""
+    digest = hashlib.sha256()
+    for syllable in syllables:
+        key = audio_cache_key(syllable, config.TTS_LANG, False, config.TTS_VOICE or None)
+        digest.update(key.encode("ascii"))
+    return digest.hexdigest()[:12]
+
+
+def build_syllable_sprite() -> Dict:
+    """Gera o sprite com todas as sílabas e o salva junto do componente.
+
+    Os clipes vêm do cache/pacote de áudio (ou são sintetizados em
+    paralelo, se faltarem) e são juntados com um pequeno silêncio entre
+    eles.
+
+    Returns:
+        O índice do sprite: o nome do arquivo e, para cada sílaba, o
+        trecho [início, fim) em segundos.
+
+    Raises:
+        MP3FormatError: Se o motor de TTS não gerar MP3 (ex: espeak em WAV).
+    """
+    syllables = list_syllables()
+    with ThreadPoolExecutor(max_workers=config.AUDIO_PACK_WORKERS) as pool:
+        clips = list(pool.map(fetch_audio, syllables))
+
+    gap = mp3_utils.silence(clips[0], SPRITE_GAP_SECONDS)
+    gap_seconds = mp3_utils.mp3_duration(gap)
+
+    parts = []
+    index = {}
+    position = 0.0
+    for syllable, clip in zip(syllables, clips):
+        clip = mp3_utils.strip_tags(clip)
+        duration = mp3_utils.mp3_duration(clip)
+        index[syllable] = [round(position, 4), round(position + duration, 4)]
+        parts.extend([clip, gap])
+        position += duration + gap_seconds
+
+    sprite_bytes = b"".join(parts)
+    # O nome leva o hash do conteúdo: o navegador pode guardar o arquivo
+    # em cache sem risco de tocar um sprite antigo
+    file_name = f"syllables-{hashlib.sha256(sprite_bytes).hexdigest()[:12]}.mp3"
+
+    SPRITE_DIR.mkdir(parents=True, exist_ok=True)
+    for old in SPRITE_DIR.glob("syllables-*.mp3"):
+        old.unlink(missing_ok=True)
+    (SPRITE_DIR / file_name).write_bytes(sprite_bytes)
+
+    sprite = {
+        "sources": _sources_digest(syllables),
+        "file": f"sprites/{file_name}",
+        "clips": index,
+    }
+    tmp_index = SPRITE_INDEX.with_suffix(".tmp")
+    tmp_index.write_text(json.dumps(sprite, indent=2), "utf-8")
+    os.replace(tmp_index, SPRITE_INDEX)
+    return sprite
+
+
+def _load_saved_sprite() -> Optional[Dict]:
+    """Lê o sprite salvo, se ele ainda corresponder aos áudios atuais."""
+    try:
+        sprite = json.loads(SPRITE_INDEX.read_text("utf-8"))
+    except (OSError, ValueError):
+        return None
+    if sprite.get("sources") != _sources_digest(list_syllables()):
+        return None
+    if not (COMPONENT_DIR / sprite["file"]).is_file():
+        return None
+    return sprite
+
+
+def get_syllable_sprite() -> Optional[Dict]:
+    """Retorna o índice do sprite, se ele já estiver pronto.
+
+    Na primeira chamada do processo sem um sprite salvo, a montagem
+    (sintetizar as 80 sílabas) começa em uma thread de fundo e a chamada
+    retorna None na hora, sem fazer a página (nem as outras sessões)
+    esperar. Se a montagem falhar, ela só é tentada de novo depois de
+    `config.TTS_FAILURE_TTL` segundos.
+
+    Returns:
+        O índice do sprite, ou None se ele ainda estiver sendo montado ou
+        não for possível montá-lo (ex: sem internet e sem pacote de áudio,
+        ou um motor que não gera MP3). Nesse caso a página deve tocar a
+        sílaba do jeito tradicional.
+    """
+    global _sprite, _sprite_builder
+    if _sprite is not None:
+        return _sprite
+    with _sprite_lock:
+        if (_sprite is None and _sprite_builder is None
+                and time.monotonic() >= _sprite_retry_at):
+            _sprite = _load_saved_sprite()
+            if _sprite is None:
+                _sprite_builder = threading.Thread(target=_build_in_background,
+                                                   name="syllable-sprite", daemon=True)
+                _sprite_builder.start()
+    return _sprite
+
+
+def _build_in_background():
+    global _sprite, _sprite_builder, _sprite_retry_at
+    try:
+        sprite = build_syllable_sprite()
+    except Exception:
+        sprite = None
+    with _sprite_lock:
+        if sprite is None:
+            _sprite_retry_at = time.monotonic() + config.TTS_FAILURE_TTL
+        else:
+            _sprite = sprite
+        _sprite_builder = None
+
+
+def syllable_player(syllable: str, sprite: Dict, key: str = "syllable_player"):
+    """Mostra o botão que toca uma sílaba a partir do sprite.
+
+    Como o componente mantém a mesma `key` entre os reruns, o navegador
+    não baixa o sprite de novo: só recebe o novo trecho a tocar.
+
+    Args:
+        syllable: A sílaba a tocar (ex: "BA").
+        sprite: O índice retornado por `get_syllable_sprite()`.
+        key: A chave do componente no Streamlit.
+    """
+    start, end = sprite["clips"][syllable]
+    _syllable_player(
+        src=sprite["file"],
+        start=start,
+        end=end,
+        label=f"🔊 Ouvir '{syllable}'",
+        key=key,
+        default=None,
+    )
+
+
+if __name__ == "__main__":
+    built = build_syllable_sprite()
+    print(f"Sprite com {len(built['clips'])} sílabas salvo em {COMPONENT_DIR / built['file']}.")
+    sys.exit(0)
@@ -1,36 +1,406 @@
-# core/audio_utils.py
 """Módulo de utilidades para geração de áudio.
 
 Este módulo centraliza a lógica de Text-to-Speech (TTS),
-abstraindo a complexidade da biblioteca gTTS das páginas
-da aplicação.
+abstraindo das páginas da aplicação qual motor gera a fala
+(gTTS, um sintetizador local ou o motor falso de testes, ver
+`core.tts_backends`). Os áudios gerados ficam em um cache em
+camadas (ver `core.audio_cache`), então cada texto só é
+sintetizado uma vez.
+
+Frases longas (ditado, frases embaralhadas) são divididas em trechos
+nas pausas e entre palavras (`split_segments`); os trechos são
+sintetizados em paralelo e seus quadros MP3 são juntados em um só
+clipe. Cada trecho fica no cache, então frases que repetem um trecho
+não o sintetizam de novo.
+
+Pedidos simultâneos do mesmo áudio (ex: uma turma inteira no mesmo
+desafio) compartilham uma única síntese (`SingleFlight`). Um áudio que
+falhou fica marcado como indisponível por alguns segundos
+(`FailureCache`), e a página mostra o aviso na hora em vez de esperar o
+motor falhar de novo a cada execução.
 """
 
-import io
+import functools
+import math
+import threading
+import time
+from collections import OrderedDict
 import streamlit as st
-from gtts import gTTS
-from typing import Optional
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from core import config
+from core import mp3_utils
+from core.audio_cache import get_audio_cache, make_audio_key
+from core.metrics import span
+from core.tts_backends import TTSError, TTSUnavailableError, get_tts_chain
+
+
+class SingleFlight:
+    """Junta pedidos simultâneos da mesma chave em uma única execução.
+
+    O primeiro pedido de uma chave executa a função; os que chegam
+    enquanto ela roda esperam e recebem o mesmo resultado (ou a mesma
+    exceção).
+    """
+
+    def __init__(self):
+        self._calls: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: str, func: Callable[[], bytes]) -> bytes:
+        """Executa `func` para `key`, ou espera a execução já em andamento."""
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                future = self._calls[key] = Future()
+        if not leader:
+            with span("audio.wait_inflight"):
+                return future.result()
+
+        try:
+            result = func()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                del self._calls[key]
+
+    def __contains__(self, key: str) -> bool:
+        with self._lock:
+            return key in self._calls
+
+
+class FailureCache:
+    """Lembra por alguns segundos as chaves cujo áudio falhou (cache negativo)."""
+
+    def __init__(self, ttl: float, max_items: int = 1024):
+        self.ttl = ttl
+        self.max_items = max_items
+        self._items: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[str]:
+        """Retorna o erro da falha recente da chave, ou None."""
+        with self._lock:
+            item = self._items.get(key)
+            if item is None:
+                return None
+            if time.monotonic() >= item[0]:
+                del self._items[key]
+                return None
+            return item[1]
+
+    def put(self, key: str, error: str):
+        """Marca a chave como indisponível por `ttl` segundos."""
+        if self.ttl <= 0:
+            return
+        with self._lock:
+            self._items[key] = (time.monotonic() + self.ttl, error)
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_items:
+                self._items.popitem(last=False)
+
+    def clear(self):
+        """Esquece todas as falhas (ex: depois de trocar a cadeia de motores)."""
+        with self._lock:
+            self._items.clear()
+
+
+_flights = SingleFlight()
+_failures = FailureCache(config.TTS_FAILURE_TTL)
+
+
+def audio_cache_key(text: str, lang: str, slow: bool,
+                    voice: Optional[str]) -> str:
+    """Calcula a chave de cache de um áudio gerado pelo motor preferido.
+
+    Args:
+        text: O texto a ser falado.
+        lang: O código do idioma.
+        slow: Se a fala é lenta.
+        voice: A voz/sotaque (ou None para a padrão).
+
+    Returns:
+        A chave usada pelo cache e pelo pacote de áudio.
+    """
+    voice_key = get_tts_chain().primary.voice_key(voice)
+    return make_audio_key(text, lang, slow, voice_key or None)
+
+
+def synthesize_mp3(text: str, lang: str, slow: bool,
+                   voice: Optional[str]) -> bytes:
+    """Gera o áudio com o motor preferido, sem cache e sem alternativas.
+
+    Diferente de `generate_audio_mp3`, não mostra erros na tela: a
+    exceção é propagada para quem chamou (ex: o gerador de pacotes).
+    """
+    return get_tts_chain().primary.synthesize(text, lang, slow, voice)
 
 
-def generate_audio_mp3(text: str) -> Optional[bytes]:
+def _synthesize_and_cache(text: str, lang: str, slow: bool,
+                          voice: Optional[str], key: str) -> bytes:
+    """Sintetiza com a cadeia de motores e guarda o resultado no cache."""
+    cache = get_audio_cache()
+    chain = get_tts_chain()
+    audio_bytes, backend = chain.synthesize(text, lang, slow, voice)
+    if backend is chain.primary:
+        cache.put(key, audio_bytes)
+    else:
+        # Áudio de um motor alternativo: guarda só na memória, para que
+        # o motor preferido seja tentado de novo após um reinício
+        cache.memory.put(key, audio_bytes)
+    return audio_bytes
+
+
+def generate_audio_mp3(text: str, lang: Optional[str] = None,
+                       slow: bool = False,
+                       voice: Optional[str] = None) -> Optional[bytes]:
     """Gera um áudio MP3 a partir de um texto e o retorna como bytes.
 
-    Utiliza a biblioteca gTTS para converter o texto em fala (em português
-    do Brasil) e salva o resultado em um buffer de bytes na memória,
-    pronto para ser usado pelo `st.audio`.
+    Converte o texto em fala (em português do Brasil) com a cadeia de
+    motores configurada, pronto para ser usado pelo `st.audio`. Se o
+    motor preferido falhar ou demorar mais que o seu orçamento, o
+    próximo motor da configuração é usado. O resultado fica guardado no
+    cache de áudio, então pedidos repetidos não sintetizam de novo.
 
     Args:
         text: O texto a ser convertido em fala.
+        lang: O idioma da fala (padrão: `config.TTS_LANG`).
+        slow: Se True, a fala é mais lenta.
+        voice: A voz/sotaque do TTS (padrão: `config.TTS_VOICE`).
 
     Returns:
-        Um objeto de bytes contendo o áudio MP3, ou None se a geração falhar.
+        Um objeto de bytes contendo o áudio, ou None se a geração falhar.
     """
     try:
-        tts = gTTS(text=text, lang='pt-br', slow=False)
-        buffer = io.BytesIO()
-        tts.write_to_fp(buffer)
-        buffer.seek(0)
-        return buffer.getvalue()
+        return fetch_audio(text, lang, slow, voice)
+    except TTSError:
+        # Motor fora do ar (ou falhou há pouco): um aviso discreto, sem
+        # travar a página; o jogo continua sem o som
+        st.caption("🔇 O áudio está indisponível no momento.")
+        return None
     except Exception as e:
         st.error(f"Não foi possível gerar o áudio para '{text}'. Erro: {e}")
         return None
+
+
+def fetch_audio(text: str, lang: Optional[str] = None, slow: bool = False,
+                voice: Optional[str] = None) -> bytes:
+    """Busca o áudio no cache ou o sintetiza, sem mostrar nada na tela.
+
+    É o mesmo caminho do `generate_audio_mp3`, mas as falhas viram
+    exceções, para uso fora das páginas (ex: montagem do sprite de
+    sílabas).
+
+    Args:
+        text: O texto a ser convertido em fala.
+        lang: O idioma da fala (padrão: `config.TTS_LANG`).
+        slow: Se True, a fala é mais lenta.
+        voice: A voz/sotaque do TTS (padrão: `config.TTS_VOICE`).
+
+    Returns:
+        Os bytes do áudio.
+
+    Raises:
+        TTSError: Se nenhum motor conseguiu gerar o áudio, agora ou há
+                  menos de `config.TTS_FAILURE_TTL` segundos.
+    """
+    lang = lang or config.TTS_LANG
+    voice = voice or config.TTS_VOICE or None
+
+    key = audio_cache_key(text, lang, slow, voice)
+    with span("audio.cache"):
+        audio_bytes = get_audio_cache().get(key)
+    if audio_bytes is not None:
+        return audio_bytes
+
+    # Pedidos simultâneos do mesmo texto (outras sessões, pré-carregamento)
+    # esperam pela mesma síntese
+    return _coalesced(key, functools.partial(_produce_audio, text, lang, slow, voice, key))
+
+
+def _coalesced(key: str, generate: Callable[[], bytes]) -> bytes:
+    """Gera o áudio da chave uma única vez, mesmo com pedidos simultâneos.
+
+    Só um pedido por chave roda `generate` (ver `SingleFlight`). Antes,
+    relê o cache (outro pedido pode ter acabado de gerar o áudio) e
+    consulta o cache negativo; se os motores falharem, a chave fica
+    indisponível por `config.TTS_FAILURE_TTL` segundos.
+    """
+    def load_or_generate() -> bytes:
+        audio_bytes = get_audio_cache().get(key)
+        if audio_bytes is not None:
+            return audio_bytes
+        error = _failures.get(key)
+        if error is not None:
+            raise TTSError(f"Áudio indisponível (falhou há pouco): {error}")
+        try:
+            return generate()
+        except TTSUnavailableError:
+            raise  # Os disjuntores já respondem na hora (e sabem quando tentar de novo)
+        except TTSError as e:
+            _failures.put(key, str(e))
+            raise
+
+    return _flights.do(key, load_or_generate)
+
+
+# Pontuação que marca uma pausa natural da fala (fim de trecho)
+_PAUSE_MARKS = ",;:.!?…"
+
+
+def split_segments(text: str, max_words: Optional[int] = None) -> List[str]:
+    """Divide uma frase em trechos para a síntese em paralelo.
+
+    Primeiro nas pausas (vírgula, ponto...); depois, trechos com mais
+    de `max_words` palavras são divididos em partes de tamanho parecido.
+    Pontuação solta (ex: o "." das frases embaralhadas) fica com a
+    palavra anterior.
+
+    Args:
+        text: A frase.
+        max_words: Palavras por trecho (padrão: `config.TTS_SEGMENT_WORDS`;
+                   0 desativa a divisão).
+
+    Returns:
+        Os trechos, na ordem; `[text]` se a frase não precisar ser dividida.
+    """
+    if max_words is None:
+        max_words = config.TTS_SEGMENT_WORDS
+    words: List[str] = []
+    for word in text.split():
+        if words and not any(c.isalnum() for c in word):
+            words[-1] += " " + word
+        else:
+            words.append(word)
+    if max_words <= 0 or len(words) <= max_words:
+        return [text]
+
+    phrases: List[List[str]] = [[]]
+    for word in words:
+        phrases[-1].append(word)
+        if word[-1] in _PAUSE_MARKS:
+            phrases.append([])
+
+    segments = []
+    for phrase in phrases:
+        if not phrase:
+            continue
+        parts = math.ceil(len(phrase) / max_words)
+        size = math.ceil(len(phrase) / parts)
+        segments.extend(" ".join(phrase[i:i + size]) for i in range(0, len(phrase), size))
+    return segments
+
+
+def _produce_audio(text: str, lang: str, slow: bool,
+                   voice: Optional[str], key: str) -> bytes:
+    """Gera um áudio que não está no cache: em trechos, se a frase for longa."""
+    segments = split_segments(text)
+    if len(segments) > 1:
+        with span("audio.segments"):
+            audio_bytes = _synthesize_segments(segments, lang, slow, voice)
+        if audio_bytes is not None:
+            # Os trechos já estão no cache em disco: o clipe inteiro fica
+            # só na memória, e é remontado a partir deles após um reinício
+            get_audio_cache().memory.put(key, audio_bytes)
+            return audio_bytes
+
+    with span("audio.synthesis"):
+        return _synthesize_and_cache(text, lang, slow, voice, key)
+
+
+# Pool dos trechos: separado do pool de pré-carregamento, que também
+# gera frases em trechos e espera por eles
+_segment_pool = ThreadPoolExecutor(max_workers=max(1, config.TTS_SEGMENT_WORKERS),
+                                   thread_name_prefix="audio-segment")
+
+
+def _synthesize_segments(segments: List[str], lang: str, slow: bool,
+                         voice: Optional[str]) -> Optional[bytes]:
+    """Gera os trechos em paralelo (ou os lê do cache) e junta os quadros.
+
+    Returns:
+        O MP3 da frase inteira, ou None se algum trecho falhar ou se os
+        trechos não puderem ser juntados (motor que não gera MP3, ou
+        trechos de motores com formatos diferentes); nesse caso a frase
+        é gerada inteira.
+    """
+    futures = [_segment_pool.submit(_fetch_segment, segment, lang, slow, voice)
+               for segment in segments]
+    try:
+        clips = [future.result() for future in futures]
+    except Exception:
+        return None
+    formats = {mp3_utils.stream_format(clip) for clip in clips}
+    if len(formats) != 1 or None in formats:
+        return None
+    return mp3_utils.concat_mp3(clips)
+
+
+def _fetch_segment(text: str, lang: str, slow: bool, voice: Optional[str]) -> bytes:
+    """Busca um trecho no cache ou o sintetiza (sem dividi-lo de novo).
+
+    Frases diferentes podem pedir o mesmo trecho ao mesmo tempo: os
+    trechos também passam pelo `_coalesced`.
+    """
+    key = audio_cache_key(text, lang, slow, voice)
+    return _coalesced(key, functools.partial(_synthesize_and_cache,
+                                             text, lang, slow, voice, key))
+
+
+# Pool de pré-carregamento: poucas threads, para não competir com as
+# sínteses feitas na hora (e nem abrir muitas conexões ao Google)
+_prefetch_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="audio-prefetch")
+_prefetch_keys: Set[str] = set()  # Agendados e ainda não terminados
+_prefetch_lock = threading.Lock()
+
+
+def prefetch_audio(texts: Iterable[str], lang: Optional[str] = None,
+                   slow: bool = False, voice: Optional[str] = None):
+    """Agenda a síntese de áudios em segundo plano, sem bloquear a página.
+
+    Os áudios que já estão no cache (ou já estão sendo gerados) são
+    ignorados. Erros são descartados em silêncio: se o pré-carregamento
+    falhar, o `generate_audio_mp3` tenta de novo na hora de tocar.
+
+    Args:
+        texts: Os textos que provavelmente serão falados em breve.
+        lang: O idioma da fala (padrão: `config.TTS_LANG`).
+        slow: Se True, a fala é mais lenta.
+        voice: A voz/sotaque do TTS (padrão: `config.TTS_VOICE`).
+    """
+    lang = lang or config.TTS_LANG
+    voice = voice or config.TTS_VOICE or None
+    cache = get_audio_cache()
+
+    for text in texts:
+        key = audio_cache_key(text, lang, slow, voice)
+        if cache.memory.get(key) is not None or key in _flights:
+            continue
+        with _prefetch_lock:
+            if key in _prefetch_keys:
+                continue
+            _prefetch_keys.add(key)
+        future = _prefetch_pool.submit(_warm_audio, text, lang, slow, voice, key)
+        future.add_done_callback(lambda _, key=key: _prefetch_keys.discard(key))
+
+
+def _warm_audio(text: str, lang: str, slow: bool,
+                voice: Optional[str], key: str) -> bytes:
+    """Tarefa de pré-carregamento: lê do cache ou gera (junto de outros pedidos)."""
+    return _coalesced(key, functools.partial(_produce_audio, text, lang, slow, voice, key))
+
+
+def get_audio_cache_stats() -> Dict[str, int]:
+    """Retorna os contadores do cache de áudio (acertos, faltas, remoções).
+
+    Returns:
+        O dicionário de `AudioCache.stats()`.
+    """
+    return get_audio_cache().stats()
@@ -0,0 +1,254 @@
+"""Módulo do catálogo de conteúdo.
+
+Todo o conteúdo dos módulos (letras, sílabas e desafios) fica em
+arquivos JSON na pasta `data/content/`, um arquivo por módulo, em vez
+de literais Python. Assim, adicionar conteúdo não exige mexer em código.
+
+O catálogo:
+1.  Carrega cada arquivo só quando o módulo é usado pela primeira vez
+    (importar uma página não lê o conteúdo das outras).
+2.  Valida cada item contra o esquema do módulo (campos obrigatórios,
+    tipos e regras como "a resposta está entre as opções").
+3.  Indexa os itens pela chave primária (`id`), a única busca que o
+    app faz (as páginas percorrem `items`; o painel e o aquecimento
+    buscam pelo id gravado no progresso).
+
+O `core.data_manager` continua expondo os mesmos nomes de antes
+(`COMPLETE_WORD_CHALLENGES`, etc.), agora vindos do catálogo.
+"""
+
+import json
+import re
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from core import config
+
+CATALOG_SCHEMA_VERSION = 1
+
+
+class CatalogError(ValueError):
+    """Erro levantado quando um arquivo de conteúdo é inválido."""
+
+
+def _first_letter(field: str) -> Callable[[Dict[str, Any]], Optional[str]]:
+    """A letra inicial (maiúscula) de um campo de texto, se presente."""
+    return lambda item: item[field][:1].upper() if item.get(field) else None
+
+
+def _check_option_is_correct(item: Dict[str, Any]) -> Optional[str]:
+    if item["correct"] not in item["options"]:
+        return "'correct' precisa ser uma das 'options'"
+    return None
+
+
+def _check_words_form_sentence(item: Dict[str, Any]) -> Optional[str]:
+    if sorted(item["words"]) != sorted(item["correct"].split()):
+        return "'words' precisam ser exatamente as palavras de 'correct'"
+    return None
+
+
+# Esquema de cada módulo:
+# - key: o campo da chave primária
+# - fields: campo -> (tipo, obrigatório)
+# - rules: validações que envolvem mais de um campo
+# - letter: função que dá a letra inicial do item (usada pelo painel do
+#   professor), se o módulo tiver uma
+SCHEMAS: Dict[str, Dict[str, Any]] = {
+    "letters": {
+        "key": "letter",
+        "fields": {"letter": (str, True), "word": (str, True),
+                   "emoji": (str, False), "image": (str, False)},
+        "rules": [],
+        "letter": None,
+    },
+    "complete_word": {
+        "key": "id",
+        "fields": {"id": (str, True), "image": (str, False), "prompt": (str, True),
+                   "options": (list, True), "correct": (str, True),
+                   "full_word": (str, True)},
+        "rules": [_check_option_is_correct],
+        "letter": _first_letter("full_word"),
+    },
+    "image_to_word": {
+        "key": "id",
+        "fields": {"id": (str, True), "image": (str, True), "correct": (str, True),
+                   "hint": (str, False)},
+        "rules": [],
+        "letter": _first_letter("correct"),
+    },
+    "scramble_sentence": {
+        "key": "id",
+        "fields": {"id": (str, True), "image": (str, False), "words": (list, True),
+                   "correct": (str, True)},
+        "rules": [_check_words_form_sentence],
+        "letter": _first_letter("correct"),
+    },
+    "dictation": {
+        "key": "id",
+        "fields": {"id": (str, True), "image": (str, False), "sentence": (str, True),
+                   "correct": (str, True)},
+        "rules": [],
+        "letter": _first_letter("correct"),
+    },
+}
+
+
+def validate_items(module: str, items: List[Dict[str, Any]]):
+    """Valida os itens de um módulo contra o seu esquema.
+
+    Args:
+        module: O nome do módulo (ex: "complete_word").
+        items: Os itens lidos do arquivo de conteúdo.
+
+    Raises:
+        CatalogError: Com a lista de todos os problemas encontrados.
+    """
+    schema = SCHEMAS[module]
+    problems = []
+    seen_keys = set()
+
+    for position, item in enumerate(items):
+        label = f"{module}[{position}]"
+        if not isinstance(item, dict):
+            problems.append(f"{label}: item precisa ser um objeto")
+            continue
+
+        field_ok = True
+        for field, (expected, required) in schema["fields"].items():
+            if field not in item:
+                if required:
+                    problems.append(f"{label}: falta o campo '{field}'")
+                    field_ok = False
+            elif not isinstance(item[field], expected):
+                problems.append(f"{label}: '{field}' deve ser {expected.__name__}")
+                field_ok = False
+        for field in item:
+            if field not in schema["fields"]:
+                problems.append(f"{label}: campo desconhecido '{field}'")
+        if not field_ok:
+            continue
+
+        key = item[schema["key"]]
+        if key in seen_keys:
+            problems.append(f"{label}: '{schema['key']}' repetido: '{key}'")
+        seen_keys.add(key)
+
+        for rule in schema["rules"]:
+            problem = rule(item)
+            if problem:
+                problems.append(f"{label} ('{key}'): {problem}")
+
+    if problems:
+        raise CatalogError(
+            f"Conteúdo inválido em '{module}':\n  " + "\n  ".join(problems)
+        )
+
+
+class CatalogModule:
+    """Os itens de um módulo, com o índice pela chave primária."""
+
+    def __init__(self, name: str, items: List[Dict[str, Any]]):
+        self.name = name
+        self.items = items
+        self._by_key = {item[SCHEMAS[name]["key"]]: item for item in items}
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Busca um item pela chave primária (O(1))."""
+        return self._by_key.get(key)
+
+
+def read_content_file(path: Path) -> Dict[str, Any]:
+    """Lê um arquivo de conteúdo e confere a versão do esquema."""
+    try:
+        payload = json.loads(path.read_text("utf-8"))
+    except OSError as e:
+        raise CatalogError(f"Não foi possível ler '{path}': {e}") from e
+    except ValueError as e:
+        raise CatalogError(f"JSON inválido em '{path}': {e}") from e
+    if payload.get("schema_version") != CATALOG_SCHEMA_VERSION:
+        raise CatalogError(
+            f"'{path}' tem schema_version {payload.get('schema_version')!r}, "
+            f"esperado {CATALOG_SCHEMA_VERSION}."
+        )
+    return payload
+
+
+def write_content_file(path: Path, payload: Dict[str, Any]):
+    """Grava um arquivo de conteúdo em JSON legível (listas curtas em uma linha)."""
+    text = json.dumps(payload, ensure_ascii=False, indent=2)
+    # Junta em uma linha as listas que só têm valores simples
+    text = re.sub(r"\[\s+([^\[\]{}]*?)\s+\]",
+                  lambda m: "[" + re.sub(r",\s+", ", ", m.group(1)) + "]", text)
+    path.write_text(text + "\n", "utf-8")
+
+
+class Catalog:
+    """Acesso preguiçoso aos módulos de conteúdo de uma pasta."""
+
+    def __init__(self, content_dir: Path):
+        self.content_dir = Path(content_dir)
+        self._modules: Dict[str, CatalogModule] = {}
+        self._syllables: Optional[Tuple[Tuple[str, ...], Tuple[str, ...]]] = None
+        self._lock = threading.Lock()
+
+    def module(self, name: str) -> CatalogModule:
+        """Retorna um módulo, carregando e validando seu arquivo na 1ª vez.
+
+        Args:
+            name: O nome do módulo (uma das chaves de `SCHEMAS`).
+
+        Raises:
+            CatalogError: Se o arquivo estiver ausente ou inválido.
+        """
+        if name not in self._modules:
+            if name not in SCHEMAS:
+                raise CatalogError(f"Módulo de conteúdo desconhecido: '{name}'.")
+            with self._lock:
+                if name not in self._modules:
+                    payload = read_content_file(self.content_dir / f"{name}.json")
+                    items = payload.get("items", [])
+                    validate_items(name, items)
+                    self._modules[name] = CatalogModule(name, items)
+        return self._modules[name]
+
+    def syllables(self) -> Tuple[Tuple[str, ...], Tuple[str, ...]]:
+        """Retorna as consoantes e vogais do Módulo 2."""
+        if self._syllables is None:
+            payload = read_content_file(self.content_dir / "syllables.json")
+            consonants = tuple(payload.get("consonants", ()))
+            vowels = tuple(payload.get("vowels", ()))
+            if not consonants or not vowels:
+                raise CatalogError("'syllables.json' precisa de 'consonants' e 'vowels'.")
+            self._syllables = (consonants, vowels)
+        return self._syllables
+
+
+_catalog: Optional[Catalog] = None
+_catalog_lock = threading.Lock()
+
+
+def get_catalog() -> Catalog:
+    """Retorna o catálogo único do processo (pasta `config.CONTENT_DIR`)."""
+    global _catalog
+    if _catalog is None:
+        with _catalog_lock:
+            if _catalog is None:
+                _catalog = Catalog(config.CONTENT_DIR)
+    return _catalog
+
+
+if __name__ == "__main__":
+    # Valida todo o conteúdo: python -m core.catalog
+    catalog = get_catalog()
+    try:
+        consonants, vowels = catalog.syllables()
+        print(f"syllables: {len(consonants)} consoantes x {len(vowels)} vogais")
+        for module_name in SCHEMAS:
+            print(f"{module_name}: {len(catalog.module(module_name))} itens")
+    except CatalogError as e:
+        raise SystemExit(str(e))
@@ -0,0 +1,107 @@
+"""Módulo de armazenamento compartilhado dos desafios.
+
+Os desafios são os mesmos para todas as crianças, então eles ficam
+uma única vez na memória do processo, em uma forma imutável (dicts
+viram `MappingProxyType` e listas viram tuplas). O `st.session_state`
+de cada sessão guarda só o que é da criança: a posição do desafio
+atual, o status e o estado do sorteio.
+
+Como nada aqui pode ser alterado, uma sessão nunca "suja" o conteúdo
+que as outras estão vendo.
+
+Cada registro recebe uma versão; as sessões guardam só esse número e,
+quando o conteúdo muda, pedem os ids da versão antiga (`ids`) para
+levar o histórico do sorteio para as novas posições.
+"""
+
+import itertools
+import threading
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, NamedTuple, Optional, Tuple
+
+# Quantas versões antigas de cada jogo têm os ids guardados
+ID_HISTORY = 8
+
+
+def freeze(value: Any) -> Any:
+    """Converte dicts e listas (recursivamente) em versões imutáveis."""
+    if isinstance(value, Mapping):
+        return MappingProxyType({k: freeze(v) for k, v in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(v) for v in value)
+    return value
+
+
+class GameContent(NamedTuple):
+    """O conteúdo imutável de um jogo."""
+    challenges: Tuple[Mapping[str, Any], ...]
+    audio_field: Optional[str]
+    source: List[Dict[str, Any]]  # A lista original, para detectar mudanças
+    ids: Tuple[str, ...]  # O id de cada desafio, como gravado no progresso
+    version: int  # Muda a cada novo registro do jogo
+
+
+def challenge_ids(challenges: Tuple[Mapping[str, Any], ...]) -> Tuple[str, ...]:
+    """Os ids dos desafios (a posição, para desafios sem "id")."""
+    return tuple(str(challenge.get("id", i)) for i, challenge in enumerate(challenges))
+
+
+class ChallengeStore:
+    """Registro, por processo, dos desafios de cada jogo."""
+
+    def __init__(self):
+        self._games: Dict[str, GameContent] = {}
+        self._ids: Dict[str, Dict[int, Tuple[str, ...]]] = {}  # Jogo -> versão -> ids
+        self._versions = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def register(self, game_key: str, challenges: List[Dict[str, Any]],
+                 audio_field: Optional[str] = None) -> GameContent:
+        """Registra (uma vez) os desafios de um jogo.
+
+        Chamadas seguintes com a mesma lista não fazem nada; uma lista
+        diferente (ex: conteúdo recarregado) substitui o registro.
+
+        Args:
+            game_key: A chave do jogo.
+            challenges: A lista de desafios do data_manager.
+            audio_field: O campo com o texto que o jogo fala (ou None).
+
+        Returns:
+            O conteúdo registrado.
+        """
+        game = self._games.get(game_key)
+        if game is not None and game.source is challenges and game.audio_field == audio_field:
+            return game
+        with self._lock:
+            game = self._games.get(game_key)
+            if game is None or game.source is not challenges or game.audio_field != audio_field:
+                frozen = freeze(challenges)
+                game = GameContent(frozen, audio_field, challenges,
+                                   challenge_ids(frozen), next(self._versions))
+                self._games[game_key] = game
+                history = self._ids.setdefault(game_key, {})
+                history[game.version] = game.ids
+                while len(history) > ID_HISTORY:
+                    del history[min(history)]
+        return game
+
+    def ids(self, game_key: str, version: int) -> Optional[Tuple[str, ...]]:
+        """Retorna os ids de uma versão recente do jogo (None se já esquecida)."""
+        return self._ids.get(game_key, {}).get(version)
+
+    def get(self, game_key: str) -> GameContent:
+        """Retorna o conteúdo de um jogo já registrado.
+
+        Raises:
+            KeyError: Se o jogo ainda não foi registrado.
+        """
+        return self._games[game_key]
+
+
+_store = ChallengeStore()
+
+
+def get_challenge_store() -> ChallengeStore:
+    """Retorna o armazenamento único do processo."""
+    return _store
@@ -0,0 +1,208 @@
+"""Módulo de configuração.
+
+Centraliza os parâmetros ajustáveis da aplicação (caminhos, limites de
+cache, etc.). Todos os valores podem ser sobrescritos por variáveis de
+ambiente com o prefixo `ALFABETIZACAO_`, o que permite ajustar o app
+para cada sala de aula sem editar código.
+"""
+
+import os
+from pathlib import Path
+from typing import Optional, Tuple
+
+# Raiz do projeto (a pasta que contém `core/` e `pages/`)
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+ENV_PREFIX = "ALFABETIZACAO_"
+
+
+def _env_str(name: str, default: str) -> str:
+    """Lê uma variável de ambiente de texto (com o prefixo do app)."""
+    return os.environ.get(ENV_PREFIX + name, default)
+
+
+def _env_int(name: str, default: int) -> int:
+    """Lê uma variável de ambiente inteira, caindo no padrão se inválida."""
+    try:
+        return int(os.environ.get(ENV_PREFIX + name, default))
+    except ValueError:
+        return default
+
+
+def _env_float(name: str, default: float) -> float:
+    """Lê uma variável de ambiente decimal, caindo no padrão se inválida."""
+    try:
+        return float(os.environ.get(ENV_PREFIX + name, default))
+    except ValueError:
+        return default
+
+
+def _env_optional_int(name: str) -> Optional[int]:
+    """Lê uma variável de ambiente inteira opcional (None se vazia ou inválida)."""
+    try:
+        return int(os.environ[ENV_PREFIX + name])
+    except (KeyError, ValueError):
+        return None
+
+
+def _env_int_tuple(name: str, default: Tuple[int, ...]) -> Tuple[int, ...]:
+    """Lê uma lista de inteiros positivos separados por vírgula.
+
+    Cai no padrão se a lista estiver vazia ou tiver algum valor inválido
+    (ex: "2,x" ou "0,4").
+    """
+    raw = os.environ.get(ENV_PREFIX + name)
+    if raw is None:
+        return default
+    try:
+        values = tuple(int(n) for n in raw.split(",") if n.strip())
+    except ValueError:
+        return default
+    if not values or min(values) < 1:
+        return default
+    return values
+
+
+def _env_path(name: str, default: Path) -> Path:
+    """Lê um caminho; caminhos relativos são resolvidos a partir da raiz."""
+    path = Path(os.environ.get(ENV_PREFIX + name, default))
+    return path if path.is_absolute() else PROJECT_ROOT / path
+
+
+# Pasta dos arquivos de conteúdo (core/catalog.py)
+CONTENT_DIR = _env_path("CONTENT_DIR", Path("data/content"))
+
+# Lista de palavras de onde saem os desafios do Complete a Palavra (core/lexicon.py)
+LEXICON_FILE = _env_path("LEXICON_FILE", Path("data/lexicon.txt"))
+
+# ---
+# Cache de áudio (core/audio_cache.py)
+# ---
+# Camada em memória: orçamento em bytes para os MP3s mais usados
+AUDIO_MEMORY_CACHE_BYTES = _env_int("AUDIO_MEMORY_CACHE_BYTES", 32 * 1024 * 1024)
+
+# Camada em disco: pasta e tamanho máximo antes de remover os mais antigos
+AUDIO_DISK_CACHE_DIR = _env_path("AUDIO_DISK_CACHE_DIR", Path(".cache/audio"))
+AUDIO_DISK_CACHE_BYTES = _env_int("AUDIO_DISK_CACHE_BYTES", 256 * 1024 * 1024)
+
+# Pacote de áudio pré-gerado no deploy (core/audio_pack.py)
+AUDIO_PACK_DIR = _env_path("AUDIO_PACK_DIR", Path("assets/audio_pack"))
+AUDIO_PACK_WORKERS = _env_int("AUDIO_PACK_WORKERS", 4)
+
+# ---
+# Imagens (core/image_utils.py)
+# ---
+# Pasta das versões redimensionadas; fica dentro de `static/`, servida pelo
+# Streamlit em /app/static/ (ver .streamlit/config.toml)
+IMAGE_DERIVED_DIR = _env_path("IMAGE_DERIVED_DIR", Path("static/images"))
+IMAGE_STATIC_URL = _env_str("IMAGE_STATIC_URL", "/app/static/images")
+
+# Largura (px) em que as páginas mostram as imagens e as densidades geradas
+IMAGE_DISPLAY_WIDTH = _env_int("IMAGE_DISPLAY_WIDTH", 300)
+IMAGE_DENSITIES = (1, 2)
+
+# Se True, as páginas recebem a URL estática da versão WebP em alta
+# densidade (baixada sem passar pelo Python); se False, recebem o caminho
+# do JPEG no tamanho exato, que o Streamlit envia sem recomprimir.
+IMAGE_USE_STATIC_URLS = _env_str("IMAGE_USE_STATIC_URLS", "1") == "1"
+
+# ---
+# Registro de mídia por conteúdo (core/media_registry.py)
+# ---
+# "1": os áudios (e as imagens sem versões geradas) são publicados uma vez
+# em arquivos com o hash do conteúdo no nome, servidos em /app/static/
+MEDIA_STATIC = _env_str("MEDIA_STATIC", "1") == "1"
+# A pasta precisa ficar dentro de `static/` para o Streamlit servi-la
+MEDIA_DIR = _env_path("MEDIA_DIR", Path("static/media"))
+MEDIA_STATIC_URL = _env_str("MEDIA_STATIC_URL", "/app/static/media")
+# Tamanho da pasta a partir do qual os arquivos sem sessões ativas são apagados
+MEDIA_MAX_BYTES = _env_int("MEDIA_MAX_BYTES", 256 * 1024 * 1024)
+
+# Pasta padrão da versão offline do app, em HTML/JS (core/offline_export.py)
+OFFLINE_EXPORT_DIR = _env_path("OFFLINE_EXPORT_DIR", Path("dist/offline"))
+
+# Semente dos sorteios de desafios (vazio = aleatória). Com uma semente
+# fixa, a sequência de desafios é sempre a mesma (útil em testes)
+CHALLENGE_SEED = _env_optional_int("CHALLENGE_SEED")
+
+# Como os desafios são escolhidos (core/game_logic.py):
+# - "spaced": repetição espaçada, revendo mais o que a criança errou
+#   (core/scheduler.py)
+# - "deck": baralho embaralhado, sem olhar o histórico (core/sampler.py)
+CHALLENGE_SELECTION = _env_str("CHALLENGE_SELECTION", "spaced")
+
+# Intervalos, em rodadas, das caixas da repetição espaçada
+LEITNER_INTERVALS = _env_int_tuple("LEITNER_INTERVALS", (2, 4, 8, 16, 32))
+
+# Quantos prováveis próximos desafios têm o áudio pré-carregado
+PREFETCH_LOOKAHEAD = _env_int("PREFETCH_LOOKAHEAD", 2)
+
+# ---
+# Aquecimento do processo (core/warmup.py)
+# ---
+# "1": a primeira abertura da página inicial aquece o processo em segundo
+# plano (importações, conteúdo, imagens e os áudios mais usados)
+WARMUP = _env_str("WARMUP", "1") == "1"
+
+# Quantos áudios (os mais tocados primeiro) o aquecimento carrega na memória
+WARMUP_AUDIO_LIMIT = _env_int("WARMUP_AUDIO_LIMIT", 300)
+
+# ---
+# Registro de progresso (core/progress_store.py)
+# ---
+# Banco SQLite das respostas das crianças (vazio desativa o registro)
+_progress_db = _env_str("PROGRESS_DB", "data/progress.sqlite3")
+PROGRESS_DB = _env_path("PROGRESS_DB", Path(_progress_db)) if _progress_db else None
+
+# As respostas são gravadas em lotes de até PROGRESS_BATCH_SIZE, juntadas
+# por no máximo PROGRESS_FLUSH_INTERVAL segundos
+PROGRESS_BATCH_SIZE = _env_int("PROGRESS_BATCH_SIZE", 200)
+PROGRESS_FLUSH_INTERVAL = _env_float("PROGRESS_FLUSH_INTERVAL", 0.5)
+
+# ---
+# Medição de tempo (core/metrics.py)
+# ---
+# "1" mede os spans; desativado, a medição não custa quase nada
+METRICS_ENABLED = _env_str("METRICS", "0") == "1"
+
+# Arquivo exportado: `.prom` (texto do Prometheus) ou `.jsonl`, gravado
+# a cada METRICS_EXPORT_INTERVAL segundos e ao encerrar o servidor
+METRICS_FILE = _env_path("METRICS_FILE", Path(".cache/metrics.prom"))
+METRICS_EXPORT_INTERVAL = _env_float("METRICS_EXPORT_INTERVAL", 10.0)
+
+# "1" mostra os tempos de cada execução na barra lateral das páginas
+METRICS_PANEL = _env_str("METRICS_PANEL", "0") == "1"
+
+# Idioma e "voz" padrão do TTS. No gTTS a "voz" é o domínio regional
+# (`tld`, ex: "com.br"); vazio significa o padrão da biblioteca.
+TTS_LANG = _env_str("TTS_LANG", "pt-br")
+TTS_VOICE = _env_str("TTS_VOICE", "")
+
+# Motores de TTS em ordem de preferência, cada um com um orçamento de
+# latência opcional em segundos (ver core/tts_backends.py).
+# Ex: "gtts:4,espeak:2" usa o Google e cai no espeak se passar de 4s.
+TTS_BACKENDS = _env_str("TTS_BACKENDS", "gtts:10")
+
+# Comando do motor local ("espeak"); deve escrever o áudio na saída padrão
+TTS_COMMAND = _env_str("TTS_COMMAND", "espeak-ng -v {lang} -s {speed} --stdout {text}")
+
+# Voz do motor local, passada no campo `{lang}` (ex: "pt-br+f3"); vazio
+# usa o idioma. Não é a TTS_VOICE, que é o sotaque do gTTS
+TTS_COMMAND_VOICE = _env_str("TTS_COMMAND_VOICE", "")
+
+# Disjuntor de cada motor: depois de N falhas seguidas o motor não é
+# chamado por alguns segundos, tempo que dobra a cada nova falha (até o máximo)
+TTS_BREAKER_FAILURES = _env_int("TTS_BREAKER_FAILURES", 3)
+TTS_BREAKER_BACKOFF = _env_float("TTS_BREAKER_BACKOFF", 5.0)
+TTS_BREAKER_MAX_BACKOFF = _env_float("TTS_BREAKER_MAX_BACKOFF", 300.0)
+
+# Por quantos segundos um texto cujo áudio falhou (ou o sprite das sílabas)
+# responde "indisponível" na hora, sem tentar sintetizar de novo a cada
+# execução da página
+TTS_FAILURE_TTL = _env_float("TTS_FAILURE_TTL", 30.0)
+
+# Frases longas são faladas em trechos de até N palavras, sintetizados em
+# paralelo e juntados em um só MP3; cada trecho fica no cache e é
+# reaproveitado por outras frases (0 desativa)
+TTS_SEGMENT_WORDS = _env_int("TTS_SEGMENT_WORDS", 4)
+TTS_SEGMENT_WORKERS = _env_int("TTS_SEGMENT_WORKERS", 4)
@@ -7,27 +7,86 @@ jogo que precise:
 1.  Inicializar um estado.
 2.  Sortear um novo desafio.
 3.  Verificar uma resposta do usuário.
+
+Os desafios ficam uma única vez na memória do processo, imutáveis
+(ver `core.challenge_store`); o st.session_state de cada criança guarda
+só a posição do desafio atual, o status e o estado do sorteio.
+
+Por padrão os desafios são escolhidos por repetição espaçada (ver
+`core.scheduler`): cada resposta verificada atualiza quando aquele
+desafio deve voltar. Cada resposta também é registrada no progresso da
+criança (ver `core.progress_store`), sem esperar a gravação em disco;
+é de lá que a repetição espaçada recupera o histórico em uma nova sessão.
+
+As ações da criança (responder, montar a frase, ir para o próximo
+desafio) são callbacks (`on_click`/`on_submit`) que avançam a máquina
+de estados de cada jogo:
+
+    "new" -> "playing" -> "correct" | "wrong"
+    "wrong" -> "correct" | "wrong" (nova tentativa) ou "playing" (limpar/desfazer)
+    "correct" -> "playing" (próximo desafio)
+
+O Streamlit roda o callback antes do script, então cada ação custa uma
+única execução, que já mostra o novo estado.
+
+Ao sortear um desafio, o áudio que ele vai tocar (e o de um ou dois
+prováveis próximos desafios) é pré-carregado em segundo plano, para
+que o som da comemoração já esteja pronto quando a criança acertar.
 """
 
 import streamlit as st
 import random
-from typing import List, Dict, Any
-
-def initialize_game_state(game_key: str, challenges: List[Dict[str, Any]]):
+import sqlite3
+import time
+import uuid
+from typing import List, Dict, Any, Mapping, Optional, Tuple
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+from core import config
+from core.answer_matching import MatchResult, match_answer, prepared_answers
+from core.audio_utils import prefetch_audio
+from core.challenge_store import GameContent, get_challenge_store
+from core.metrics import timed
+from core.progress_store import get_progress_store
+from core.sampler import ShuffledDeck
+from core.scheduler import LeitnerScheduler
+
+# Prefixo do id das sessões sem o parâmetro `?aluno=` na URL
+ANONYMOUS_PREFIX = "anonimo-"
+
+def initialize_game_state(game_key: str, challenges: List[Dict[str, Any]],
+                          audio_field: Optional[str] = None,
+                          seed: Optional[int] = None):
     """Inicializa o estado da sessão para um jogo específico.
 
-    Verifica se as chaves necessárias para um jogo (desafio, status, dados)
-    já existem no st.session_state. Se não, cria-as com valores padrão.
+    Registra os desafios no armazenamento compartilhado do processo (só
+    na primeira vez) e verifica se as chaves necessárias para um jogo
+    (desafio atual, status, sorteio) já existem no st.session_state.
+    Se não, cria-as com valores padrão.
 
     Args:
         game_key: Uma string única que identifica o jogo (ex: "complete_word").
         challenges: A lista completa de desafios (dicionários) para este jogo,
                     geralmente vinda do data_manager.
+        audio_field: O campo do desafio com o texto que o jogo vai falar
+                     (ex: "full_word"), usado para pré-carregar o áudio.
+                     None desativa o pré-carregamento.
+        seed: A semente do sorteio, para sequências reproduzíveis
+              (padrão: `config.CHALLENGE_SEED`; None = aleatória).
     """
+    if seed is None:
+        seed = config.CHALLENGE_SEED
+
+    # O conteúdo é do processo, não da sessão
+    get_challenge_store().register(game_key, challenges, audio_field)
+
     state_keys = {
-        "challenge": None,  # O desafio atual (ex: um dict de "casa")
+        "challenge_index": None,  # A posição do desafio atual na lista
         "status": "new",    # Status: "new", "playing", "correct", "wrong"
-        "data": challenges  # A lista completa de todos os desafios
+        "rng": random.Random(seed),  # Gerador dos sorteios deste jogo
+        "selector": None,  # Quem escolhe os desafios (criado no 1º sorteio)
+        "selector_version": None,  # A versão do conteúdo para a qual o seletor foi criado
+        "started_at": None  # Quando o desafio atual foi sorteado (monotonic)
     }
 
     for key, default_value in state_keys.items():
@@ -35,37 +94,178 @@ def initialize_game_state(game_key: str, challenges: List[Dict[str, Any]]):
         if session_key not in st.session_state:
             st.session_state[session_key] = default_value
 
+
+def get_learner_id() -> str:
+    """Retorna a identificação da criança desta sessão.
+
+    Vem do parâmetro `?aluno=` da URL (ex: um link por criança preparado
+    pelo professor); sem ele, a sessão recebe um id anônimo.
+    """
+    if "learner_id" not in st.session_state:
+        learner = st.query_params.get("aluno", "").strip()
+        st.session_state["learner_id"] = learner or f"{ANONYMOUS_PREFIX}{uuid.uuid4().hex[:12]}"
+    return st.session_state["learner_id"]
+
+
+def get_current_challenge(game_key: str) -> Optional[Mapping[str, Any]]:
+    """Retorna o desafio atual do jogo (somente leitura).
+
+    Args:
+        game_key: A chave do jogo.
+
+    Returns:
+        O desafio atual, ou None se nenhum desafio foi sorteado ainda.
+    """
+    index = st.session_state.get(f"{game_key}_challenge_index")
+    if index is None:
+        return None
+    challenges = get_challenge_store().get(game_key).challenges
+    return challenges[index] if index < len(challenges) else None
+
+
+@timed("challenge.new")
 def get_new_challenge(game_key: str):
     """Sorteia um novo desafio e atualiza o estado da sessão.
 
-    Seleciona aleatoriamente um desafio da lista de dados do jogo
-    e o define como o desafio atual. O status do jogo é
-    resetado para "playing".
+    O desafio é escolhido conforme `config.CHALLENGE_SELECTION`: pela
+    repetição espaçada (ver `core.scheduler`), que traz de volta antes
+    o que a criança errou, ou pelo "baralho" embaralhado (ver
+    `core.sampler`). Nos dois casos o mesmo desafio nunca sai duas
+    vezes seguidas. O status do jogo é resetado para "playing".
 
     Args:
         game_key: A chave do jogo para o qual sortear um desafio.
     """
-    challenge_list = st.session_state[f"{game_key}_data"]
-
-    # Tenta não repetir o desafio anterior
-    current_challenge = st.session_state[f"{game_key}_challenge"]
-    new_challenge = random.choice(challenge_list)
+    content = get_challenge_store().get(game_key)
+    challenge_list = content.challenges
 
-    # Se a lista tiver mais de um item e o sorteado for igual ao atual
-    if len(challenge_list) > 1 and new_challenge == current_challenge:
-        while new_challenge == current_challenge:
-            new_challenge = random.choice(challenge_list)
+    index = _get_selector(game_key, content).draw()
+    new_challenge = challenge_list[index]
 
-    st.session_state[f"{game_key}_challenge"] = new_challenge
+    st.session_state[f"{game_key}_challenge_index"] = index
     st.session_state[f"{game_key}_status"] = "playing"
+    st.session_state[f"{game_key}_started_at"] = time.monotonic()
+    st.session_state.pop(f"{game_key}_match", None)
+    st.session_state.pop(answer_input_key(game_key), None)  # Campo de resposta vazio
+
+    prefetch_challenge_audio(game_key, new_challenge)
+
+
+def _get_selector(game_key: str, content: GameContent):
+    """Retorna o seletor de desafios da sessão, criando-o se preciso.
+
+    Um por sessão, guardando só índices. Ao ser criado, refaz as respostas
+    já gravadas da criança nesse jogo (ver `core.progress_store`), então a
+    repetição espaçada continua de onde parou depois de recarregar a
+    página ou em outro dia. Se os desafios mudarem (ex: conteúdo novo no
+    catálogo), o histórico vai para as novas posições pelo id de cada
+    desafio, em vez de ser perdido.
+    """
+    selector = st.session_state[f"{game_key}_selector"]
+    version = st.session_state.get(f"{game_key}_selector_version")
+    if selector is not None and version == content.version:
+        return selector
+
+    previous_ids = (get_challenge_store().ids(game_key, version)
+                    if selector is not None and version is not None else None)
+    if previous_ids is None:
+        rng = st.session_state[f"{game_key}_rng"]
+        size = len(content.challenges)
+        if config.CHALLENGE_SELECTION == "deck":
+            selector = ShuffledDeck(size, rng)
+        else:
+            selector = LeitnerScheduler(size, rng, config.LEITNER_INTERVALS)
+        selector.replay(_stored_history(game_key, content.ids))
+    elif previous_ids != content.ids:
+        position = {challenge_id: i for i, challenge_id in enumerate(content.ids)}
+        selector = selector.remapped(len(content.ids), [position.get(challenge_id)
+                                                        for challenge_id in previous_ids])
+    st.session_state[f"{game_key}_selector"] = selector
+    st.session_state[f"{game_key}_selector_version"] = content.version
+    return selector
+
+
+def _stored_history(game_key: str, ids: Tuple[str, ...]) -> List[Tuple[int, bool]]:
+    """Lê as respostas gravadas da criança em um jogo, como (índice, acertou).
+
+    Só lê o que já está no banco, sem esperar a fila de gravação.
+    Respostas a desafios que não existem mais são ignoradas; sem registro
+    de progresso (ou se o banco falhar), o histórico fica vazio.
+    """
+    store = get_progress_store()
+    if store is None:
+        return []
+    learner = get_learner_id()
+    if learner.startswith(ANONYMOUS_PREFIX):
+        return []  # Um id anônimo é novo a cada sessão: não tem histórico
+    try:
+        rows = store.attempts(learner=learner, game_key=game_key)
+    except sqlite3.Error:
+        return []
+    position = {challenge_id: i for i, challenge_id in enumerate(ids)}
+    return [(position[row["challenge_id"]], bool(row["correct"]))
+            for row in rows if row["challenge_id"] in position]
+
+
+def _record_result(game_key: str, answer: str, is_correct: bool):
+    """Atualiza o status e registra o resultado do desafio atual.
+
+    O resultado vai para o seletor (repetição espaçada) e para a fila
+    do registro de progresso, que grava em segundo plano.
+    """
+    st.session_state[f"{game_key}_status"] = "correct" if is_correct else "wrong"
+    index = st.session_state.get(f"{game_key}_challenge_index")
+    if index is None:
+        return
+
+    selector = st.session_state.get(f"{game_key}_selector")
+    if selector is not None:
+        selector.record(index, is_correct)
+
+    store = get_progress_store()
+    if store is not None:
+        challenge = get_current_challenge(game_key)
+        started_at = st.session_state.get(f"{game_key}_started_at")
+        latency_ms = (round((time.monotonic() - started_at) * 1000)
+                      if started_at is not None else None)
+        store.record_attempt(get_learner_id(), game_key,
+                             str(challenge.get("id", index)), answer,
+                             is_correct, latency_ms)
+
+
+def prefetch_challenge_audio(game_key: str, challenge: Mapping[str, Any]):
+    """Pré-carrega o áudio do desafio atual e dos prováveis próximos.
+
+    Agenda em segundo plano a síntese do texto do desafio sorteado e
+    dos próximos `config.PREFETCH_LOOKAHEAD` desafios previstos pelo
+    seletor, para que o próximo sorteio também já encontre o áudio pronto.
+
+    Args:
+        game_key: A chave do jogo.
+        challenge: O desafio que acabou de ser sorteado.
+    """
+    content = get_challenge_store().get(game_key)
+    field = content.audio_field
+    if not field:
+        return
 
+    challenge_list = content.challenges
+    selector = st.session_state[f"{game_key}_selector"]
+    upcoming = [challenge_list[i] for i in selector.peek(config.PREFETCH_LOOKAHEAD)]
 
+    prefetch_audio(c[field] for c in [challenge] + upcoming)
+
+
+@timed("answer.check")
 def check_user_answer(game_key: str, user_answer: str) -> bool:
     """Verifica a resposta do usuário contra a resposta correta.
 
     Compara a resposta fornecida pelo usuário (user_answer) com a
-    resposta ("correct") armazenada no desafio atual no estado da sessão.
-    Atualiza o status do jogo para "correct" ou "wrong".
+    resposta ("correct") do desafio atual, sem exigir acentos,
+    maiúsculas ou pontuação (ver `core.answer_matching`). Atualiza o
+    status do jogo para "correct" ou "wrong", guarda o diagnóstico da
+    comparação (ver `get_last_match`) e informa o resultado à repetição
+    espaçada.
 
     Args:
         game_key: A chave do jogo que está sendo verificado.
@@ -74,42 +274,111 @@ def check_user_answer(game_key: str, user_answer: str) -> bool:
     Returns:
         True se a resposta estiver correta, False caso contrário.
     """
-    correct_answer = st.session_state[f"{game_key}_challenge"]["correct"]
+    index = st.session_state[f"{game_key}_challenge_index"]
+    result = match_answer(prepared_answers(game_key)[index], user_answer)
+    st.session_state[f"{game_key}_match"] = result
+
+    _record_result(game_key, user_answer, result.correct)
+    return result.correct
+
+
+def get_last_match(game_key: str) -> Optional[MatchResult]:
+    """Retorna a comparação da última resposta verificada no desafio atual.
+
+    Args:
+        game_key: A chave do jogo.
+
+    Returns:
+        O `MatchResult` (com os erros palavra a palavra), ou None se a
+        resposta do desafio atual ainda não foi verificada.
+    """
+    return st.session_state.get(f"{game_key}_match")
+
+
+# --- Callbacks das ações da criança ---
+
+def answer_input_key(game_key: str) -> str:
+    """A chave do campo de resposta escrita (`st.text_input`) do jogo."""
+    return f"{game_key}_answer"
+
 
-    # Comparação case-insensitive e sem espaços extras
-    is_correct = user_answer.strip().lower() == correct_answer.strip().lower()
+def submit_typed_answer(game_key: str):
+    """Callback do envio do formulário: verifica o que está no campo de resposta.
+
+    Args:
+        game_key: A chave do jogo. O campo deve usar `key=answer_input_key(game_key)`.
+    """
+    check_user_answer(game_key, st.session_state.get(answer_input_key(game_key), ""))
 
-    if is_correct:
-        st.session_state[f"{game_key}_status"] = "correct"
-        return True
-    else:
-        st.session_state[f"{game_key}_status"] = "wrong"
-        return False
 
+def next_challenge(game_key: str):
+    """Callback do botão "Próxima": sorteia o próximo desafio.
 
-def initialize_scramble_game(game_key: str, challenges: List[Dict[str, Any]]):
+    Args:
+        game_key: A chave do jogo.
+    """
+    get_new_challenge(game_key)
+    _redraw_page()
+
+
+def next_scramble_challenge(game_key: str):
+    """Callback do botão "Próxima" do jogo de organizar frases."""
+    setup_scramble_challenge(game_key)
+    _redraw_page()
+
+
+def _redraw_page():
+    """Garante que a página inteira rode depois de trocar de desafio.
+
+    Um clique dentro de um fragmento (`st.fragment`) roda só o
+    fragmento, mas o novo desafio muda também o título e a imagem: o
+    `st.rerun` dentro do callback troca essa execução por uma da página
+    inteira, antes de o script começar. Fora de um fragmento, a execução
+    já é da página inteira.
+    """
+    ctx = get_script_run_ctx()
+    if ctx is not None and ctx.fragment_ids_this_run:
+        st.rerun(scope="app")
+
+
+def initialize_scramble_game(game_key: str, challenges: List[Dict[str, Any]],
+                             audio_field: Optional[str] = None,
+                             seed: Optional[int] = None):
     """Inicializa o estado da sessão para o jogo de organizar frases.
 
-    Reutiliza a inicialização padrão e adiciona chaves de estado
-    específicas para este jogo (tentativa do usuário e palavras restantes).
+    Reutiliza a inicialização padrão e adiciona as chaves de estado da
+    tentativa. As palavras do desafio (`challenge["words"]`) não são
+    copiadas para a sessão: o estado guarda só posições nessa lista
+    (as "fichas"), então palavras repetidas ("o gato e o rato") são
+    fichas diferentes:
+    - `_order`: as fichas na ordem embaralhada dos botões;
+    - `_attempt`: as fichas na ordem em que foram clicadas (é também a
+      pilha do "Desfazer");
+    - `_placed`: um mapa de bits (bit i = ficha i já foi usada).
 
     Args:
         game_key: A chave única do jogo (ex: "scramble_sentence").
         challenges: A lista de desafios do data_manager.
+        audio_field: O campo do desafio com o texto a ser falado
+                     (ver `initialize_game_state`).
+        seed: A semente do sorteio (ver `initialize_game_state`).
     """
     # 1. Roda a inicialização padrão
-    initialize_game_state(game_key, challenges)
+    initialize_game_state(game_key, challenges, audio_field, seed)
 
     # 2. Adiciona chaves de estado específicas deste jogo
-    if f"{game_key}_user_attempt" not in st.session_state:
-        st.session_state[f"{game_key}_user_attempt"] = []  # Palavras clicadas
-    if f"{game_key}_remaining_words" not in st.session_state:
-        st.session_state[f"{game_key}_remaining_words"] = [] # Palavras-botão
-
+    if f"{game_key}_order" not in st.session_state:
+        st.session_state[f"{game_key}_order"] = []  # Fichas dos botões
+    if f"{game_key}_attempt" not in st.session_state:
+        st.session_state[f"{game_key}_attempt"] = []  # Fichas clicadas
+    if f"{game_key}_placed" not in st.session_state:
+        st.session_state[f"{game_key}_placed"] = 0  # Mapa de bits das clicadas
+
+@timed("challenge.setup_scramble")
 def setup_scramble_challenge(game_key: str):
     """Configura um novo desafio de organizar frases.
 
-    Esta função pega um novo desafio, embaralha as palavras-botão
+    Esta função pega um novo desafio, embaralha a ordem dos botões
     e reseta o estado da tentativa do usuário.
 
     Args:
@@ -118,50 +387,72 @@ def setup_scramble_challenge(game_key: str):
     # 1. Pega um novo desafio usando a lógica padrão
     get_new_challenge(game_key)
 
-    # 2. Configura as palavras
-    challenge = st.session_state[f"{game_key}_challenge"]
+    # 2. Embaralha as fichas (a ordem dos botões vale até o próximo desafio)
+    challenge = get_current_challenge(game_key)
     if challenge:
-        # Copia a lista de palavras e a embaralha
-        words_to_scramble = list(challenge["words"])
-        random.shuffle(words_to_scramble)
+        order = list(range(len(challenge["words"])))
+        st.session_state[f"{game_key}_rng"].shuffle(order)
 
         # 3. Reseta o estado do jogo para este novo desafio
-        st.session_state[f"{game_key}_user_attempt"] = []
-        st.session_state[f"{game_key}_remaining_words"] = words_to_scramble
+        st.session_state[f"{game_key}_order"] = order
+        st.session_state[f"{game_key}_attempt"] = []
+        st.session_state[f"{game_key}_placed"] = 0
         st.session_state[f"{game_key}_status"] = "playing"
 
-def add_word_to_scramble_attempt(game_key: str, word: str):
-    """Adiciona uma palavra clicada à tentativa do usuário.
+def get_scramble_attempt(game_key: str) -> List[str]:
+    """Retorna as palavras já clicadas, na ordem em que foram clicadas."""
+    words = get_current_challenge(game_key)["words"]
+    return [words[token] for token in st.session_state[f"{game_key}_attempt"]]
+
+def get_scramble_buttons(game_key: str) -> List[Tuple[int, str]]:
+    """Retorna as fichas ainda não usadas (ficha, palavra), na ordem dos botões."""
+    words = get_current_challenge(game_key)["words"]
+    placed = st.session_state[f"{game_key}_placed"]
+    return [(token, words[token]) for token in st.session_state[f"{game_key}_order"]
+            if not placed >> token & 1]
 
-    Move a palavra da lista 'remaining_words' para a lista 'user_attempt'.
+def add_word_to_scramble_attempt(game_key: str, token: int):
+    """Adiciona uma palavra clicada à tentativa do usuário (O(1)).
 
     Args:
         game_key: A chave do jogo.
-        word: A palavra que foi clicada.
+        token: A posição da palavra em `challenge["words"]`.
     """
-    if word in st.session_state[f"{game_key}_remaining_words"]:
-        st.session_state[f"{game_key}_user_attempt"].append(word)
-        st.session_state[f"{game_key}_remaining_words"].remove(word)
+    bit = 1 << token
+    placed = st.session_state[f"{game_key}_placed"]
+    if not placed & bit:
+        st.session_state[f"{game_key}_attempt"].append(token)
+        st.session_state[f"{game_key}_placed"] = placed | bit
         st.session_state[f"{game_key}_status"] = "playing"
 
-def clear_scramble_attempt(game_key: str):
-    """Limpa a tentativa do usuário e restaura os botões.
+def undo_scramble_move(game_key: str):
+    """Devolve aos botões a última palavra clicada (O(1)).
 
-    Chamado quando o usuário clica em 'Limpar'.
+    Chamado quando o usuário clica em 'Desfazer'.
     """
-    challenge = st.session_state[f"{game_key}_challenge"]
-    if challenge:
-        words_to_scramble = list(challenge["words"])
-        random.shuffle(words_to_scramble)
-        st.session_state[f"{game_key}_user_attempt"] = []
-        st.session_state[f"{game_key}_remaining_words"] = words_to_scramble
+    attempt = st.session_state[f"{game_key}_attempt"]
+    if attempt:
+        token = attempt.pop()
+        st.session_state[f"{game_key}_placed"] &= ~(1 << token)
         st.session_state[f"{game_key}_status"] = "playing"
 
+def clear_scramble_attempt(game_key: str):
+    """Limpa a tentativa do usuário e devolve todas as palavras aos botões.
+
+    Chamado quando o usuário clica em 'Limpar' ou 'Tentar Novamente'.
+    Os botões voltam na mesma ordem.
+    """
+    st.session_state[f"{game_key}_attempt"] = []
+    st.session_state[f"{game_key}_placed"] = 0
+    st.session_state[f"{game_key}_status"] = "playing"
+
+@timed("answer.check")
 def check_scramble_answer(game_key: str) -> bool:
     """Verifica a frase montada pelo usuário.
 
-    Junta as palavras da 'user_attempt' e compara com a
-    resposta correta. Atualiza o status do jogo.
+    Junta as palavras clicadas (ver `get_scramble_attempt`) e compara com a
+    resposta correta. Atualiza o status do jogo e informa o resultado
+    à repetição espaçada.
 
     Args:
         game_key: A chave do jogo.
@@ -169,18 +460,13 @@ def check_scramble_answer(game_key: str) -> bool:
     Returns:
         True se a resposta estiver correta, False caso contrário.
     """
-    attempt_list = st.session_state[f"{game_key}_user_attempt"]
-    user_sentence = " ".join(attempt_list)
+    user_sentence = " ".join(get_scramble_attempt(game_key))
 
-    challenge = st.session_state[f"{game_key}_challenge"]
+    challenge = get_current_challenge(game_key)
     correct_sentence = challenge["correct"]
 
     # Comparação exata, case-sensitive
     is_correct = (user_sentence.strip() == correct_sentence.strip())
 
-    if is_correct:
-        st.session_state[f"{game_key}_status"] = "correct"
-        return True
-    else:
-        st.session_state[f"{game_key}_status"] = "wrong"
-        return False
+    _record_result(game_key, user_sentence, is_correct)
+    return is_correct
@@ -0,0 +1,271 @@
+"""Módulo de utilidades para imagens.
+
+As fotos em `assets/images` estão em resolução cheia (algumas com
+milhares de pixels), mas as páginas as mostram com 300px de largura.
+Este módulo tem duas partes:
+
+1.  Uma etapa de build (`build_image_derivatives`) que gera, para cada
+    imagem, versões redimensionadas e recomprimidas (1x e 2x a largura
+    de exibição, em JPEG progressivo e WebP) e um `manifest.json`.
+2.  Um resolvedor (`resolve_image`) usado por todas as páginas, que
+    troca o caminho original pela melhor versão gerada.
+
+Uso:
+    python -m core.image_utils        # gera/atualiza as versões
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from core import config
+from core.media_registry import media_file_url
+from core.metrics import timed
+
+IMAGE_MANIFEST_FORMAT = 1
+IMAGE_MANIFEST = "manifest.json"
+SOURCE_DIR = config.PROJECT_ROOT / "assets" / "images"
+IMAGE_SUFFIXES = (".jpg", ".jpeg", ".png", ".webp")
+
+_manifest: Optional[Dict[str, dict]] = None
+_manifest_lock = threading.Lock()
+
+
+def _load_manifest() -> Dict[str, dict]:
+    """Lê o manifesto das versões geradas (uma vez por processo)."""
+    global _manifest
+    if _manifest is None:
+        with _manifest_lock:
+            if _manifest is None:
+                images = {}
+                try:
+                    manifest = json.loads(
+                        (config.IMAGE_DERIVED_DIR / IMAGE_MANIFEST).read_text("utf-8")
+                    )
+                    if manifest.get("format") == IMAGE_MANIFEST_FORMAT:
+                        images = manifest.get("images", {})
+                except (OSError, ValueError):
+                    pass
+                _manifest = images
+    return _manifest
+
+
+def preload_image_manifest() -> int:
+    """Lê o manifesto agora (ex: no aquecimento) e retorna quantas imagens ele tem."""
+    return len(_load_manifest())
+
+
+@timed("image.resolve")
+def resolve_image(path: Optional[str],
+                  width: Optional[int] = None) -> Optional[str]:
+    """Escolhe a versão de uma imagem a ser enviada ao navegador.
+
+    Args:
+        path: O caminho original (ex: "assets/images/casa.jpg").
+        width: A largura de exibição em px (padrão: `config.IMAGE_DISPLAY_WIDTH`).
+
+    Returns:
+        A URL estática da versão WebP (ou o caminho do JPEG no tamanho
+        de exibição); se as versões ainda não foram geradas, a URL do
+        original no registro de mídia (ver `core.media_registry`); ou
+        None se a imagem não existir.
+    """
+    if not path:
+        return None
+    width = width or config.IMAGE_DISPLAY_WIDTH
+
+    entry = _load_manifest().get(path)
+    if entry is not None:
+        variants = entry["variants"]
+        if config.IMAGE_USE_STATIC_URLS:
+            # A menor versão que cubra a tela com a maior densidade gerada
+            target = width * max(config.IMAGE_DENSITIES)
+            chosen = min((v for v in variants if v["width"] >= target),
+                         key=lambda v: v["width"], default=variants[-1])
+            return f"{config.IMAGE_STATIC_URL}/{chosen['webp']}"
+        # Sem URLs estáticas, o Streamlit relê e valida o arquivo: um JPEG
+        # que não seja mais largo que a exibição é enviado sem recompressão
+        fitting = [v for v in variants if v["width"] <= width] or variants[:1]
+        return str(config.IMAGE_DERIVED_DIR / fitting[-1]["jpeg"])
+
+    if not os.path.exists(path):
+        return None
+    # Sem versões geradas, o original é publicado por conteúdo (URL estável)
+    return media_file_url(path)
+
+
+def image_file(path: Optional[str], width: Optional[int] = None) -> Optional[Path]:
+    """Escolhe o arquivo de uma imagem a ser copiado (ex: para a versão offline).
+
+    É a mesma escolha do `resolve_image` com URLs estáticas (a menor
+    versão que cubra a maior densidade), mas em JPEG, que qualquer
+    navegador abre, mesmo os de tablets antigos.
+
+    Args:
+        path: O caminho original (ex: "assets/images/casa.jpg").
+        width: A largura de exibição em px (padrão: `config.IMAGE_DISPLAY_WIDTH`).
+
+    Returns:
+        O arquivo da versão gerada; o original, se as versões ainda não
+        foram geradas; ou None se a imagem não existir.
+    """
+    if not path:
+        return None
+    width = width or config.IMAGE_DISPLAY_WIDTH
+
+    entry = _load_manifest().get(path)
+    if entry is not None:
+        variants = entry["variants"]
+        target = width * max(config.IMAGE_DENSITIES)
+        chosen = min((v for v in variants if v["width"] >= target),
+                     key=lambda v: v["width"], default=variants[-1])
+        derived = config.IMAGE_DERIVED_DIR / chosen["jpeg"]
+        if derived.is_file():
+            return derived
+
+    original = config.PROJECT_ROOT / path
+    return original if original.is_file() else None
+
+
+def _source_digest(path: Path) -> str:
+    return hashlib.sha256(path.read_bytes()).hexdigest()
+
+
+def build_image_derivatives(source_dir: Path = SOURCE_DIR,
+                            output_dir: Optional[Path] = None,
+                            display_width: Optional[int] = None,
+                            force: bool = False) -> Dict[str, int]:
+    """Gera as versões redimensionadas de todas as imagens.
+
+    Para cada densidade em `config.IMAGE_DENSITIES` é gerada uma versão
+    com `display_width * densidade` px de largura (sem ampliar imagens
+    menores que isso), em JPEG progressivo e em WebP. Imagens que não
+    mudaram desde o último build são puladas, e as versões que ficaram
+    fora do novo manifesto (ex: de uma imagem apagada ou renomeada, ou
+    de outra largura) são apagadas.
+
+    Args:
+        source_dir: A pasta das imagens originais.
+        output_dir: A pasta das versões (padrão: `config.IMAGE_DERIVED_DIR`).
+        display_width: A largura de exibição (padrão: `config.IMAGE_DISPLAY_WIDTH`).
+        force: Se True, gera tudo de novo.
+
+    Returns:
+        Um resumo com o total de imagens, quantas foram geradas, puladas,
+        quantos arquivos antigos foram apagados e os bytes originais e
+        gerados (para comparação).
+    """
+    # Importado aqui: o Pillow só é necessário no build, não nas páginas
+    from PIL import Image, ImageOps
+
+    output_dir = Path(output_dir or config.IMAGE_DERIVED_DIR)
+    display_width = display_width or config.IMAGE_DISPLAY_WIDTH
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    previous = {}
+    if not force:
+        try:
+            manifest = json.loads((output_dir / IMAGE_MANIFEST).read_text("utf-8"))
+            if manifest.get("format") == IMAGE_MANIFEST_FORMAT:
+                previous = manifest.get("images", {})
+        except (OSError, ValueError):
+            pass
+
+    images = {}
+    summary = {"total": 0, "built": 0, "skipped": 0, "removed": 0,
+               "source_bytes": 0, "derived_bytes": 0}
+
+    for source in sorted(source_dir.iterdir()):
+        if source.suffix.lower() not in IMAGE_SUFFIXES:
+            continue
+        key = source.relative_to(config.PROJECT_ROOT).as_posix()
+        digest = _source_digest(source)
+        summary["total"] += 1
+        summary["source_bytes"] += source.stat().st_size
+
+        old = previous.get(key)
+        if (old is not None and old["source_sha256"] == digest
+                and all((output_dir / v[fmt]).is_file()
+                        for v in old["variants"] for fmt in ("jpeg", "webp"))):
+            images[key] = old
+            summary["skipped"] += 1
+            summary["derived_bytes"] += sum(v["bytes"] for v in old["variants"])
+            continue
+
+        with Image.open(source) as original:
+            # Respeita a rotação da câmera (EXIF) e remove canal alfa
+            image = ImageOps.exif_transpose(original).convert("RGB")
+
+        variants: List[dict] = []
+        seen_widths = set()
+        for density in config.IMAGE_DENSITIES:
+            target = min(display_width * density, image.width)
+            if target in seen_widths:
+                continue
+            seen_widths.add(target)
+            height = round(image.height * target / image.width)
+            resized = image.resize((target, height), Image.LANCZOS)
+
+            stem = f"{source.stem}-{target}"
+            resized.save(output_dir / f"{stem}.jpg", "JPEG", quality=80,
+                         optimize=True, progressive=True)
+            resized.save(output_dir / f"{stem}.webp", "WEBP", quality=78, method=6)
+            variants.append({
+                "width": target,
+                "height": height,
+                "jpeg": f"{stem}.jpg",
+                "webp": f"{stem}.webp",
+                "bytes": (output_dir / f"{stem}.webp").stat().st_size,
+            })
+
+        images[key] = {"source_sha256": digest, "variants": variants}
+        summary["built"] += 1
+        summary["derived_bytes"] += sum(v["bytes"] for v in variants)
+
+    manifest = {"format": IMAGE_MANIFEST_FORMAT,
+                "display_width": display_width,
+                "images": images}
+    tmp_manifest = output_dir / f"{IMAGE_MANIFEST}.tmp"
+    tmp_manifest.write_text(json.dumps(manifest, indent=2), "utf-8")
+    os.replace(tmp_manifest, output_dir / IMAGE_MANIFEST)
+
+    # Versões que o novo manifesto não usa mais
+    used = {v[fmt] for image in images.values()
+            for v in image["variants"] for fmt in ("jpeg", "webp")}
+    for path in output_dir.iterdir():
+        if path.is_file() and path.suffix in (".jpg", ".webp") and path.name not in used:
+            path.unlink()
+            summary["removed"] += 1
+    return summary
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Ponto de entrada da linha de comando."""
+    parser = argparse.ArgumentParser(
+        description="Gera versões redimensionadas das imagens em assets/images."
+    )
+    parser.add_argument("--output", type=Path, default=config.IMAGE_DERIVED_DIR,
+                        help="Pasta das versões (padrão: %(default)s)")
+    parser.add_argument("--width", type=int, default=config.IMAGE_DISPLAY_WIDTH,
+                        help="Largura de exibição em px (padrão: %(default)s)")
+    parser.add_argument("--force", action="store_true",
+                        help="Gera tudo de novo, ignorando o manifesto existente")
+    args = parser.parse_args(argv)
+
+    summary = build_image_derivatives(output_dir=args.output,
+                                      display_width=args.width, force=args.force)
+    print(f"{summary['total']} imagens: {summary['built']} geradas, "
+          f"{summary['skipped']} sem mudanças, "
+          f"{summary['removed']} arquivos antigos apagados. "
+          f"{summary['source_bytes'] // 1024} KB originais -> "
+          f"{summary['derived_bytes'] // 1024} KB (WebP, todas as densidades).")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
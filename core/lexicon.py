@@ -0,0 +1,428 @@
+"""Módulo gerador de desafios a partir de uma lista de palavras.
+
+Em vez de escrever à mão cada desafio do Complete a Palavra (a palavra
+incompleta e as sílabas de opção), o gerador lê uma lista de palavras
+(o léxico, `data/lexicon.txt`) e monta os desafios sozinho:
+
+1.  Separa cada palavra em sílabas (`syllabify`), com as regras de
+    divisão silábica do português do Brasil.
+2.  Monta um índice invertido sílaba -> palavras (`SyllableIndex`) e,
+    a partir dele, os grupos de sílabas parecidas (mesmo tamanho e
+    mesma vogal: SA, LA, MA...), de onde saem as opções erradas.
+3.  Para cada palavra, esconde uma sílaba e sorteia as opções erradas
+    no grupo da sílaba certa, em tempo constante por desafio. Uma opção
+    que formaria outra palavra do léxico (GA ___ com LO: "galo") é
+    descartada.
+
+Também preenche a dica (`hint`, ex: "E-LE-FAN-TE") dos desafios do
+"O que é isso?" que ainda não têm uma.
+
+A geração é incremental: desafios que já estão no arquivo e cuja
+palavra continua no léxico são mantidos (inclusive os escritos à
+mão); só as palavras novas ganham desafios, e as que saíram do léxico
+têm os seus removidos. Nos desafios mantidos, uma opção errada que
+passou a formar uma palavra do léxico (ex: "cama" entrou no léxico e
+"CA ___" oferecia MA) é trocada por outra.
+
+O léxico tem uma palavra por linha; depois de um TAB, opcionalmente, a
+imagem do desafio. Linhas começando com "#" são comentários.
+
+Uso:
+    python -m core.lexicon                  # atualiza os desafios
+    python -m core.lexicon --rebuild        # gera todos de novo
+    python -m core.lexicon --syllabify casa elefante
+"""
+
+import argparse
+import random
+import sys
+import time
+import unicodedata
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from core import config
+from core.catalog import read_content_file, validate_items, write_content_file
+
+_VOWELS = set("aeiouáéíóúâêôãõàüy")
+_STRONG_NASAL = set("ãõ")
+# Dígrafos que formam uma única consoante no início da sílaba
+_DIGRAPHS = ("ch", "lh", "nh")
+# Encontros consonantais que não se separam (pr, bl, tr...); "tl" e "dl"
+# se separam (at-le-ta)
+_CLUSTER_FIRST = set("pbtdcgfvk")
+_CLUSTER_SECOND = set("lr")
+_SPLIT_CLUSTERS = {("t", "l"), ("d", "l")}
+
+# Palavras que viram desafio: de 2 a 4 sílabas
+MIN_SYLLABLES = 2
+MAX_SYLLABLES = 4
+# Quantas opções cada desafio mostra (a certa e as erradas)
+OPTION_COUNT = 3
+# Uma sílaba só vira opção errada se aparecer em pelo menos tantas
+# palavras do léxico (sílabas raras confundem mais do que ensinam)
+MIN_DISTRACTOR_WORDS = 2
+BLANK = "___"
+
+
+def _units(word: str) -> List[Tuple[str, bool]]:
+    """Divide a palavra em unidades (letra ou dígrafo), marcando as vogais."""
+    units = []
+    i = 0
+    while i < len(word):
+        pair = word[i:i + 2]
+        if pair in _DIGRAPHS:
+            units.append((pair, False))
+            i += 2
+        elif (word[i] in "qg" and word[i + 1:i + 2] in ("u", "ü")
+              and word[i + 2:i + 3] in _VOWELS and word[i + 2:i + 3]):
+            # O "u" de "qu"/"gu" antes de vogal fica com a consoante (qua-tro, guer-ra)
+            units.append((word[i:i + 2], False))
+            i += 2
+        else:
+            units.append((word[i], word[i] in _VOWELS))
+            i += 1
+    return units
+
+
+def _forms_diphthong(units: List[Tuple[str, bool]], first: int) -> bool:
+    """Diz se as vogais `units[first]` e `units[first + 1]` ficam na mesma sílaba."""
+    a, b = units[first][0], units[first + 1][0]
+    if a in _STRONG_NASAL and b in "eo":
+        return True  # mão, mãe, põe
+    if b not in "iu" or a == b:
+        return False  # po-e-ta, di-a, sa-ú-de, xi-i-ta
+    # O "i"/"u" antes de "nh" ou de uma consoante que fica na mesma sílaba
+    # (que não seja "s") fica sozinho: ra-i-nha, a-in-da, ca-ir, ju-iz.
+    # Se a consoante vai para a sílaba seguinte, é ditongo: cai-xa, cãi-bra;
+    # no rr/ss, também: bair-ro
+    end = first + 2
+    while end < len(units) and not units[end][1]:
+        end += 1
+    consonants = [text for text, _ in units[first + 2:end]]
+    if not consonants:
+        return True
+    if consonants[0] == "nh":
+        return False
+    closing = len(consonants) - (_onset_size(consonants) if end < len(units) else 0)
+    if closing == 0 or consonants[0] == "s":
+        return True
+    return len(consonants) >= 2 and consonants[0] == consonants[1]
+
+
+def _onset_size(consonants: List[str]) -> int:
+    """Quantas consoantes entre duas vogais vão para a sílaba seguinte."""
+    if not consonants:
+        return 0
+    if len(consonants) >= 2:
+        c1, c2 = consonants[-2], consonants[-1]
+        if c1 in _CLUSTER_FIRST and c2 in _CLUSTER_SECOND and (c1, c2) not in _SPLIT_CLUSTERS:
+            return 2  # a-bra-ço, ins-tru-ir
+    return 1  # ca-sa, car-ro, nas-cer, par-te
+
+
+def syllabify(word: str) -> List[str]:
+    """Separa uma palavra em sílabas (ex: "elefante" -> ["E", "LE", "FAN", "TE"]).
+
+    Segue as regras da divisão silábica do português do Brasil: dígrafos
+    (ch, lh, nh, qu, gu) e encontros como "br"/"pl" não se separam; rr,
+    ss, sc, xc e as consoantes seguidas se separam; ditongos ficam
+    juntos e hiatos, separados. Palavras compostas com hífen são
+    separadas parte por parte.
+
+    Args:
+        word: A palavra (maiúsculas e minúsculas tanto faz).
+
+    Returns:
+        As sílabas em maiúsculas; vazia se a palavra não tiver vogais.
+    """
+    word = unicodedata.normalize("NFC", word.strip().lower())
+    if "-" in word:
+        return [s for part in word.split("-") for s in syllabify(part)]
+
+    units = _units(word)
+    # Núcleos: posições (início, fim) das vogais de cada sílaba
+    nuclei: List[Tuple[int, int]] = []
+    i = 0
+    while i < len(units):
+        if not units[i][1]:
+            i += 1
+            continue
+        end = i + 1
+        if end < len(units) and units[end][1] and _forms_diphthong(units, i):
+            end += 1
+        nuclei.append((i, end))
+        i = end
+    if not nuclei:
+        return []
+
+    # Cada sílaba começa nas consoantes que vão para ela (ver `_onset_size`)
+    starts = [0]
+    for (_, previous_end), (start, _) in zip(nuclei, nuclei[1:]):
+        consonants = [text for text, _ in units[previous_end:start]]
+        starts.append(start - _onset_size(consonants))
+    starts.append(len(units))
+    return [
+        "".join(text for text, _ in units[begin:end]).upper()
+        for begin, end in zip(starts, starts[1:])
+    ]
+
+
+def _vowel_key(syllable: str) -> Tuple[int, str]:
+    """Grupo das sílabas parecidas: mesmo tamanho e mesmas vogais (sem acento)."""
+    plain = unicodedata.normalize("NFD", syllable.lower())
+    vowels = "".join(c for c in plain if c in "aeiou")
+    return len(syllable), vowels
+
+
+class SyllableIndex:
+    """Índice invertido sílaba -> palavras do léxico.
+
+    Também guarda os grupos de sílabas parecidas (ver `_vowel_key`) de
+    onde saem as opções erradas, montados uma vez na construção.
+
+    Args:
+        syllables: Palavra -> suas sílabas (de `syllabify`).
+    """
+
+    def __init__(self, syllables: Dict[str, List[str]]):
+        self.syllables = syllables
+        self.words: Dict[str, List[str]] = {}
+        for word, parts in syllables.items():
+            for syllable in set(parts):
+                self.words.setdefault(syllable, []).append(word)
+        self._spelled: Set[str] = {"".join(parts) for parts in syllables.values()}
+        self.groups: Dict[Tuple[int, str], List[str]] = {}
+        for syllable in sorted(self.words):
+            if len(self.words[syllable]) >= MIN_DISTRACTOR_WORDS:
+                self.groups.setdefault(_vowel_key(syllable), []).append(syllable)
+
+    def is_word(self, syllables: Iterable[str]) -> bool:
+        """Diz se as sílabas juntas formam uma palavra do léxico."""
+        return "".join(syllables) in self._spelled
+
+    def distractors(self, parts: List[str], blank: int, count: int,
+                    rng: random.Random) -> List[str]:
+        """Sorteia opções erradas para a sílaba `parts[blank]`.
+
+        Cada opção é sorteada no grupo da sílaba certa, com um número
+        fixo de tentativas: o custo não depende do tamanho do léxico.
+
+        Returns:
+            Até `count` sílabas diferentes da certa (menos, se o grupo
+            for pequeno demais).
+        """
+        group = self.groups.get(_vowel_key(parts[blank]), ())
+        chosen: List[str] = []
+        for _ in range(count * 4):
+            if len(chosen) == count or not group:
+                break
+            candidate = group[rng.randrange(len(group))]
+            if candidate == parts[blank] or candidate in chosen:
+                continue
+            trial = parts[:blank] + [candidate] + parts[blank + 1:]
+            if self.is_word(trial):
+                continue  # Também seria uma resposta certa
+            chosen.append(candidate)
+        return chosen
+
+
+def read_lexicon(path: Path) -> Dict[str, Optional[str]]:
+    """Lê o léxico: palavra (minúscula) -> imagem (ou None), na ordem do arquivo."""
+    lexicon: Dict[str, Optional[str]] = {}
+    for line in path.read_text("utf-8").splitlines():
+        if not line.strip() or line.lstrip().startswith("#"):
+            continue
+        word, _, image = line.partition("\t")
+        word = unicodedata.normalize("NFC", word.strip().lower())
+        if word and all(c.isalpha() or c == "-" for c in word):
+            lexicon.setdefault(word, image.strip() or None)
+    return lexicon
+
+
+def make_challenge(word: str, index: SyllableIndex,
+                   image: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    """Monta o desafio do Complete a Palavra de uma palavra do léxico.
+
+    O sorteio (a sílaba escondida e as opções) depende só da palavra e
+    do índice, então gerar de novo dá o mesmo desafio.
+
+    Returns:
+        O item no formato de `data/content/complete_word.json`, ou None
+        se a palavra não servir (sílabas demais ou de menos, ou sem
+        opções erradas suficientes).
+    """
+    parts = index.syllables.get(word) or syllabify(word)
+    if not MIN_SYLLABLES <= len(parts) <= MAX_SYLLABLES:
+        return None
+    rng = random.Random(word)
+    # Esconde uma sílaba sorteada; se ela não tiver opções erradas
+    # suficientes, tenta as outras
+    positions = list(range(len(parts)))
+    rng.shuffle(positions)
+    for blank in positions:
+        wrong = index.distractors(parts, blank, OPTION_COUNT - 1, rng)
+        if len(wrong) == OPTION_COUNT - 1:
+            break
+    else:
+        return None
+    options = wrong + [parts[blank]]
+    rng.shuffle(options)
+    item: Dict[str, Any] = {"id": word}
+    if image:
+        item["image"] = image
+    item.update({
+        "prompt": " ".join(BLANK if i == blank else s for i, s in enumerate(parts)),
+        "options": options,
+        "correct": parts[blank],
+        "full_word": word.upper(),
+    })
+    return item
+
+
+def _fix_options(item: Dict[str, Any], index: SyllableIndex) -> Optional[Dict[str, Any]]:
+    """Troca as opções erradas de um desafio que formam palavras do léxico.
+
+    A palavra incompleta e a opção certa não mudam; cada opção trocada
+    é sorteada como em `make_challenge`. Se não houver opções novas
+    suficientes, as que formam palavras são só removidas.
+
+    Returns:
+        O desafio corrigido (uma cópia), ou None se nenhuma opção formava
+        uma palavra.
+    """
+    parts = [part.upper() for part in item["prompt"].split()]
+    if BLANK not in parts:
+        return None
+    blank = parts.index(BLANK)
+
+    def forms_word(option: str) -> bool:
+        return index.is_word(parts[:blank] + [option.upper()] + parts[blank + 1:])
+
+    correct = item["correct"]
+    bad = [o for o in item["options"] if o != correct and forms_word(o)]
+    if not bad:
+        return None
+
+    kept = {o.upper() for o in item["options"] if o not in bad}
+    parts[blank] = correct.upper()
+    rng = random.Random(item["id"])
+    fresh = [s for s in index.distractors(parts, blank, OPTION_COUNT + len(bad), rng)
+             if s not in kept][:len(bad)]
+    lower = correct.islower()
+    options = []
+    for option in item["options"]:
+        if option in bad:
+            if not fresh:
+                continue  # Sem opção nova: a que formava palavra só sai
+            option = fresh.pop(0)
+            option = option.lower() if lower else option
+        options.append(option)
+    return dict(item, options=options)
+
+
+def generate_challenges(lexicon: Dict[str, Optional[str]],
+                        existing: Iterable[Dict[str, Any]] = (),
+                        rebuild: bool = False) -> Tuple[List[Dict[str, Any]], Dict[str, int]]:
+    """Gera os desafios do Complete a Palavra de todo o léxico.
+
+    Args:
+        lexicon: Palavra -> imagem (de `read_lexicon`).
+        existing: Os desafios atuais; os das palavras que continuam no
+                  léxico são mantidos (com a imagem do léxico, se mudou).
+        rebuild: Se True, ignora os desafios atuais e gera todos.
+
+    Returns:
+        Os desafios, na ordem do léxico, e um resumo com as contagens
+        ("kept", "fixed", "generated", "skipped"). Os corrigidos (opções
+        trocadas, ver `_fix_options`) também contam como mantidos.
+    """
+    index = SyllableIndex({word: syllabify(word) for word in lexicon})
+    current = {} if rebuild else {item["id"]: item for item in existing}
+    challenges = []
+    summary = {"kept": 0, "fixed": 0, "generated": 0, "skipped": 0}
+    for word, image in lexicon.items():
+        item = current.get(word)
+        if item is not None:
+            if image and item.get("image") != image:
+                item = dict(item, image=image)
+            # O léxico pode ter ganhado palavras que uma opção errada forma
+            fixed = _fix_options(item, index)
+            if fixed is not None:
+                item = fixed
+                summary["fixed"] += 1
+            summary["kept"] += 1
+        else:
+            item = make_challenge(word, index, image)
+            if item is None:
+                summary["skipped"] += 1
+                continue
+            summary["generated"] += 1
+        challenges.append(item)
+    return challenges, summary
+
+
+def fill_hints(items: List[Dict[str, Any]]) -> int:
+    """Preenche a dica silábica dos itens do "O que é isso?" que não têm uma.
+
+    Returns:
+        Quantas dicas foram preenchidas.
+    """
+    filled = 0
+    for item in items:
+        if not item.get("hint"):
+            parts = syllabify(item["correct"])
+            if parts:
+                item["hint"] = "-".join(parts)
+                filled += 1
+    return filled
+
+
+def _update_module(content_dir: Path, module: str, items: List[Dict[str, Any]]):
+    path = content_dir / f"{module}.json"
+    payload = read_content_file(path)
+    validate_items(module, items)
+    payload["items"] = items
+    write_content_file(path, payload)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Ponto de entrada da linha de comando."""
+    parser = argparse.ArgumentParser(
+        description="Gera os desafios do Complete a Palavra a partir do léxico."
+    )
+    parser.add_argument("--lexicon", type=Path, default=config.LEXICON_FILE,
+                        help="Lista de palavras (padrão: %(default)s)")
+    parser.add_argument("--content-dir", type=Path, default=config.CONTENT_DIR,
+                        help="Pasta do conteúdo (padrão: %(default)s)")
+    parser.add_argument("--rebuild", action="store_true",
+                        help="Gera todos os desafios de novo, ignorando os atuais")
+    parser.add_argument("--syllabify", nargs="+", metavar="PALAVRA",
+                        help="Apenas mostra a divisão silábica das palavras")
+    args = parser.parse_args(argv)
+
+    if args.syllabify:
+        for word in args.syllabify:
+            print("-".join(syllabify(word)))
+        return 0
+
+    start = time.perf_counter()
+    lexicon = read_lexicon(args.lexicon)
+    existing = read_content_file(args.content_dir / "complete_word.json").get("items", [])
+    challenges, summary = generate_challenges(lexicon, existing, args.rebuild)
+    _update_module(args.content_dir, "complete_word", challenges)
+
+    image_items = read_content_file(args.content_dir / "image_to_word.json").get("items", [])
+    hints = fill_hints(image_items)
+    if hints:
+        _update_module(args.content_dir, "image_to_word", image_items)
+
+    print(f"{len(lexicon)} palavras em {time.perf_counter() - start:.2f} s: "
+          f"{summary['generated']} desafios gerados, {summary['kept']} mantidos "
+          f"({summary['fixed']} com opções trocadas), "
+          f"{summary['skipped']} palavras sem desafio; {hints} dicas preenchidas.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
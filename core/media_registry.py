@@ -0,0 +1,250 @@
+"""Módulo do registro de mídia (áudios e imagens) por conteúdo.
+
+Um `st.audio(bytes)` entrega os bytes ao gerenciador de mídia do
+Streamlit a cada execução de cada sessão: o mesmo "CASA" passa de novo
+pelo Python, é servido em uma URL `/media/...` marcada como "no-cache"
+e o navegador baixa o áudio outra vez.
+
+O registro grava cada conteúdo uma única vez, em um arquivo com o hash
+do conteúdo no nome (`static/media/<hash>.mp3`), servido pela pasta
+estática do Streamlit (`/app/static/media/...`). A URL é a mesma em
+todas as sessões, execuções e reinícios do servidor, então o navegador
+reaproveita o que já baixou, e o servidor envia o arquivo direto do
+disco, sem copiá-lo para a memória do Python. Arquivos que já estão no
+disco (ex: uma imagem sem as versões geradas) são publicados com um
+link para o próprio arquivo, sem cópia.
+
+Cada arquivo guarda as sessões que o usaram (as referências). Quando a
+pasta passa de `config.MEDIA_MAX_BYTES`, os arquivos menos usados
+recentemente e sem nenhuma sessão ativa são apagados.
+
+Uso:
+    audio_bytes = generate_audio_mp3("casa")
+    if audio_bytes:
+        st.audio(media_url(audio_bytes), autoplay=True)
+"""
+
+import hashlib
+import os
+import shutil
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Optional, Set, Tuple, Union
+
+from core import config
+from core.metrics import timed
+
+
+class _Entry:
+    """Um arquivo publicado: nome, tamanho e as sessões que o usam."""
+
+    __slots__ = ("name", "size", "sessions")
+
+    def __init__(self, name: str, size: int):
+        self.name = name
+        self.size = size
+        self.sessions: Set[str] = set()
+
+
+def _audio_suffix(data: bytes) -> str:
+    """A extensão do áudio pelo cabeçalho (WAV do espeak-ng ou MP3)."""
+    return ".wav" if data[:4] == b"RIFF" else ".mp3"
+
+
+def _current_session() -> Optional[str]:
+    try:
+        from streamlit.runtime.scriptrunner import get_script_run_ctx
+    except ImportError:
+        return None
+    ctx = get_script_run_ctx(suppress_warning=True)
+    return ctx.session_id if ctx is not None else None
+
+
+def _is_active(session_id: str) -> bool:
+    from streamlit import runtime
+
+    return runtime.exists() and runtime.get_instance().is_active_session(session_id)
+
+
+class MediaRegistry:
+    """Os arquivos de mídia publicados na pasta estática, por hash do conteúdo.
+
+    Args:
+        directory: A pasta dos arquivos (dentro da pasta `static/` do app).
+        url_prefix: A URL dessa pasta no servidor.
+        max_bytes: O tamanho da pasta a partir do qual os arquivos sem
+                   sessões ativas começam a ser apagados.
+    """
+
+    def __init__(self, directory: Path, url_prefix: str, max_bytes: int):
+        self.directory = Path(directory)
+        self.url_prefix = url_prefix.rstrip("/")
+        self.max_bytes = max_bytes
+        # hash -> arquivo, do menos para o mais usado recentemente
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._file_digests: Dict[Tuple[str, int, int], str] = {}
+        self._total = 0
+        self._lock = threading.Lock()
+        self._scan()
+
+    def _scan(self):
+        """Reaproveita os arquivos publicados por execuções anteriores."""
+        if not self.directory.is_dir():
+            return
+        for path in sorted(self.directory.iterdir(), key=lambda p: p.stat().st_mtime):
+            if path.is_file() and not path.name.startswith("."):
+                size = path.stat().st_size
+                self._entries[path.stem] = _Entry(path.name, size)
+                self._total += size
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def total_bytes(self) -> int:
+        """O tamanho de todos os arquivos publicados."""
+        return self._total
+
+    def _url(self, entry: _Entry) -> str:
+        return f"{self.url_prefix}/{entry.name}"
+
+    def _use(self, digest: str) -> Optional[_Entry]:
+        """Marca um arquivo já publicado como usado agora pela sessão atual."""
+        entry = self._entries.get(digest)
+        if entry is not None:
+            self._entries.move_to_end(digest)
+            session = _current_session()
+            if session is not None:
+                entry.sessions.add(session)
+        return entry
+
+    @timed("media.register")
+    def register(self, data: bytes, suffix: str) -> str:
+        """Publica um conteúdo (se ainda não estiver publicado) e retorna a URL.
+
+        Args:
+            data: O conteúdo (ex: o MP3 de uma palavra).
+            suffix: A extensão do arquivo (ex: ".mp3").
+
+        Returns:
+            A URL estável do conteúdo (ex: "/app/static/media/3f2a....mp3").
+        """
+        digest = hashlib.blake2b(data, digest_size=16).hexdigest()
+        with self._lock:
+            entry = self._use(digest)
+            if entry is not None:
+                return self._url(entry)
+            path = self.directory / f"{digest}{suffix}"
+            if not path.exists():
+                # Grava em um temporário e renomeia: ninguém lê um arquivo pela metade
+                self.directory.mkdir(parents=True, exist_ok=True)
+                tmp_path = path.with_name(f".{path.name}.{threading.get_ident()}.tmp")
+                tmp_path.write_bytes(data)
+                os.replace(tmp_path, path)
+            return self._add(digest, path.name, len(data))
+
+    @timed("media.register")
+    def register_file(self, source: Union[str, Path]) -> Optional[str]:
+        """Publica um arquivo do disco (com um link, sem cópia) e retorna a URL.
+
+        O hash de cada arquivo é calculado uma única vez (enquanto o
+        tamanho e a data de modificação não mudarem).
+
+        Returns:
+            A URL estável do arquivo, ou None se ele não existir.
+        """
+        source = Path(source)
+        try:
+            stat = source.stat()
+        except OSError:
+            return None
+        key = (str(source), stat.st_size, stat.st_mtime_ns)
+        digest = self._file_digests.get(key)
+        if digest is None:
+            with open(source, "rb") as f:
+                digest = hashlib.file_digest(f, lambda: hashlib.blake2b(digest_size=16)).hexdigest()
+            self._file_digests[key] = digest
+
+        with self._lock:
+            entry = self._use(digest)
+            if entry is not None:
+                return self._url(entry)
+            path = self.directory / f"{digest}{source.suffix.lower()}"
+            if not path.exists():
+                self.directory.mkdir(parents=True, exist_ok=True)
+                try:
+                    os.link(source, path)
+                except OSError:
+                    shutil.copyfile(source, path)  # Outro disco: copia
+            return self._add(digest, path.name, stat.st_size)
+
+    def _add(self, digest: str, name: str, size: int) -> str:
+        entry = _Entry(name, size)
+        self._entries[digest] = entry
+        self._total += size
+        self._use(digest)
+        self._evict()
+        return self._url(entry)
+
+    def _evict(self):
+        """Apaga os arquivos menos usados e sem sessões ativas até caber no limite."""
+        if self._total <= self.max_bytes:
+            return
+        for digest, entry in list(self._entries.items())[:-1]:
+            entry.sessions = {s for s in entry.sessions if _is_active(s)}
+            if entry.sessions:
+                continue
+            try:
+                (self.directory / entry.name).unlink()
+            except FileNotFoundError:
+                pass
+            del self._entries[digest]
+            self._total -= entry.size
+            if self._total <= self.max_bytes:
+                break
+
+
+_registry: Optional[MediaRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_media_registry() -> Optional[MediaRegistry]:
+    """Retorna o registro único do processo (None se `config.MEDIA_STATIC` estiver desligado)."""
+    global _registry
+    if _registry is None and config.MEDIA_STATIC:
+        with _registry_lock:
+            if _registry is None:
+                _registry = MediaRegistry(config.MEDIA_DIR, config.MEDIA_STATIC_URL,
+                                          config.MEDIA_MAX_BYTES)
+    return _registry
+
+
+def media_url(data: bytes) -> Union[str, bytes]:
+    """Retorna o que passar ao `st.audio`: a URL estável do áudio.
+
+    Com o registro desligado (ou se não der para gravar na pasta), os
+    próprios bytes, como antes.
+    """
+    registry = get_media_registry()
+    if registry is None:
+        return data
+    try:
+        return registry.register(data, _audio_suffix(data))
+    except OSError:
+        return data
+
+
+def media_file_url(path: str) -> str:
+    """Retorna a URL estável de um arquivo do disco (ou o próprio caminho).
+
+    Com o registro desligado (ou se não der para publicar o arquivo), o
+    próprio caminho, que o Streamlit lê e envia.
+    """
+    registry = get_media_registry()
+    if registry is None:
+        return path
+    try:
+        return registry.register_file(path) or path
+    except OSError:
+        return path
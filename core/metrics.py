@@ -0,0 +1,258 @@
+"""Módulo de medição de tempo dos trechos mais usados (spans).
+
+Mostra para onde vai o tempo de cada execução das páginas: áudio
+(cache ou síntese), sorteio de desafios, verificação de respostas,
+imagens e o tempo total do script.
+
+Uso:
+    with span("audio.synthesis"):
+        ...
+
+    @timed("answer.check")
+    def check_user_answer(...):
+        ...
+
+    if __name__ == "__main__":
+        with page_span(__file__):
+            main()
+
+    @st.fragment
+    def answer_area():
+        with page_span(__file__, "page.fragment"):
+            ...
+
+Os tempos são agregados por página e por span (contagem, soma, máximo
+e um histograma) e exportados de tempos em tempos para um arquivo
+local: no formato de texto do Prometheus (`.prom`) ou uma linha JSON
+por exportação (`.jsonl`). Com `ALFABETIZACAO_METRICS_PANEL=1`, a barra
+lateral mostra os tempos da última execução da página.
+
+Desativado (o padrão), `span` devolve sempre o mesmo contexto vazio:
+o custo é só uma verificação e uma chamada de função.
+"""
+
+import atexit
+import contextvars
+import functools
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, Tuple, TypeVar
+
+from core import config
+
+# Limites (em segundos) das faixas do histograma de cada span
+BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Página da execução atual e os spans medidos nela ("-" = fora de páginas,
+# ex: threads de pré-carregamento)
+_current_page: contextvars.ContextVar[str] = contextvars.ContextVar(
+    "metrics_page", default="-"
+)
+_current_run: contextvars.ContextVar[Optional[List[Tuple[str, float]]]] = (
+    contextvars.ContextVar("metrics_run", default=None)
+)
+
+_NULL_SPAN = nullcontext()
+
+F = TypeVar("F", bound=Callable)
+
+
+class _SpanStats:
+    """Agregado dos tempos de um span em uma página."""
+
+    __slots__ = ("count", "total", "max", "buckets")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.buckets = [0] * len(BUCKETS)
+
+    def add(self, seconds: float):
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+        for i, limit in enumerate(BUCKETS):
+            if seconds <= limit:
+                self.buckets[i] += 1
+                break
+
+
+class MetricsRegistry:
+    """Os agregados de todos os spans do processo."""
+
+    def __init__(self, path: Optional[Path] = None, export_interval: float = 10.0):
+        self.path = Path(path) if path else None
+        self.export_interval = export_interval
+        self._stats: Dict[Tuple[str, str], _SpanStats] = {}
+        self._lock = threading.Lock()
+        self._last_export = time.monotonic()
+
+    def record(self, page: str, name: str, seconds: float):
+        """Soma uma medição ao agregado de (página, span)."""
+        with self._lock:
+            stats = self._stats.get((page, name))
+            if stats is None:
+                stats = self._stats[(page, name)] = _SpanStats()
+            stats.add(seconds)
+
+    def snapshot(self) -> List[Dict[str, object]]:
+        """Retorna uma cópia dos agregados, um dicionário por (página, span)."""
+        with self._lock:
+            return [
+                {"page": page, "span": name, "count": s.count,
+                 "sum": s.total, "max": s.max, "buckets": list(s.buckets)}
+                for (page, name), s in sorted(self._stats.items())
+            ]
+
+    def maybe_export(self):
+        """Exporta para o arquivo se já passou o intervalo desde a última vez."""
+        if self.path is not None and time.monotonic() - self._last_export >= self.export_interval:
+            self.export()
+
+    def export(self):
+        """Grava os agregados no arquivo (`.jsonl` acrescenta; os outros reescrevem)."""
+        if self.path is None:
+            return
+        self._last_export = time.monotonic()
+        snapshot = self.snapshot()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        if self.path.suffix == ".jsonl":
+            line = json.dumps({"time": time.time(), "spans": snapshot}, ensure_ascii=False)
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(line + "\n")
+        else:
+            tmp_path = self.path.with_name(self.path.name + ".tmp")
+            tmp_path.write_text(_prometheus_text(snapshot), "utf-8")
+            os.replace(tmp_path, self.path)
+
+
+def _prometheus_text(snapshot: List[Dict[str, object]]) -> str:
+    """Formata os agregados como um histograma do Prometheus."""
+    name = "alfabetizacao_span_seconds"
+    lines = [f"# HELP {name} Tempo gasto em cada trecho, por página.",
+             f"# TYPE {name} histogram"]
+    for entry in snapshot:
+        labels = 'page="{}",span="{}"'.format(
+            str(entry["page"]).replace('"', '\\"'), entry["span"]
+        )
+        cumulative = 0
+        for limit, count in zip(BUCKETS, entry["buckets"]):
+            cumulative += count
+            lines.append(f'{name}_bucket{{{labels},le="{limit}"}} {cumulative}')
+        lines.append(f'{name}_bucket{{{labels},le="+Inf"}} {entry["count"]}')
+        lines.append(f"{name}_sum{{{labels}}} {entry['sum']:.6f}")
+        lines.append(f"{name}_count{{{labels}}} {entry['count']}")
+    return "\n".join(lines) + "\n"
+
+
+_registry: Optional[MetricsRegistry] = None
+if config.METRICS_ENABLED:
+    _registry = MetricsRegistry(config.METRICS_FILE, config.METRICS_EXPORT_INTERVAL)
+    atexit.register(_registry.export)
+
+
+def get_metrics_registry() -> Optional[MetricsRegistry]:
+    """Retorna o registro do processo (None se a medição estiver desativada)."""
+    return _registry
+
+
+@contextmanager
+def _timed(name: str) -> Iterator[None]:
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        _registry.record(_current_page.get(), name, elapsed)
+        run = _current_run.get()
+        if run is not None:
+            run.append((name, elapsed))
+
+
+def span(name: str):
+    """Mede o tempo de um trecho (ex: `with span("audio.cache"):`)."""
+    if _registry is None:
+        return _NULL_SPAN
+    return _timed(name)
+
+
+def timed(name: str) -> Callable[[F], F]:
+    """Decorador que mede cada chamada da função como um span."""
+    def decorate(func: F) -> F:
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if _registry is None:
+                return func(*args, **kwargs)
+            with _timed(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+@contextmanager
+def page_span(page_file: str, name: str = "page.script") -> Iterator[None]:
+    """Mede o tempo total do script de uma página (ou de um fragmento dela).
+
+    Os spans medidos dentro dele são atribuídos à página. No fim, exporta
+    os agregados (se já passou o intervalo) e, se configurado, mostra o
+    painel de depuração na barra lateral.
+
+    Um fragmento (`st.fragment`) usa `name="page.fragment"`: quando roda
+    sozinho, seus spans também são atribuídos à página; quando roda
+    junto com a página inteira, é medido como um span comum.
+
+    Args:
+        page_file: O `__file__` da página.
+        name: O nome do span ("page.script" ou "page.fragment").
+    """
+    if _registry is None:
+        yield
+        return
+    if _current_run.get() is not None:
+        with _timed(name):
+            yield
+        return
+
+    page = Path(page_file).stem
+    page_token = _current_page.set(page)
+    run: List[Tuple[str, float]] = []
+    run_token = _current_run.set(run)
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        _registry.record(page, name, elapsed)
+        _current_run.reset(run_token)
+        _current_page.reset(page_token)
+        _registry.maybe_export()
+    # Só chega aqui se o script terminou normalmente (sem st.rerun/st.stop);
+    # um fragmento não pode escrever na barra lateral
+    if config.METRICS_PANEL and name == "page.script":
+        render_debug_panel(page, run, elapsed)
+
+
+def render_debug_panel(page: str, run: List[Tuple[str, float]], elapsed: float):
+    """Mostra na barra lateral os tempos da última execução e os agregados."""
+    import streamlit as st
+
+    with st.sidebar.expander(f"⏱️ Tempos ({elapsed * 1000:.1f} ms)"):
+        st.caption("Esta execução")
+        st.dataframe(
+            [{"span": name, "ms": round(seconds * 1000, 2)} for name, seconds in run],
+            hide_index=True,
+        )
+        st.caption(f"Acumulado da página '{page}'")
+        st.dataframe(
+            [{"span": e["span"], "vezes": e["count"],
+              "média ms": round(e["sum"] / e["count"] * 1000, 2),
+              "máx ms": round(e["max"] * 1000, 2)}
+             for e in _registry.snapshot() if e["page"] == page],
+            hide_index=True,
+        )
@@ -0,0 +1,156 @@
+"""Módulo de utilidades para arquivos MP3.
+
+Funções pequenas, sem dependências externas, para ler os quadros
+(frames) de um MP3, calcular sua duração, remover tags ID3 e juntar
+vários clipes em um só. Um MP3 é só uma sequência de quadros
+independentes, então juntar clipes do mesmo formato é concatenar
+os quadros de cada um.
+
+Apenas MPEG Layer III (o formato gerado pelo gTTS) é suportado.
+"""
+
+from typing import Iterator, List, Optional, Tuple
+
+# Taxas de bits (kbps) do Layer III, indexadas pelo campo do cabeçalho
+_BITRATES_MPEG1 = (0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320)
+_BITRATES_MPEG2 = (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160)
+
+# Taxas de amostragem (Hz) por versão do MPEG
+_SAMPLE_RATES = {
+    3: (44100, 48000, 32000),  # MPEG-1
+    2: (22050, 24000, 16000),  # MPEG-2
+    0: (11025, 12000, 8000),   # MPEG-2.5
+}
+
+
+class MP3FormatError(ValueError):
+    """Erro levantado quando os bytes não são um MP3 Layer III válido."""
+
+
+def _parse_header(data: bytes, pos: int) -> Tuple[int, int, int]:
+    """Lê o cabeçalho do quadro em `pos`.
+
+    Returns:
+        Uma tupla (tamanho do quadro em bytes, amostras por quadro,
+        taxa de amostragem).
+
+    Raises:
+        MP3FormatError: Se não houver um cabeçalho Layer III válido em `pos`.
+    """
+    if pos + 4 > len(data) or data[pos] != 0xFF or (data[pos + 1] & 0xE0) != 0xE0:
+        raise MP3FormatError(f"Cabeçalho de quadro MP3 inválido na posição {pos}.")
+
+    version = (data[pos + 1] >> 3) & 0x03
+    layer = (data[pos + 1] >> 1) & 0x03
+    bitrate_index = (data[pos + 2] >> 4) & 0x0F
+    sample_rate_index = (data[pos + 2] >> 2) & 0x03
+    padding = (data[pos + 2] >> 1) & 0x01
+
+    if version == 1 or layer != 1 or bitrate_index in (0, 15) or sample_rate_index == 3:
+        raise MP3FormatError(f"Quadro na posição {pos} não é MPEG Layer III suportado.")
+
+    sample_rate = _SAMPLE_RATES[version][sample_rate_index]
+    if version == 3:
+        bitrate = _BITRATES_MPEG1[bitrate_index] * 1000
+        samples = 1152
+        size = 144 * bitrate // sample_rate + padding
+    else:
+        bitrate = _BITRATES_MPEG2[bitrate_index] * 1000
+        samples = 576
+        size = 72 * bitrate // sample_rate + padding
+    return size, samples, sample_rate
+
+
+def _audio_bounds(data: bytes) -> Tuple[int, int]:
+    """Retorna o trecho [início, fim) de `data` sem as tags ID3v2 e ID3v1."""
+    start, end = 0, len(data)
+    if data[:3] == b"ID3" and len(data) >= 10:
+        # Tamanho "synchsafe": 4 bytes de 7 bits cada
+        tag_size = ((data[6] & 0x7F) << 21 | (data[7] & 0x7F) << 14
+                    | (data[8] & 0x7F) << 7 | (data[9] & 0x7F))
+        footer = 10 if data[5] & 0x10 else 0
+        start = 10 + tag_size + footer
+    if end - start >= 128 and data[end - 128:end - 125] == b"TAG":
+        end -= 128
+    return start, end
+
+
+def iter_frames(data: bytes) -> Iterator[Tuple[int, int, float]]:
+    """Percorre os quadros de áudio de um MP3.
+
+    Args:
+        data: Os bytes do arquivo MP3.
+
+    Yields:
+        Tuplas (posição, tamanho em bytes, duração em segundos) de cada quadro.
+
+    Raises:
+        MP3FormatError: Se encontrar bytes que não formam um quadro válido.
+    """
+    pos, end = _audio_bounds(data)
+    while pos < end:
+        size, samples, sample_rate = _parse_header(data, pos)
+        if pos + size > end:
+            # Último quadro truncado: o navegador também o descarta
+            return
+        yield pos, size, samples / sample_rate
+        pos += size
+
+
+def mp3_duration(data: bytes) -> float:
+    """Calcula a duração de um MP3 em segundos somando seus quadros."""
+    return sum(duration for _, _, duration in iter_frames(data))
+
+
+def stream_format(data: bytes) -> Optional[Tuple[int, int, int]]:
+    """Retorna o formato do primeiro quadro, para saber se dois clipes combinam.
+
+    Returns:
+        Uma tupla (versão do MPEG, taxa de amostragem, amostras por
+        quadro), ou None se `data` não começar com um quadro Layer III.
+    """
+    start, _ = _audio_bounds(data)
+    try:
+        _, samples, sample_rate = _parse_header(data, start)
+    except MP3FormatError:
+        return None
+    return (data[start + 1] >> 3) & 0x03, sample_rate, samples
+
+
+def strip_tags(data: bytes) -> bytes:
+    """Retorna só os quadros de áudio do MP3 (sem tags ID3)."""
+    start, end = _audio_bounds(data)
+    return data[start:end]
+
+
+def silence(template: bytes, seconds: float) -> bytes:
+    """Gera quadros de silêncio no mesmo formato do primeiro quadro de `template`.
+
+    Um quadro Layer III com informação lateral toda zerada é decodificado
+    como silêncio, então basta repetir o cabeçalho com o resto zerado.
+    O bit de CRC e o de padding são desligados para manter o tamanho fixo.
+
+    Args:
+        template: Um MP3 cujo formato (versão, taxa de bits e de amostragem)
+                  o silêncio deve copiar.
+        seconds: A duração aproximada do silêncio.
+    """
+    start, _ = _audio_bounds(template)
+    header = bytearray(template[start:start + 4])
+    header[1] |= 0x01   # Sem CRC
+    header[2] &= 0xFD   # Sem padding
+    size, samples, sample_rate = _parse_header(bytes(header), 0)
+    n_frames = max(1, round(seconds * sample_rate / samples))
+    return (bytes(header) + bytes(size - 4)) * n_frames
+
+
+def concat_mp3(clips: List[bytes]) -> bytes:
+    """Junta vários MP3s do mesmo formato em um único MP3.
+
+    Args:
+        clips: Os MP3s a juntar, na ordem.
+
+    Returns:
+        Os quadros de todos os clipes concatenados, sem as tags ID3.
+    """
+    return b"".join(strip_tags(clip) for clip in clips)
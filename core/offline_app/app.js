@@ -0,0 +1,1011 @@
+/*
+  Versão offline do App de Alfabetização (gerada por core/offline_export.py).
+
+  Os módulos 1 a 6 rodando no navegador, sem servidor. Cada parte é a
+  tradução de um módulo Python, com os mesmos nomes:
+  - sorteio dos desafios: core/sampler.py (baralho) e core/scheduler.py
+    (repetição espaçada de Leitner);
+  - comparação das respostas escritas: core/answer_matching.py;
+  - estado de cada jogo ("new" -> "playing" -> "correct" | "wrong"):
+    core/game_logic.py;
+  - telas: as páginas em pages/.
+
+  O estado do sorteio de cada jogo fica no localStorage do tablet, então
+  a repetição espaçada continua de onde parou quando o app é reaberto.
+
+  Escrito em ES5 (sem let, arrow functions ou classes) para rodar nos
+  navegadores de tablets antigos.
+*/
+(function () {
+  "use strict";
+
+  var DATA = window.ALFABETIZACAO;
+  var STORAGE_PREFIX = "alfabetizacao:";
+
+  // --- Sorteio (core/sampler.py e core/scheduler.py) ---
+
+  // Gerador com semente (config.CHALLENGE_SEED) ou aleatório
+  function makeRandom(seed) {
+    if (seed === null || seed === undefined) {
+      return Math.random;
+    }
+    var state = seed >>> 0;
+    return function () {  // mulberry32
+      state = (state + 0x6D2B79F5) >>> 0;
+      var t = Math.imul(state ^ (state >>> 15), state | 1);
+      t ^= t + Math.imul(t ^ (t >>> 7), t | 61);
+      return ((t ^ (t >>> 14)) >>> 0) / 4294967296;
+    };
+  }
+
+  function randrange(random, n) {
+    return Math.floor(random() * n);
+  }
+
+  function range(n) {
+    var list = [];
+    for (var i = 0; i < n; i++) {
+      list.push(i);
+    }
+    return list;
+  }
+
+  function shuffle(list, random) {
+    for (var i = list.length - 1; i > 0; i--) {
+      var j = randrange(random, i + 1);
+      var item = list[i];
+      list[i] = list[j];
+      list[j] = item;
+    }
+    return list;
+  }
+
+  // Baralho de índices 0..size-1, reembaralhado ao terminar
+  function ShuffledDeck(size, random, saved) {
+    this.size = size;
+    this.random = random;
+    this.last = saved ? saved.last : null;
+    this.order = saved ? saved.order : range(size);
+    this.position = saved ? saved.position : size;  // Embaralha no 1º sorteio
+  }
+
+  ShuffledDeck.prototype.reshuffle = function () {
+    shuffle(this.order, this.random);
+    this.position = 0;
+    // Evita repetir o último item da rodada anterior logo na emenda
+    if (this.size > 1 && this.order[0] === this.last) {
+      var swap = 1 + randrange(this.random, this.size - 1);
+      this.order[0] = this.order[swap];
+      this.order[swap] = this.last;
+    }
+  };
+
+  ShuffledDeck.prototype.draw = function () {
+    if (this.position >= this.size) {
+      this.reshuffle();
+    }
+    this.last = this.order[this.position++];
+    return this.last;
+  };
+
+  ShuffledDeck.prototype.record = function () {};
+
+  ShuffledDeck.prototype.toJSON = function () {
+    return { last: this.last, order: this.order, position: this.position };
+  };
+
+  // Fila de prioridade de (rodada em que vence, desempate, índice)
+  function heapLess(a, b) {
+    return a[0] < b[0] || (a[0] === b[0] && a[1] < b[1]);
+  }
+
+  function heapSiftDown(heap, position) {
+    var size = heap.length;
+    for (;;) {
+      var smallest = position;
+      var left = 2 * position + 1;
+      var right = left + 1;
+      if (left < size && heapLess(heap[left], heap[smallest])) {
+        smallest = left;
+      }
+      if (right < size && heapLess(heap[right], heap[smallest])) {
+        smallest = right;
+      }
+      if (smallest === position) {
+        return;
+      }
+      var item = heap[position];
+      heap[position] = heap[smallest];
+      heap[smallest] = item;
+      position = smallest;
+    }
+  }
+
+  function heapPush(heap, entry) {
+    heap.push(entry);
+    var position = heap.length - 1;
+    while (position > 0) {
+      var parent = (position - 1) >> 1;
+      if (!heapLess(heap[position], heap[parent])) {
+        break;
+      }
+      var item = heap[position];
+      heap[position] = heap[parent];
+      heap[parent] = item;
+      position = parent;
+    }
+  }
+
+  function heapPop(heap) {
+    var last = heap.pop();
+    if (!heap.length) {
+      return last;
+    }
+    var top = heap[0];
+    heap[0] = last;
+    heapSiftDown(heap, 0);
+    return top;
+  }
+
+  function heapReplace(heap, entry) {
+    var top = heap[0];
+    heap[0] = entry;
+    heapSiftDown(heap, 0);
+    return top;
+  }
+
+  var MAX_BOX = 30;
+
+  // Repetição espaçada: acertar avança uma caixa, errar volta à primeira
+  function LeitnerScheduler(size, random, intervals, saved) {
+    this.size = size;
+    this.random = random;
+    this.intervals = intervals;
+    if (saved) {
+      this.turn = saved.turn;
+      this.last = saved.last;
+      this.pending = saved.pending;
+      this.boxes = saved.boxes;
+      this.ties = saved.ties;
+      this.heap = saved.heap;
+      this.order = saved.order;
+      this.nextNew = saved.nextNew;
+      return;
+    }
+    this.turn = 0;
+    this.last = null;
+    this.pending = null;  // Sorteado e ainda sem resultado
+    this.boxes = [];
+    for (var i = 0; i < size; i++) {
+      this.boxes.push(0);
+    }
+    this.ties = 0;
+    this.heap = [];
+    this.order = shuffle(range(size), random);  // Desafios novos
+    this.nextNew = 0;
+  }
+
+  LeitnerScheduler.prototype.interval = function (box) {
+    var last = this.intervals.length - 1;
+    if (box <= last) {
+      return this.intervals[box];
+    }
+    return this.intervals[last] * Math.pow(2, box - last);
+  };
+
+  LeitnerScheduler.prototype.draw = function () {
+    if (this.pending !== null) {
+      this.schedule(this.pending, 1);
+      this.pending = null;
+    }
+    this.turn += 1;
+
+    var heap = this.heap;
+    var hasNew = this.nextNew < this.size;
+    var index;
+    if (heap.length && (heap[0][0] <= this.turn || !hasNew)) {
+      var entry = heapPop(heap);
+      if (entry[2] === this.last && (hasNew || heap.length)) {
+        if (hasNew) {
+          heapPush(heap, entry);
+          index = this.order[this.nextNew++];
+        } else {
+          index = heapReplace(heap, entry)[2];
+        }
+      } else {
+        index = entry[2];
+      }
+    } else {
+      index = this.order[this.nextNew++];
+    }
+
+    this.last = this.pending = index;
+    return index;
+  };
+
+  LeitnerScheduler.prototype.record = function (index, correct) {
+    if (index !== this.pending) {
+      return;  // Só a primeira resposta depois do sorteio conta
+    }
+    this.pending = null;
+    var box = correct ? Math.min(this.boxes[index] + 1, MAX_BOX) : 0;
+    this.boxes[index] = box;
+    this.schedule(index, this.interval(box));
+  };
+
+  LeitnerScheduler.prototype.schedule = function (index, interval) {
+    this.ties += 1;
+    heapPush(this.heap, [this.turn + interval, this.ties, index]);
+  };
+
+  LeitnerScheduler.prototype.toJSON = function () {
+    return {
+      turn: this.turn, last: this.last, pending: this.pending, boxes: this.boxes,
+      ties: this.ties, heap: this.heap, order: this.order, nextNew: this.nextNew
+    };
+  };
+
+  // --- Comparação das respostas escritas (core/answer_matching.py) ---
+
+  var OK = "ok";            // Igual
+  var ACCENT = "accent";    // Igual, a não ser por acento/maiúscula
+  var WRONG = "wrong";      // Trocada
+  var MISSING = "missing";  // Faltou
+  var EXTRA = "extra";      // Sobrou
+  var MAX_LENGTH_RATIO = 3;
+  var COMBINING = /[\u0300-\u036f]/g;
+
+  function foldChar(text) {
+    text = text.toLowerCase();
+    if (text.normalize) {
+      text = text.normalize("NFD");
+    }
+    return text.replace(COMBINING, "");
+  }
+
+  function isAlnum(c) {
+    return (c >= "0" && c <= "9") || c.toLowerCase() !== c.toUpperCase();
+  }
+
+  function keepAlnum(text) {
+    var kept = "";
+    for (var i = 0; i < text.length; i++) {
+      if (isAlnum(text.charAt(i))) {
+        kept += text.charAt(i);
+      }
+    }
+    return kept;
+  }
+
+  function splitWords(text) {
+    return text.split(/\s+/).filter(function (word) { return word; });
+  }
+
+  function fold(text) {
+    return splitWords(text)
+      .map(function (word) { return keepAlnum(foldChar(word)); })
+      .filter(function (word) { return word; })
+      .join(" ");
+  }
+
+  // As palavras do texto original que não são só pontuação
+  function answerWords(text) {
+    return splitWords(text).filter(function (word) { return keepAlnum(word); });
+  }
+
+  // Distância de edição (Levenshtein), linha a linha
+  function editDistance(a, b) {
+    var previous = range(b.length + 1);
+    for (var i = 1; i <= a.length; i++) {
+      var row = [i];
+      for (var j = 1; j <= b.length; j++) {
+        row.push(Math.min(previous[j - 1] + (a.charAt(i - 1) === b.charAt(j - 1) ? 0 : 1),
+                          previous[j] + 1, row[j - 1] + 1));
+      }
+      previous = row;
+    }
+    return previous[b.length];
+  }
+
+  // Alinha duas sequências; retorna [op, i, j] (-1 quando não se aplica)
+  function align(expected, given, cost) {
+    var n = expected.length;
+    var m = given.length;
+    var costs = expected.map(function (e) {
+      return given.map(function (g) { return cost(e, g); });
+    });
+    var dist = [];
+    var i, j;
+    for (i = 0; i <= n; i++) {
+      dist.push([i]);
+      for (j = 1; j <= m; j++) {
+        dist[i].push(i ? 0 : j);
+      }
+    }
+    for (i = 1; i <= n; i++) {
+      for (j = 1; j <= m; j++) {
+        dist[i][j] = Math.min(dist[i - 1][j - 1] + costs[i - 1][j - 1],
+                              dist[i - 1][j] + 1, dist[i][j - 1] + 1);
+      }
+    }
+
+    var ops = [];
+    i = n;
+    j = m;
+    while (i || j) {
+      if (i && j && dist[i][j] === dist[i - 1][j - 1] + costs[i - 1][j - 1]) {
+        i -= 1;
+        j -= 1;
+        ops.push([costs[i][j] === 0 ? OK : WRONG, i, j]);
+      } else if (i && dist[i][j] === dist[i - 1][j] + 1) {
+        i -= 1;
+        ops.push([MISSING, i, -1]);
+      } else {
+        j -= 1;
+        ops.push([EXTRA, -1, j]);
+      }
+    }
+    return ops.reverse();
+  }
+
+  function letterCost(a, b) {
+    return foldChar(a) === foldChar(b) ? 0 : 1;
+  }
+
+  function wordCost(a, b) {
+    if (a === b) {
+      return 0;
+    }
+    var ratio = editDistance(a, b) / Math.max(a.length, b.length);
+    return ratio <= 0.5 ? 2 * ratio : 3;
+  }
+
+  function letterDiff(expected, given) {
+    return align(expected.split(""), given.split(""), letterCost).map(function (op) {
+      var e = op[1] >= 0 ? expected.charAt(op[1]) : "";
+      var g = op[2] >= 0 ? given.charAt(op[2]) : "";
+      var kind = op[0] === OK && e.toLowerCase() !== g.toLowerCase() ? ACCENT : op[0];
+      return [kind, e, g];
+    });
+  }
+
+  function collapse(text) {
+    return splitWords(text.toLowerCase()).join(" ");
+  }
+
+  // Retorna {correct, exact, distance, words: [{op, expected, given, letters}]}
+  function matchAnswer(expectedText, answer) {
+    if (collapse(answer) === collapse(expectedText)) {
+      return { correct: true, exact: true, distance: 0, words: [] };
+    }
+
+    var folded = fold(answer);
+    var expectedFolded = fold(expectedText);
+    var correct = folded === expectedFolded;
+    var distance = correct ? 0 : editDistance(expectedFolded, folded);
+
+    if (folded.length > MAX_LENGTH_RATIO * expectedFolded.length + 10) {
+      return { correct: false, exact: false, distance: distance,
+               words: [{ op: WRONG, expected: expectedText, given: answer.trim(), letters: [] }] };
+    }
+
+    var expectedWords = answerWords(expectedText);
+    var givenWords = answerWords(answer);
+    var words = align(expectedWords.map(fold), givenWords.map(fold), wordCost).map(function (op) {
+      var e = op[1] >= 0 ? expectedWords[op[1]] : "";
+      var g = op[2] >= 0 ? givenWords[op[2]] : "";
+      if (op[0] === OK || op[0] === WRONG) {
+        var eClean = keepAlnum(e);
+        var gClean = keepAlnum(g);
+        if (op[0] === OK && eClean.toLowerCase() === gClean.toLowerCase()) {
+          return { op: OK, expected: e, given: g, letters: [] };
+        }
+        return { op: op[0] === OK ? ACCENT : WRONG, expected: e, given: g,
+                 letters: letterDiff(eClean, gClean) };
+      }
+      return { op: op[0], expected: e, given: g, letters: [] };
+    });
+
+    var exact = words.every(function (word) { return word.op === OK; });
+    return { correct: correct, exact: exact, distance: distance, words: words };
+  }
+
+  // A resposta escrita com os erros marcados (ver diagnostic_markdown)
+  function diagnostic(result, reveal) {
+    if (!result.words.length) {
+      return null;
+    }
+    var parts = [];
+    result.words.forEach(function (word, n) {
+      if (n) {
+        parts.push(" ");
+      }
+      if (word.op === OK) {
+        parts.push(word.given);
+      } else if (word.op === MISSING) {
+        parts.push(el("span", { "class": "wrong" }, reveal ? word.expected : "___"));
+      } else if ((word.op === EXTRA || word.op === WRONG) && !word.letters.length) {
+        parts.push(el("span", { "class": "extra" }, word.given));
+      } else {
+        word.letters.forEach(function (letter) {
+          var op = letter[0], e = letter[1], g = letter[2];
+          if (op === OK) {
+            parts.push(g);
+          } else if (op === ACCENT) {
+            parts.push(el("span", { "class": "accent" }, reveal ? e : g));
+          } else if (op === WRONG) {
+            parts.push(el("span", { "class": "wrong" }, reveal ? e : g));
+          } else if (op === MISSING) {
+            parts.push(el("span", { "class": "wrong" }, reveal ? e : "_"));
+          } else {
+            parts.push(el("span", { "class": "extra" }, g));
+          }
+        });
+      }
+    });
+    return el("span", null, parts);
+  }
+
+  // --- Estado dos jogos (core/game_logic.py) ---
+
+  function loadSaved(key) {
+    try {
+      var raw = window.localStorage.getItem(STORAGE_PREFIX + key);
+      return raw ? JSON.parse(raw) : null;
+    } catch (e) {
+      return null;  // Sem localStorage (ex: navegação privada)
+    }
+  }
+
+  function save(key, value) {
+    try {
+      window.localStorage.setItem(STORAGE_PREFIX + key, JSON.stringify(value));
+    } catch (e) {
+      // O sorteio continua, só não sobrevive ao fechar o app
+    }
+  }
+
+  function Game(key, challenges) {
+    this.key = key;
+    this.challenges = challenges;
+    this.index = null;     // A posição do desafio atual na lista
+    this.status = "new";   // "new", "playing", "correct", "wrong"
+    this.match = null;     // A comparação da última resposta escrita
+    this.answer = "";      // O que está no campo de resposta
+    this.random = makeRandom(DATA.seed);
+    this.selector = this.loadSelector();
+  }
+
+  // O seletor salvo, se ainda for do mesmo tipo e tamanho (senão, um novo)
+  Game.prototype.loadSelector = function () {
+    var size = this.challenges.length;
+    var saved = loadSaved(this.key);
+    if (!saved || saved.selection !== DATA.selection || saved.size !== size) {
+      saved = { selector: null };
+    }
+    if (DATA.selection === "deck") {
+      return new ShuffledDeck(size, this.random, saved.selector);
+    }
+    return new LeitnerScheduler(size, this.random, DATA.intervals, saved.selector);
+  };
+
+  Game.prototype.save = function () {
+    save(this.key, { selection: DATA.selection, size: this.challenges.length,
+                     selector: this.selector.toJSON() });
+  };
+
+  Game.prototype.current = function () {
+    return this.index === null ? null : this.challenges[this.index];
+  };
+
+  Game.prototype.newChallenge = function () {
+    this.index = this.selector.draw();
+    this.status = "playing";
+    this.match = null;
+    this.answer = "";
+    this.save();
+  };
+
+  Game.prototype.record = function (correct) {
+    this.status = correct ? "correct" : "wrong";
+    this.selector.record(this.index, correct);
+    this.save();
+  };
+
+  // Resposta escrita: sem exigir acentos, maiúsculas ou pontuação
+  Game.prototype.checkAnswer = function (answer) {
+    this.answer = answer;
+    this.match = matchAnswer(this.current().correct, answer);
+    this.record(this.match.correct);
+    return this.match.correct;
+  };
+
+  // Organizar a frase: o estado guarda só posições em challenge.words
+  // (as "fichas"), então palavras repetidas são fichas diferentes
+  function ScrambleGame(key, challenges) {
+    Game.call(this, key, challenges);
+    this.order = [];    // Fichas na ordem embaralhada dos botões
+    this.attempt = [];  // Fichas clicadas (é também a pilha do "Desfazer")
+    this.placed = {};   // Ficha -> já foi usada
+  }
+
+  ScrambleGame.prototype = Object.create(Game.prototype);
+
+  ScrambleGame.prototype.setup = function () {
+    this.newChallenge();
+    this.order = shuffle(range(this.current().words.length), this.random);
+    this.attempt = [];
+    this.placed = {};
+  };
+
+  ScrambleGame.prototype.attemptWords = function () {
+    var words = this.current().words;
+    return this.attempt.map(function (token) { return words[token]; });
+  };
+
+  ScrambleGame.prototype.buttons = function () {
+    var words = this.current().words;
+    var placed = this.placed;
+    return this.order
+      .filter(function (token) { return !placed[token]; })
+      .map(function (token) { return [token, words[token]]; });
+  };
+
+  ScrambleGame.prototype.add = function (token) {
+    if (!this.placed[token]) {
+      this.attempt.push(token);
+      this.placed[token] = true;
+      this.status = "playing";
+    }
+  };
+
+  ScrambleGame.prototype.undo = function () {
+    if (this.attempt.length) {
+      delete this.placed[this.attempt.pop()];
+      this.status = "playing";
+    }
+  };
+
+  ScrambleGame.prototype.clear = function () {
+    this.attempt = [];
+    this.placed = {};
+    this.status = "playing";
+  };
+
+  // Comparação exata, com maiúsculas
+  ScrambleGame.prototype.check = function () {
+    var correct = this.attemptWords().join(" ").trim() === this.current().correct.trim();
+    this.record(correct);
+    return correct;
+  };
+
+  var games = {};
+
+  function getGame(key) {
+    if (!games[key]) {
+      var challenges = DATA.games[key];
+      games[key] = key === "scramble_sentence"
+        ? new ScrambleGame(key, challenges) : new Game(key, challenges);
+    }
+    return games[key];
+  }
+
+  // --- Áudio ---
+
+  var player = null;
+
+  // Toca o áudio exportado; sem ele, a voz do próprio tablet (se houver)
+  function play(text) {
+    if (player) {
+      player.pause();
+    }
+    var path = DATA.audio[text];
+    if (path) {
+      player = new Audio(path);
+      var playing = player.play();
+      if (playing && playing.catch) {
+        playing.catch(function () {});
+      }
+    } else if (window.speechSynthesis && window.SpeechSynthesisUtterance) {
+      var utterance = new window.SpeechSynthesisUtterance(text);
+      utterance.lang = DATA.lang;
+      window.speechSynthesis.cancel();
+      window.speechSynthesis.speak(utterance);
+    }
+  }
+
+  // --- Telas ---
+
+  // Cria um elemento: el("button", {"class": "primary", onclick: f}, "Texto")
+  function el(tag, props, children) {
+    var node = document.createElement(tag);
+    var name;
+    for (name in props || {}) {
+      var value = props[name];
+      if (value === null || value === undefined) {
+        continue;
+      }
+      if (name.slice(0, 2) === "on") {
+        node.addEventListener(name.slice(2), value);
+      } else if (name === "class") {
+        node.className = value;
+      } else if (name in node) {
+        node[name] = value;
+      } else {
+        node.setAttribute(name, value);
+      }
+    }
+    [].concat(children === undefined ? [] : children).forEach(function (child) {
+      if (child !== null && child !== undefined && child !== false) {
+        node.appendChild(typeof child === "string" ? document.createTextNode(child) : child);
+      }
+    });
+    return node;
+  }
+
+  function notice(kind, children) {
+    return el("div", { "class": "alert " + kind }, children);
+  }
+
+  function strong(text) {
+    return el("strong", null, text);
+  }
+
+  function image(path, missing) {
+    return path ? el("img", { src: path, alt: "" }) : notice("error", missing);
+  }
+
+  function button(label, onclick, props) {
+    props = props || {};
+    props.type = "button";
+    props.onclick = onclick;
+    return el("button", props, label);
+  }
+
+  // Executa uma ação e redesenha a tela (como o st.rerun)
+  function action(fn) {
+    return function () {
+      fn.apply(null, arguments);
+      refresh();
+    };
+  }
+
+  function balloons() {
+    var box = document.getElementById("balloons");
+    for (var i = 0; i < 20; i++) {
+      var balloon = el("span", null, "🎈");
+      balloon.style.left = Math.floor(Math.random() * 95) + "%";
+      balloon.style.animationDelay = (Math.random() * 0.8).toFixed(2) + "s";
+      box.appendChild(balloon);
+    }
+    setTimeout(function () { box.innerHTML = ""; }, 4000);
+  }
+
+  var ui = { letter: null, consonant: null, vowel: null, syllableCheered: null };
+
+  function renderHome() {
+    return [
+      el("h1", null, "🌟 Bem-vinda ao App de Aprendizagem! 🌟"),
+      el("h2", null, "Olá, Paulinha! Vamos aprender juntos?"),
+      DATA.home_image ? el("img", { src: DATA.home_image, alt: "" }) : null,
+      notice("info", "Use o menu acima para escolher uma atividade legal!"),
+      button("Começar a Aventura! 🎉", balloons)
+    ];
+  }
+
+  // Módulo 1: Conhecendo as Letras
+  function renderLetters() {
+    var letters = DATA.letters;
+    var data = letters[0];
+    letters.forEach(function (item) {
+      if (item.letter === ui.letter) {
+        data = item;
+      }
+    });
+    ui.letter = data.letter;
+
+    var select = el("select", { id: "letter", onchange: action(function (event) {
+      ui.letter = event.target.value;
+    }) }, letters.map(function (item) {
+      return el("option", { value: item.letter }, item.letter);
+    }));
+    select.value = data.letter;
+
+    return [
+      el("h1", null, "🅰️ Conhecendo as Letras e os Sons"),
+      el("p", null, "Escolha uma letra para ver e ouvir o que ela representa!"),
+      el("label", { htmlFor: "letter" }, "Selecione uma letra:"),
+      select,
+      el("div", { "class": "big" }, data.letter),
+      el("h2", { "class": "center" }, "é de... " + data.word + " " + data.emoji),
+      data.image ? el("img", { src: data.image, alt: data.word })
+        : notice("warning", "Imagem de " + data.word + " não encontrada."),
+      el("hr"),
+      el("div", { "class": "row" }, [
+        button("Ouvir o som da letra '" + data.letter + "'", function () { play(data.letter); }),
+        button("Ouvir a palavra '" + data.word + "'", function () { play(data.word); })
+      ])
+    ];
+  }
+
+  function radios(name, options, selected, onchange) {
+    return el("div", { "class": "choices" }, options.map(function (option) {
+      return el("label", null, [
+        el("input", { type: "radio", name: name, value: option,
+                      checked: option === selected, onchange: action(function () {
+                        onchange(option);
+                      }) }),
+        option
+      ]);
+    }));
+  }
+
+  // Módulo 2: Formando Sílabas
+  function renderSyllables() {
+    ui.consonant = ui.consonant || DATA.consonants[0];
+    ui.vowel = ui.vowel || DATA.vowels[0];
+    var syllable = ui.consonant + ui.vowel;
+
+    return [
+      el("h1", null, "🔡 Vamos Formar Sílabas com Som!"),
+      el("p", null, "Escolha uma consoante e uma vogal para ver a mágica acontecer."),
+      el("div", { "class": "columns" }, [
+        el("div", null, [
+          el("h2", null, "Consoantes"),
+          radios("consonant", DATA.consonants, ui.consonant,
+                 function (option) { ui.consonant = option; })
+        ]),
+        el("div", null, [
+          el("h2", null, "Vogais"),
+          radios("vowel", DATA.vowels, ui.vowel, function (option) { ui.vowel = option; })
+        ])
+      ]),
+      el("hr"),
+      el("div", { "class": "big" }, syllable),
+      button("🔊 Ouvir '" + syllable + "'", function () { play(syllable); }),
+      button("Adorei formar esta sílaba! 🎉", action(function () {
+        ui.syllableCheered = syllable;
+        balloons();
+      })),
+      ui.syllableCheered === syllable
+        ? notice("success", "EBA! Parabéns por formar a sílaba '" + syllable + "'!") : null
+    ];
+  }
+
+  // Módulo 3: Complete a Palavra
+  function renderCompleteWord() {
+    var game = getGame("complete_word");
+    if (game.status === "new") {
+      game.newChallenge();
+    }
+    var challenge = game.current();
+    var status = game.status;
+
+    var view = [el("h1", null, "🧩 Complete a Palavra")];
+    if (challenge.image !== undefined) {
+      view.push(el("h3", null, "O que você vê na imagem? Complete a palavra:"));
+      view.push(image(challenge.image, "Imagem de " + challenge.full_word + " não encontrada."));
+    } else {
+      // Desafios gerados do léxico podem não ter imagem: a palavra é ouvida
+      view.push(el("h3", null, "Ouça a palavra e complete:"));
+      view.push(button("🔊 Ouvir a palavra", function () { play(challenge.full_word); }));
+    }
+    view.push(el("div", { "class": "prompt" }, challenge.prompt));
+    view.push(el("hr"));
+    view.push(el("p", null, "Clique na sílaba correta:"));
+    view.push(el("div", { "class": "row" }, challenge.options.map(function (option) {
+      return button(option, action(function () {
+        if (game.checkAnswer(option)) {
+          balloons();
+          play(challenge.full_word);
+        }
+      }), { disabled: status === "correct" });
+    })));
+
+    if (status === "correct") {
+      view.push(notice("success", [strong("ISSO AÍ!"), " Você formou a palavra ",
+                                  strong(challenge.full_word), "!"]));
+      view.push(button("Próxima Palavra ➔", action(function () { game.newChallenge(); }),
+                       { "class": "primary" }));
+    } else if (status === "wrong") {
+      view.push(notice("error", "Ops! Tente de novo. Você consegue!"));
+    }
+    return view;
+  }
+
+  // Campo de resposta escrita dos módulos 4 e 6
+  function answerForm(game, label, placeholder, submitLabel, onCorrect) {
+    var input = el("input", { type: "text", id: game.key + "_answer", value: game.answer,
+                              placeholder: placeholder, autocomplete: "off",
+                              autocapitalize: "off", spellcheck: false,
+                              disabled: game.status === "correct" });
+    return el("form", { onsubmit: action(function (event) {
+      event.preventDefault();
+      if (game.checkAnswer(input.value)) {
+        balloons();
+        onCorrect();
+      }
+    }) }, [
+      el("label", { htmlFor: input.id }, label),
+      input,
+      el("button", { type: "submit", disabled: game.status === "correct" }, submitLabel)
+    ]);
+  }
+
+  function wrongHint(game) {
+    var hint = diagnostic(game.match);
+    return hint ? el("p", null, ["Você escreveu: ", hint]) : null;
+  }
+
+  // Módulo 4: O que é isso?
+  function renderImageToWord() {
+    var game = getGame("image_to_word");
+    if (game.status === "new") {
+      game.newChallenge();
+    }
+    var challenge = game.current();
+
+    var view = [
+      el("h1", null, "🖼️ O que é isso?"),
+      el("h3", null, "Olhe a imagem e escreva o nome dela abaixo:"),
+      image(challenge.image, "Imagem do desafio não encontrada."),
+      answerForm(game, "Escreva sua resposta aqui:", "Digite a palavra...",
+                 "Verificar Resposta ✅", function () { play(challenge.correct); })
+    ];
+
+    if (game.status === "correct") {
+      view.push(notice("success", [strong("PERFEITO!"), " Você escreveu ",
+                                  strong(challenge.correct), " corretamente!"]));
+      if (game.match && !game.match.exact) {
+        // Certo, mas sem os acentos: mostra como se escreve
+        view.push(notice("info", ["Repare nos acentos: escrevemos ",
+                                 strong(challenge.correct), "."]));
+      }
+      view.push(button("Próxima Imagem ➔", action(function () { game.newChallenge(); }),
+                       { "class": "primary" }));
+    } else if (game.status === "wrong") {
+      view.push(notice("error", "Ops, não foi bem isso. Tente de novo! Você consegue!"));
+      view.push(wrongHint(game));
+    }
+    return view;
+  }
+
+  // Módulo 5: Organize a Frase
+  var WORDS_PER_ROW = 6;
+
+  function renderScramble() {
+    var game = getGame("scramble_sentence");
+    if (game.status === "new") {
+      game.setup();
+    }
+    var challenge = game.current();
+    var status = game.status;
+    var attempt = game.attemptWords();
+    var remaining = game.buttons();
+
+    var view = [
+      el("h1", null, "✍️ Organize a Frase"),
+      el("h3", null, "Olhe a imagem e clique nas palavras na ordem certa:"),
+      image(challenge.image, "Imagem do desafio não encontrada."),
+      el("hr"),
+      attempt.length ? el("div", { "class": "attempt" }, attempt.join(" "))
+        : notice("info", "Clique nos botões abaixo para montar sua frase aqui..."),
+      el("hr")
+    ];
+
+    for (var start = 0; start < remaining.length; start += WORDS_PER_ROW) {
+      view.push(el("div", { "class": "row" },
+                   remaining.slice(start, start + WORDS_PER_ROW).map(function (item) {
+                     return button(item[1], action(function () { game.add(item[0]); }));
+                   })));
+    }
+
+    // Só mostra "Verificar" se o usuário usou todas as palavras
+    if (!remaining.length && status === "playing") {
+      view.push(button("Verificar Frase ✅", action(function () {
+        if (game.check()) {
+          balloons();
+          play(challenge.correct);
+        }
+      }), { "class": "primary" }));
+    }
+    if (attempt.length && status === "playing") {
+      view.push(el("div", { "class": "row" }, [
+        button("Desfazer ↩️", action(function () { game.undo(); })),
+        button("Limpar ❌", action(function () { game.clear(); }))
+      ]));
+    }
+
+    if (status === "correct") {
+      view.push(notice("success", [strong("EXCELENTE!"), " A frase está correta: ",
+                                  strong(challenge.correct)]));
+      view.push(button("Próxima Frase ➔", action(function () { game.setup(); }),
+                       { "class": "primary" }));
+    } else if (status === "wrong") {
+      view.push(notice("error", "Ops! Essa não é a ordem correta. Tente de novo!"));
+      view.push(el("div", { "class": "row" }, [
+        button("Tentar Novamente 🔄", action(function () { game.clear(); })),
+        button("Desfazer ↩️", action(function () { game.undo(); }))
+      ]));
+    }
+    return view;
+  }
+
+  // Módulo 6: Ditado de Frases
+  function renderDictation() {
+    var game = getGame("dictation");
+    if (game.status === "new") {
+      game.newChallenge();
+    }
+    var challenge = game.current();
+
+    var view = [
+      el("h1", null, "🗣️ Ditado de Frases"),
+      el("h3", null, "Ouça a frase e escreva o que você ouviu:"),
+      challenge.image ? el("img", { src: challenge.image, alt: "" })
+        : notice("warning", "Imagem de dica não encontrada."),
+      button("Ouvir a frase 🔊", function () { play(challenge.sentence); }),
+      answerForm(game, "Escreva a frase aqui:", "", "Verificar Ditado ✅", function () {})
+    ];
+
+    if (game.status === "correct") {
+      view.push(notice("success", [strong("MUITO BEM!"), " Você escreveu: ",
+                                  strong(challenge.correct)]));
+      if (game.match && !game.match.exact) {
+        view.push(notice("info", ["Repare nos acentos: ", diagnostic(game.match, true)]));
+      }
+      view.push(button("Próximo Ditado ➔", action(function () { game.newChallenge(); }),
+                       { "class": "primary" }));
+    } else if (game.status === "wrong") {
+      view.push(notice("error", "Quase! Ouça de novo e tente corrigir."));
+      view.push(wrongHint(game));
+    }
+    return view;
+  }
+
+  // --- Navegação (#/1 ... #/6) ---
+
+  var SCREENS = {
+    "": renderHome,
+    "1": renderLetters,
+    "2": renderSyllables,
+    "3": renderCompleteWord,
+    "4": renderImageToWord,
+    "5": renderScramble,
+    "6": renderDictation
+  };
+
+  function currentScreen() {
+    var name = window.location.hash.replace(/^#\/?/, "");
+    return SCREENS.hasOwnProperty(name) ? name : "";
+  }
+
+  function refresh() {
+    var root = document.getElementById("app");
+    var focused = document.activeElement && document.activeElement.id;
+    root.innerHTML = "";
+    SCREENS[currentScreen()]().forEach(function (node) {
+      if (node) {
+        root.appendChild(node);
+      }
+    });
+    // Mantém o teclado aberto no campo de resposta depois de um erro
+    var field = focused && document.getElementById(focused);
+    if (field && !field.disabled && field.tagName === "INPUT" && field.type === "text") {
+      field.focus();
+    }
+  }
+
+  function route() {
+    var name = currentScreen();
+    var links = document.querySelectorAll("#menu a");
+    for (var i = 0; i < links.length; i++) {
+      links[i].className = links[i].getAttribute("href") === "#/" + name ? "active" : "";
+    }
+    refresh();
+    window.scrollTo(0, 0);
+  }
+
+  window.addEventListener("hashchange", route);
+  route();
+})();
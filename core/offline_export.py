@@ -0,0 +1,255 @@
+"""Módulo da versão offline do app (HTML/JS estático).
+
+Muitas salas de aula não têm uma conexão confiável com o servidor. A
+exportação gera uma pasta que funciona sozinha, aberta direto do disco
+(`index.html`, sem servidor e sem internet), com os módulos 1 a 6:
+
+- o conteúdo do `data_manager` vai em um `data.js` (um script, e não
+  um JSON baixado com `fetch`, que os navegadores bloqueiam em arquivos
+  locais);
+- os áudios saem do pacote de áudio e do cache em disco (ver
+  `core.audio_pack`), um arquivo por conteúdo (`audio/<hash>.mp3`);
+- as imagens são as versões redimensionadas de `core.image_utils`;
+- a lógica dos jogos (`core.game_logic`, com o sorteio de
+  `core.sampler`/`core.scheduler` e a comparação de respostas de
+  `core.answer_matching`) roda no navegador, em `offline_app/app.js`.
+  O estado da repetição espaçada fica no `localStorage` do tablet.
+
+Uma mesma exportação serve qualquer número de tablets (ex: copiada por
+um pendrive). O painel do professor não faz parte dela: as respostas
+ficam só no tablet.
+
+Uso:
+    python -m core.offline_export                      # gera em dist/offline
+    python -m core.offline_export --output /mnt/pendrive/alfabetizacao
+    python -m core.offline_export --synthesize         # também gera os áudios que faltam
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set
+
+from core import config
+from core import data_manager
+from core.audio_pack import collect_speakable_texts
+
+# Os arquivos do app (HTML, JS e CSS), copiados como estão
+APP_DIR = Path(__file__).resolve().parent / "offline_app"
+APP_FILES = ("index.html", "app.js", "style.css")
+
+# O conteúdo exportado: `window.ALFABETIZACAO = {...};`
+DATA_FILE = "data.js"
+AUDIO_DIR = "audio"
+IMAGE_DIR = "images"
+
+# A imagem da página inicial
+HOME_IMAGE = "assets/images/paulinha.jpg"
+
+
+def collect_offline_content() -> Dict[str, Any]:
+    """Junta o conteúdo dos módulos 1 a 6, como as páginas o usam.
+
+    Returns:
+        Um dicionário com as letras, as sílabas e os desafios de cada
+        jogo (os itens do catálogo, com os caminhos originais das imagens).
+    """
+    return {
+        "letters": list(data_manager.LETTER_EXAMPLES.values()),
+        "consonants": list(data_manager.SYLLABLE_CONSONANTS),
+        "vowels": list(data_manager.SYLLABLE_VOWELS),
+        "games": {
+            "complete_word": data_manager.COMPLETE_WORD_CHALLENGES,
+            "image_to_word": data_manager.IMAGE_TO_WORD_CHALLENGES,
+            "scramble_sentence": data_manager.SENTENCE_SCRAMBLE_CHALLENGES,
+            "dictation": data_manager.DICTATION_CHALLENGES,
+        },
+    }
+
+
+def _copy(source: Path, target: Path):
+    """Copia um arquivo, a não ser que o destino já seja igual (tamanho e data)."""
+    try:
+        source_stat, target_stat = source.stat(), target.stat()
+        if (source_stat.st_size == target_stat.st_size
+                and int(source_stat.st_mtime) == int(target_stat.st_mtime)):
+            return
+    except FileNotFoundError:
+        pass
+    shutil.copy2(source, target)
+
+
+def _write(target: Path, data: bytes):
+    """Grava um arquivo por um temporário (ninguém lê um arquivo pela metade)."""
+    if target.exists() and target.stat().st_size == len(data) and target.read_bytes() == data:
+        return
+    tmp_path = target.with_name(f".{target.name}.tmp")
+    tmp_path.write_bytes(data)
+    os.replace(tmp_path, target)
+
+
+def _export_images(content: Dict[str, Any], output_dir: Path,
+                   written: Set[Path]) -> Dict[str, Optional[str]]:
+    """Copia as imagens usadas pelo conteúdo.
+
+    Returns:
+        Um dicionário caminho original -> caminho no pacote (relativo a
+        `index.html`), ou None se a imagem não existir.
+    """
+    from core.image_utils import image_file
+
+    paths = [HOME_IMAGE] + [item.get("image") for item in content["letters"]]
+    for items in content["games"].values():
+        paths.extend(item.get("image") for item in items)
+
+    images: Dict[str, Optional[str]] = {}
+    for path in dict.fromkeys(p for p in paths if p):
+        source = image_file(path)
+        if source is None:
+            images[path] = None
+            continue
+        target = output_dir / IMAGE_DIR / source.name
+        _copy(source, target)
+        written.add(target)
+        images[path] = f"{IMAGE_DIR}/{source.name}"
+    return images
+
+
+def _export_audio(texts: List[str], output_dir: Path, synthesize: bool,
+                  written: Set[Path]) -> Dict[str, str]:
+    """Grava os áudios dos textos falados pelo app.
+
+    Cada áudio é gravado uma vez, com o hash do conteúdo no nome (textos
+    com o mesmo áudio dividem o arquivo).
+
+    Returns:
+        Um dicionário texto -> caminho no pacote. Textos sem áudio ficam
+        de fora (o app usa a voz do próprio tablet, se houver).
+    """
+    from core.audio_cache import get_audio_cache
+    from core.audio_utils import audio_cache_key, fetch_audio
+
+    lang, voice = config.TTS_LANG, config.TTS_VOICE or None
+    cache = get_audio_cache()
+    audio: Dict[str, str] = {}
+    for text in texts:
+        if synthesize:
+            try:
+                data = fetch_audio(text, lang, False, voice)
+            except Exception:
+                continue
+        else:
+            data = cache.get(audio_cache_key(text, lang, False, voice))
+            if data is None:
+                continue
+        suffix = ".wav" if data[:4] == b"RIFF" else ".mp3"
+        name = hashlib.blake2b(data, digest_size=16).hexdigest() + suffix
+        target = output_dir / AUDIO_DIR / name
+        if target not in written:
+            _write(target, data)
+            written.add(target)
+        audio[text] = f"{AUDIO_DIR}/{name}"
+    return audio
+
+
+def _with_image(item: Dict[str, Any], images: Dict[str, Optional[str]]) -> Dict[str, Any]:
+    """Uma cópia do item com o caminho da imagem no pacote."""
+    item = dict(item)
+    if "image" in item:
+        item["image"] = images.get(item["image"])
+    return item
+
+
+def export_offline(output_dir: Optional[Path] = None,
+                   synthesize: bool = False) -> Dict[str, int]:
+    """Gera (ou atualiza) a versão offline do app.
+
+    Arquivos de áudio e imagem de exportações anteriores que não são
+    mais usados são apagados; o resto da pasta não é tocado.
+
+    Args:
+        output_dir: A pasta da versão offline (padrão: `config.OFFLINE_EXPORT_DIR`).
+        synthesize: Se True, gera os áudios que não estão no pacote nem
+                    no disco (vai à internet com o gTTS).
+
+    Returns:
+        Um resumo: textos com e sem áudio, imagens e o tamanho da pasta.
+    """
+    output_dir = Path(output_dir or config.OFFLINE_EXPORT_DIR)
+    for folder in (output_dir, output_dir / AUDIO_DIR, output_dir / IMAGE_DIR):
+        folder.mkdir(parents=True, exist_ok=True)
+
+    content = collect_offline_content()
+    texts = collect_speakable_texts()
+    written: Set[Path] = set()
+    images = _export_images(content, output_dir, written)
+    audio = _export_audio(texts, output_dir, synthesize, written)
+
+    games = {key: [_with_image(item, images) for item in items]
+             for key, items in content["games"].items()}
+    payload = {
+        "home_image": images.get(HOME_IMAGE),
+        "letters": [_with_image(item, images) for item in content["letters"]],
+        "consonants": content["consonants"],
+        "vowels": content["vowels"],
+        "games": games,
+        "audio": audio,
+        # O sorteio funciona como no servidor (ver `core.game_logic`)
+        "selection": config.CHALLENGE_SELECTION,
+        "intervals": list(config.LEITNER_INTERVALS),
+        "seed": config.CHALLENGE_SEED,
+        "lang": config.TTS_LANG,
+    }
+    data = json.dumps(payload, ensure_ascii=False, separators=(",", ":"), sort_keys=True)
+    script = f"window.ALFABETIZACAO = {data};\n"
+    _write(output_dir / DATA_FILE, script.encode("utf-8"))
+
+    for name in APP_FILES:
+        _copy(APP_DIR / name, output_dir / name)
+
+    # Áudios e imagens que não fazem mais parte do conteúdo
+    for folder in (AUDIO_DIR, IMAGE_DIR):
+        for path in (output_dir / folder).iterdir():
+            if path.is_file() and path not in written:
+                path.unlink()
+
+    return {
+        "texts": len(texts),
+        "audio": len(audio),
+        "missing_audio": len(texts) - len(audio),
+        "images": sum(1 for path in images.values() if path),
+        "missing_images": sum(1 for path in images.values() if not path),
+        "bytes": sum(p.stat().st_size for p in output_dir.rglob("*") if p.is_file()),
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Ponto de entrada da linha de comando."""
+    parser = argparse.ArgumentParser(
+        description="Gera a versão offline do app (HTML/JS, sem servidor)."
+    )
+    parser.add_argument("--output", type=Path, default=config.OFFLINE_EXPORT_DIR,
+                        help="Pasta da versão offline (padrão: %(default)s)")
+    parser.add_argument("--synthesize", action="store_true",
+                        help="Gera os áudios que faltam (usa a internet)")
+    args = parser.parse_args(argv)
+
+    summary = export_offline(args.output, args.synthesize)
+    print(f"Versão offline em {args.output / 'index.html'} "
+          f"({summary['bytes'] // 1024} KB).")
+    print(f"{summary['audio']} de {summary['texts']} textos com áudio, "
+          f"{summary['images']} imagens.")
+    if summary["missing_audio"]:
+        print(f"{summary['missing_audio']} textos sem áudio usarão a voz do tablet "
+              "(gere o pacote com `python -m core.audio_pack` ou use --synthesize).")
+    if summary["missing_images"]:
+        print(f"{summary['missing_images']} imagens não encontradas.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,248 @@
+"""Módulo do registro de progresso das crianças.
+
+Cada resposta verificada nos jogos vira uma linha em um banco SQLite
+(quem respondeu, jogo, desafio, resposta, se acertou e em quanto
+tempo), para que o progresso não se perca quando a aba é fechada.
+
+Com dezenas de crianças respondendo ao mesmo tempo, a verificação da
+resposta não pode esperar o disco. Por isso a gravação é "atrasada":
+1.  `record_attempt` só coloca a tentativa em uma fila na memória
+    (microssegundos, nunca bloqueia).
+2.  Uma thread de fundo tira as tentativas da fila e grava em lotes,
+    uma transação por lote.
+3.  O banco usa o modo WAL, então leituras (ex: o painel do professor)
+    não bloqueiam a gravação, e vice-versa.
+"""
+
+import atexit
+import queue
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, NamedTuple, Optional
+
+from core import config
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS attempts (
+    id INTEGER PRIMARY KEY,
+    created_at REAL NOT NULL,
+    learner TEXT NOT NULL,
+    game_key TEXT NOT NULL,
+    challenge_id TEXT NOT NULL,
+    answer TEXT NOT NULL,
+    correct INTEGER NOT NULL,
+    latency_ms INTEGER
+);
+CREATE INDEX IF NOT EXISTS attempts_learner_game
+    ON attempts (learner, game_key, created_at);
+"""
+
+_INSERT = (
+    "INSERT INTO attempts (created_at, learner, game_key, challenge_id,"
+    " answer, correct, latency_ms) VALUES (?, ?, ?, ?, ?, ?, ?)"
+)
+
+
+class Attempt(NamedTuple):
+    """Uma resposta verificada em um jogo."""
+    created_at: float  # Horário (time.time())
+    learner: str
+    game_key: str
+    challenge_id: str
+    answer: str
+    correct: bool
+    latency_ms: Optional[int]  # Do sorteio do desafio até a resposta
+
+
+def connect(path: Path) -> sqlite3.Connection:
+    """Abre o banco para gravação em modo WAL, criando a tabela se preciso.
+
+    Usado só pela thread de gravação, uma vez; para ler, use `open_readonly`.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    connection = sqlite3.connect(str(path), timeout=30)
+    connection.execute("PRAGMA journal_mode=WAL")
+    # Com WAL, NORMAL só sincroniza o disco nos checkpoints: uma queda de
+    # energia pode perder os últimos lotes, mas nunca corrompe o banco
+    connection.execute("PRAGMA synchronous=NORMAL")
+    connection.executescript(_SCHEMA)
+    return connection
+
+
+def open_readonly(path: Path) -> sqlite3.Connection:
+    """Abre um banco já criado só para leitura.
+
+    Não muda o modo do banco nem roda o `CREATE TABLE` (que pegaria o lock
+    de escrita a cada leitura): o banco e a tabela são criados pela thread
+    de gravação.
+    """
+    uri = Path(path).resolve().as_uri() + "?mode=ro"
+    return sqlite3.connect(uri, uri=True, timeout=30)
+
+
+class ProgressStore:
+    """Fila de tentativas com uma thread que grava em lotes no SQLite."""
+
+    def __init__(self, path: Path, batch_size: int = 200,
+                 flush_interval: float = 0.5, max_pending: int = 100_000):
+        """Prepara o registro (a thread e o banco só começam no 1º uso).
+
+        Args:
+            path: O arquivo do banco SQLite.
+            batch_size: Quantas tentativas, no máximo, por transação.
+            flush_interval: Quanto tempo (s) a thread espera juntando um
+                            lote antes de gravar o que já tem.
+            max_pending: Tamanho máximo da fila; se o disco não der
+                         conta, as tentativas excedentes são descartadas
+                         (e contadas) em vez de bloquear os jogos.
+        """
+        self.path = Path(path)
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = flush_interval
+        self._queue: "queue.Queue[Any]" = queue.Queue(max_pending)
+        self._writer: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self.written = 0
+        self.dropped = 0
+        self.errors = 0
+        self.last_error: Optional[str] = None
+
+    def record_attempt(self, learner: str, game_key: str, challenge_id: str,
+                       answer: str, correct: bool,
+                       latency_ms: Optional[int] = None):
+        """Coloca uma tentativa na fila de gravação (nunca bloqueia)."""
+        self._start_writer()
+        attempt = Attempt(time.time(), learner, game_key, challenge_id,
+                          answer, bool(correct), latency_ms)
+        try:
+            self._queue.put_nowait(attempt)
+        except queue.Full:
+            self.dropped += 1
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Espera a thread gravar tudo o que já está na fila.
+
+        Returns:
+            True se a fila foi gravada dentro do prazo (False também se
+            a fila estiver cheia durante todo o prazo).
+        """
+        if self._writer is None:
+            return True
+        done = threading.Event()
+        deadline = None if timeout is None else time.monotonic() + timeout
+        try:
+            self._queue.put(done, timeout=timeout)
+        except queue.Full:
+            return False
+        if deadline is not None:
+            timeout = max(0.0, deadline - time.monotonic())
+        return done.wait(timeout)
+
+    def attempts(self, learner: Optional[str] = None,
+                 game_key: Optional[str] = None,
+                 since_id: int = 0) -> List[Dict[str, Any]]:
+        """Lê as tentativas já gravadas (com uma conexão própria).
+
+        Args:
+            learner: Filtra por criança (None = todas).
+            game_key: Filtra por jogo (None = todos).
+            since_id: Só as tentativas com `id` maior que este, para
+                      leituras incrementais.
+
+        Returns:
+            As tentativas em ordem de gravação, como dicionários.
+        """
+        if not self.path.exists():
+            return []
+        query = "SELECT * FROM attempts WHERE id > ?"
+        params: List[Any] = [since_id]
+        if learner is not None:
+            query += " AND learner = ?"
+            params.append(learner)
+        if game_key is not None:
+            query += " AND game_key = ?"
+            params.append(game_key)
+        connection = open_readonly(self.path)
+        try:
+            connection.row_factory = sqlite3.Row
+            rows = connection.execute(query + " ORDER BY id", params).fetchall()
+        finally:
+            connection.close()
+        return [dict(row) for row in rows]
+
+    def stats(self) -> Dict[str, int]:
+        """Retorna os contadores de gravação (gravadas, na fila, descartadas, erros)."""
+        return {
+            "written": self.written,
+            "pending": self._queue.qsize(),
+            "dropped": self.dropped,
+            "errors": self.errors,
+        }
+
+    def _start_writer(self):
+        if self._writer is None:
+            with self._lock:
+                if self._writer is None:
+                    writer = threading.Thread(target=self._write_loop,
+                                              name="progress-writer", daemon=True)
+                    writer.start()
+                    self._writer = writer
+                    atexit.register(self.flush, 5.0)
+
+    def _write_loop(self):
+        connection = None
+        while True:
+            # Espera a 1ª tentativa e junta o que chegar em seguida no lote
+            batch: List[Attempt] = []
+            waiters: List[threading.Event] = []
+            item = self._queue.get()
+            deadline = time.monotonic() + self.flush_interval
+            while True:
+                if isinstance(item, threading.Event):
+                    waiters.append(item)
+                    # Um flush grava o que já chegou sem esperar o prazo
+                    deadline = 0
+                else:
+                    batch.append(item)
+                if len(batch) >= self.batch_size:
+                    break
+                try:
+                    item = self._queue.get(timeout=max(0, deadline - time.monotonic()))
+                except queue.Empty:
+                    break
+
+            if batch:
+                try:
+                    if connection is None:
+                        connection = connect(self.path)
+                    with connection:
+                        connection.executemany(_INSERT, batch)
+                    self.written += len(batch)
+                except sqlite3.Error as e:
+                    # O lote é perdido, mas os jogos continuam funcionando
+                    self.errors += 1
+                    self.last_error = str(e)
+                    if connection is not None:
+                        connection.close()
+                    connection = None
+            for waiter in waiters:
+                waiter.set()
+
+
+_store: Optional[ProgressStore] = None
+_store_lock = threading.Lock()
+
+
+def get_progress_store() -> Optional[ProgressStore]:
+    """Retorna o registro único do processo (None se desativado na config)."""
+    global _store
+    if _store is None and config.PROGRESS_DB:
+        with _store_lock:
+            if _store is None:
+                _store = ProgressStore(config.PROGRESS_DB,
+                                       config.PROGRESS_BATCH_SIZE,
+                                       config.PROGRESS_FLUSH_INTERVAL)
+    return _store
@@ -0,0 +1,85 @@
+"""Módulo de sorteio de desafios sem repetição ("baralho embaralhado").
+
+Em vez de sortear um desafio qualquer a cada vez (e tentar de novo
+enquanto vier o mesmo), os índices dos desafios são embaralhados uma
+vez, como um baralho, e tirados um a um. Assim:
+
+1.  Cada sorteio custa O(1) e nunca precisa de novas tentativas.
+2.  Todos os desafios aparecem antes de qualquer um se repetir.
+3.  Ao reembaralhar, o primeiro da nova rodada nunca é o último da
+    anterior (sem repetição na "emenda").
+
+O estado guardado é só um vetor compacto de inteiros e um gerador aleatório,
+que pode receber uma semente para que a sequência seja reproduzível.
+"""
+
+import random
+from array import array
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+
+class ShuffledDeck:
+    """Baralho de índices `0..size-1`, reembaralhado ao terminar."""
+
+    def __init__(self, size: int, rng: Optional[random.Random] = None):
+        """Cria o baralho.
+
+        Args:
+            size: A quantidade de desafios.
+            rng: O gerador aleatório (ex: `random.Random(semente)`).
+                 Se None, usa um gerador com semente aleatória.
+        """
+        if size < 1:
+            raise ValueError("O baralho precisa de pelo menos um item.")
+        self.size = size
+        self.rng = rng or random.Random()
+        self.last: Optional[int] = None
+        # Inteiros de 32 bits compactos, não uma lista de objetos int
+        self._order = array("I", range(size))
+        self._position = size  # Força o embaralhamento no primeiro sorteio
+
+    def _reshuffle(self):
+        self.rng.shuffle(self._order)
+        self._position = 0
+        # Evita repetir o último item da rodada anterior logo na emenda
+        if self.size > 1 and self._order[0] == self.last:
+            swap = self.rng.randrange(1, self.size)
+            self._order[0], self._order[swap] = self._order[swap], self._order[0]
+
+    def draw(self) -> int:
+        """Tira o próximo índice do baralho (O(1) amortizado)."""
+        if self._position >= self.size:
+            self._reshuffle()
+        index = self._order[self._position]
+        self._position += 1
+        self.last = index
+        return index
+
+    def record(self, index: int, correct: bool):
+        """Ignora o resultado: o baralho não depende do histórico.
+
+        Existe para que o baralho e a repetição espaçada
+        (`core.scheduler`) possam ser usados da mesma forma.
+        """
+
+    def replay(self, history: Iterable[Tuple[int, bool]]):
+        """Ignora respostas antigas, como `record`."""
+
+    def remapped(self, size: int, mapping: Sequence[Optional[int]]) -> "ShuffledDeck":
+        """Cria um baralho novo para um conteúdo que mudou.
+
+        O baralho não guarda histórico; só o último índice é levado, para
+        não repetir o desafio que acabou de sair.
+        """
+        deck = ShuffledDeck(size, self.rng)
+        if self.last is not None:
+            deck.last = mapping[self.last]
+        return deck
+
+    def peek(self, count: int) -> List[int]:
+        """Mostra os próximos índices da rodada atual, sem tirá-los.
+
+        Se a rodada estiver no fim, retorna menos de `count` itens (a
+        ordem da próxima rodada ainda não foi sorteada).
+        """
+        return self._order[self._position:self._position + count].tolist()
@@ -0,0 +1,232 @@
+"""Módulo de repetição espaçada (sistema de Leitner).
+
+Em vez de sortear desafios sem olhar o histórico, cada desafio fica em
+uma "caixa" de Leitner. Acertar move o desafio para a caixa seguinte,
+que volta a aparecer mais tarde; errar o devolve à primeira caixa, que
+volta logo. Assim a criança revê mais o que ainda não domina.
+
+O tempo é contado em "rodadas" (sorteios do jogo), não em relógio:
+uma pausa no meio da aula não faz todas as revisões vencerem juntas.
+
+Os desafios já vistos ficam em uma fila de prioridade (heap) ordenada
+pela rodada em que vencem, então escolher o próximo custa O(log n) mesmo
+com milhares de desafios. Os ainda não vistos esperam em uma ordem
+embaralhada e entram sempre que nenhuma revisão estiver vencida.
+
+O estado da sessão cresce com o tamanho do catálogo: a caixa de cada
+desafio e a ordem dos novos ficam em vetores compactos (`array`, como
+no `core.sampler`), 5 bytes por desafio (~25 KB para 5 mil desafios,
+ver `benchmarks.session_memory`). Só o heap cresce com o que a criança
+praticou.
+"""
+
+import heapq
+import random
+from array import array
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+# Intervalo (em rodadas) até o desafio voltar, para cada caixa. Errar
+# leva à caixa 0; cada acerto avança uma caixa. Depois da última, o
+# intervalo continua dobrando a cada acerto: sem isso, os desafios já
+# dominados ocupariam todas as rodadas e nenhum desafio novo entraria.
+DEFAULT_INTERVALS: Tuple[int, ...] = (2, 4, 8, 16, 32)
+
+# Caixa máxima (o intervalo para de dobrar a partir daqui)
+MAX_BOX = 30
+
+# Item da fila: (rodada em que vence, desempate, índice do desafio)
+_Entry = Tuple[int, int, int]
+
+
+class LeitnerScheduler:
+    """Fila de revisão de um jogo para uma criança."""
+
+    def __init__(self, size: int, rng: Optional[random.Random] = None,
+                 intervals: Sequence[int] = DEFAULT_INTERVALS):
+        """Cria a fila com todos os desafios ainda não vistos.
+
+        Args:
+            size: A quantidade de desafios.
+            rng: O gerador aleatório da ordem dos desafios novos.
+            intervals: O intervalo, em rodadas, de cada caixa.
+        """
+        if size < 1:
+            raise ValueError("A fila precisa de pelo menos um item.")
+        if not intervals or min(intervals) < 1:
+            raise ValueError("Os intervalos precisam ser inteiros positivos.")
+        self.size = size
+        self.rng = rng or random.Random()
+        self.intervals = tuple(intervals)
+        self.turn = 0
+        self.last: Optional[int] = None
+        self.pending: Optional[int] = None  # Sorteado e ainda sem resultado
+        self._boxes = array("B", bytes(size))
+        self._ties = 0  # Desempate: ordem de entrada na fila
+        self._heap: List[_Entry] = []
+
+        # Desafios novos, em ordem embaralhada
+        self._new = array("I", range(size))
+        self.rng.shuffle(self._new)
+        self._next_new = 0
+
+    def box(self, index: int) -> int:
+        """Retorna a caixa de Leitner em que um desafio está."""
+        return self._boxes[index]
+
+    def interval(self, box: int) -> int:
+        """Retorna o intervalo, em rodadas, de uma caixa."""
+        last = len(self.intervals) - 1
+        if box <= last:
+            return self.intervals[box]
+        return self.intervals[last] * 2 ** (box - last)
+
+    def draw(self) -> int:
+        """Tira o próximo desafio (O(log n)).
+
+        Uma revisão vencida tem prioridade; se não houver, entra um
+        desafio novo; sem novos, vem a revisão que vence primeiro. Um
+        desafio sorteado que ficou sem resultado (ex: a criança pediu
+        outro) volta para a fila na mesma caixa. O desafio anterior
+        nunca sai duas vezes seguidas, se houver outro.
+        """
+        if self.pending is not None:
+            self._schedule(self.pending, 1)
+            self.pending = None
+        self.turn += 1
+
+        heap = self._heap
+        has_new = self._next_new < len(self._new)
+        if heap and (heap[0][0] <= self.turn or not has_new):
+            entry = heapq.heappop(heap)
+            if entry[2] == self.last and (has_new or heap):
+                if has_new:
+                    heapq.heappush(heap, entry)
+                    index = self._take_new()
+                else:
+                    index = heapq.heapreplace(heap, entry)[2]
+            else:
+                index = entry[2]
+        else:
+            index = self._take_new()
+
+        self.last = self.pending = index
+        return index
+
+    def record(self, index: int, correct: bool):
+        """Registra o resultado de um desafio sorteado.
+
+        Só a primeira resposta depois do sorteio conta: novas tentativas
+        no mesmo desafio (ex: acertar depois de errar) não mudam a caixa.
+
+        Args:
+            index: O índice do desafio respondido.
+            correct: Se a criança acertou.
+        """
+        if index != self.pending:
+            return
+        self.pending = None
+        if correct:
+            box = min(self._boxes[index] + 1, MAX_BOX)
+        else:
+            box = 0
+        self._boxes[index] = box
+        self._schedule(index, self.interval(box))
+
+    def replay(self, history: Iterable[Tuple[int, bool]]):
+        """Refaz respostas de sessões anteriores (ex: de outro dia).
+
+        Cada resposta conta como um sorteio seguido do resultado, na ordem
+        dada; respostas seguidas ao mesmo desafio contam só a primeira,
+        como em `record`. Deve ser chamado com a fila recém-criada.
+
+        Args:
+            history: Pares (índice do desafio, acertou), do mais antigo
+                     ao mais recente. Índices fora da fila são ignorados.
+        """
+        due: Dict[int, int] = {}
+        for index, correct in history:
+            if index == self.last or not 0 <= index < self.size:
+                continue
+            self.turn += 1
+            if correct:
+                box = min(self._boxes[index] + 1, MAX_BOX)
+            else:
+                box = 0
+            self._boxes[index] = box
+            # Reinsere no fim: a ordem do dicionário é a ordem de entrada na fila
+            due.pop(index, None)
+            due[index] = self.turn + self.interval(box)
+            self.last = index
+        if not due:
+            return
+        for index, turn in due.items():
+            self._ties += 1
+            self._heap.append((turn, self._ties, index))
+        heapq.heapify(self._heap)
+        self._new = array("I", (i for i in self._new if i not in due))
+        self._next_new = 0
+
+    def remapped(self, size: int, mapping: Sequence[Optional[int]]) -> "LeitnerScheduler":
+        """Cria a fila para um conteúdo que mudou, mantendo o histórico.
+
+        Os desafios que continuam levam a caixa e a rodada em que vencem;
+        os que saíram são esquecidos e os que chegaram entram como novos.
+
+        Args:
+            size: A nova quantidade de desafios.
+            mapping: Para cada índice antigo, o novo índice do mesmo
+                     desafio (None se ele saiu).
+        """
+        scheduler = LeitnerScheduler(size, self.rng, self.intervals)
+        scheduler.turn, scheduler._ties = self.turn, self._ties
+        entries = list(self._heap)
+        if self.pending is not None:
+            # Sorteado e sem resultado: volta na mesma caixa, como em `draw`
+            entries.append((self.turn + 1, self._ties + 1, self.pending))
+            scheduler._ties += 1
+        seen = set()
+        for turn, tie, index in entries:
+            target = mapping[index]
+            if target is not None:
+                scheduler._boxes[target] = self._boxes[index]
+                scheduler._heap.append((turn, tie, target))
+                seen.add(target)
+        heapq.heapify(scheduler._heap)
+        scheduler._new = array("I", (i for i in scheduler._new if i not in seen))
+        if self.last is not None:
+            scheduler.last = mapping[self.last]
+        return scheduler
+
+    def peek(self, count: int) -> List[int]:
+        """Mostra os prováveis próximos desafios, sem tirá-los.
+
+        Percorre só o topo do heap (O(count log count)). É uma previsão:
+        o resultado da resposta atual ainda pode mudar a ordem.
+        """
+        heap = self._heap
+        found: List[int] = []
+        frontier = [(heap[0], 0)] if heap else []
+        turn, next_new, unseen = self.turn, self._next_new, len(self._new)
+        while len(found) < count:
+            turn += 1
+            if frontier and (frontier[0][0][0] <= turn or next_new >= unseen):
+                entry, position = heapq.heappop(frontier)
+                found.append(entry[2])
+                for child in (2 * position + 1, 2 * position + 2):
+                    if child < len(heap):
+                        heapq.heappush(frontier, (heap[child], child))
+            elif next_new < unseen:
+                found.append(self._new[next_new])
+                next_new += 1
+            else:
+                break
+        return found
+
+    def _take_new(self) -> int:
+        index = self._new[self._next_new]
+        self._next_new += 1
+        return index
+
+    def _schedule(self, index: int, interval: int):
+        self._ties += 1
+        heapq.heappush(self._heap, (self.turn + interval, self._ties, index))
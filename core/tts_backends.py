@@ -0,0 +1,362 @@
+"""Módulo de motores de Text-to-Speech (TTS) intercambiáveis.
+
+Define uma interface simples (`TTSBackend`) e três implementações:
+
+1.  `GTTSBackend`: o Google TTS (online, a voz padrão do app).
+2.  `CommandBackend`: um sintetizador local (ex: espeak-ng) chamado como
+    processo, que funciona sem internet.
+3.  `StubBackend`: um "motor" determinístico em memória, para testes e
+    benchmarks (não faz rede nem processo).
+
+A `TTSChain` encadeia motores na ordem da configuração, cada um com um
+orçamento de latência: se um motor falhar ou estourar o orçamento, o
+próximo da lista é tentado automaticamente.
+
+Cada motor da cadeia tem um disjuntor (`CircuitBreaker`): depois de
+algumas falhas seguidas (ex: Google fora do ar), o motor deixa de ser
+chamado por um tempo que dobra a cada nova falha, e os pedidos vão
+direto para o próximo motor (ou falham na hora) em vez de esperar o
+orçamento estourar de novo.
+"""
+
+import hashlib
+import io
+import shlex
+import subprocess
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import List, Optional, Tuple
+
+from core import config
+
+
+class TTSError(Exception):
+    """Erro levantado quando nenhum motor de TTS conseguiu gerar o áudio."""
+
+
+class TTSUnavailableError(TTSError):
+    """Nenhum motor foi chamado: os disjuntores de todos estão abertos."""
+
+
+class TTSBackend:
+    """Interface de um motor de TTS.
+
+    Subclasses implementam `synthesize`, que retorna os bytes do áudio
+    ou levanta uma exceção em caso de falha.
+    """
+
+    name = "base"
+
+    def synthesize(self, text: str, lang: str, slow: bool,
+                   voice: Optional[str], timeout: Optional[float] = None) -> bytes:
+        """Converte o texto em áudio.
+
+        Args:
+            text: O texto a ser falado.
+            lang: O código do idioma (ex: "pt-br").
+            slow: Se True, a fala é mais lenta.
+            voice: A voz/sotaque (ou None para a padrão do motor).
+            timeout: Tempo máximo sugerido em segundos (ou None).
+
+        Returns:
+            Os bytes do áudio gerado.
+        """
+        raise NotImplementedError
+
+    def voice_key(self, voice: Optional[str]) -> str:
+        """Identifica a voz deste motor na chave do cache de áudio.
+
+        Áudios de motores diferentes não podem se misturar no cache,
+        então cada motor prefixa a voz com o próprio nome.
+        """
+        return f"{self.name}/{voice or ''}"
+
+
+class GTTSBackend(TTSBackend):
+    """Motor online do Google (gTTS). A "voz" é o domínio regional (`tld`).
+
+    O `gtts` (e o `requests` que ele usa) só é importado na primeira
+    síntese: páginas e execuções que só tocam áudio do cache não pagam
+    por essa importação.
+    """
+
+    name = "gtts"
+
+    @staticmethod
+    def preload():
+        """Importa o `gtts` agora (ex: no aquecimento do servidor)."""
+        from gtts import gTTS  # noqa: F401
+
+    def synthesize(self, text: str, lang: str, slow: bool,
+                   voice: Optional[str], timeout: Optional[float] = None) -> bytes:
+        from gtts import gTTS
+
+        options = {"tld": voice} if voice else {}
+        tts = gTTS(text=text, lang=lang, slow=slow, timeout=timeout, **options)
+        buffer = io.BytesIO()
+        tts.write_to_fp(buffer)
+        buffer.seek(0)
+        return buffer.getvalue()
+
+    def voice_key(self, voice: Optional[str]) -> str:
+        # Mantém as chaves originais do cache e do pacote de áudio
+        return voice or ""
+
+
+class CommandBackend(TTSBackend):
+    """Motor local que chama um sintetizador externo como processo.
+
+    O comando é um modelo com os campos `{text}`, `{lang}` e `{speed}`
+    e deve escrever o áudio na saída padrão. O padrão usa o espeak-ng,
+    que gera WAV (os navegadores tocam WAV no `st.audio` normalmente).
+
+    A `voice` recebida é a do gTTS (o domínio regional, ex: "com.br") e
+    não serve para o comando: `{lang}` recebe `config.TTS_COMMAND_VOICE`
+    ou, se vazia, o idioma.
+    """
+
+    name = "espeak"
+
+    def __init__(self, command: Optional[str] = None, voice: Optional[str] = None):
+        self.command = command or config.TTS_COMMAND
+        self.voice = config.TTS_COMMAND_VOICE if voice is None else voice
+
+    def synthesize(self, text: str, lang: str, slow: bool,
+                   voice: Optional[str], timeout: Optional[float] = None) -> bytes:
+        speed = 120 if slow else 160
+        # Cada parte é formatada separadamente: o texto nunca passa pelo shell
+        args = [part.format(text=text, lang=self.voice or lang, speed=speed)
+                for part in shlex.split(self.command)]
+        result = subprocess.run(args, capture_output=True, timeout=timeout, check=False)
+        if result.returncode != 0 or not result.stdout:
+            stderr = result.stderr.decode("utf-8", "replace").strip()
+            raise TTSError(f"'{args[0]}' falhou (código {result.returncode}): {stderr}")
+        return result.stdout
+
+    def voice_key(self, voice: Optional[str]) -> str:
+        return f"{self.name}/{self.voice}"
+
+
+class StubBackend(TTSBackend):
+    """Motor falso e determinístico para testes e benchmarks.
+
+    Gera quadros MP3 válidos (MPEG-1 Layer III, 128 kbps, 44,1 kHz) com
+    conteúdo silencioso; a quantidade de quadros cresce com o tamanho
+    do texto e o primeiro quadro carrega um hash do pedido, então textos
+    diferentes geram bytes diferentes e o mesmo texto gera sempre os
+    mesmos bytes.
+    """
+
+    name = "stub"
+
+    FRAME_HEADER = b"\xff\xfb\x90\x64"
+    FRAME_BYTES = 417  # 144 * 128000 / 44100, sem padding
+    FRAMES_PER_CHAR = 3  # ~80 ms de "fala" por caractere
+
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+
+    def synthesize(self, text: str, lang: str, slow: bool,
+                   voice: Optional[str], timeout: Optional[float] = None) -> bytes:
+        if self.delay:
+            threading.Event().wait(self.delay)
+        digest = hashlib.sha256(
+            "\x1f".join([text, lang, str(slow), voice or ""]).encode("utf-8")
+        ).digest()
+        payload_size = self.FRAME_BYTES - len(self.FRAME_HEADER)
+        silent_frame = self.FRAME_HEADER + bytes(payload_size)
+        first_frame = self.FRAME_HEADER + digest + bytes(payload_size - len(digest))
+        n_frames = max(1, len(text) * self.FRAMES_PER_CHAR * (2 if slow else 1))
+        return first_frame + silent_frame * (n_frames - 1)
+
+
+# Motores disponíveis pelo nome usado na configuração
+BACKENDS = {
+    GTTSBackend.name: GTTSBackend,
+    CommandBackend.name: CommandBackend,
+    StubBackend.name: StubBackend,
+}
+
+
+class CircuitBreaker:
+    """Disjuntor de um motor: evita chamar um motor que está falhando.
+
+    - Fechado: o motor é chamado normalmente.
+    - Aberto: depois de `failure_threshold` falhas seguidas, o motor não
+      é chamado por `backoff` segundos.
+    - Meio-aberto: passado esse tempo, um único pedido de teste é
+      liberado. Se der certo, o disjuntor fecha; se falhar, abre de novo
+      por um tempo duas vezes maior (até `max_backoff`).
+    """
+
+    def __init__(self, failure_threshold: int = 3, backoff: float = 5.0,
+                 max_backoff: float = 300.0, clock=time.monotonic):
+        self.failure_threshold = max(1, failure_threshold)
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self._clock = clock
+        self._failures = 0  # Falhas seguidas
+        self._opens = 0  # Aberturas seguidas (para o tempo dobrar)
+        self._open_until = 0.0
+        self._probing = False  # Pedido de teste em andamento
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        """Diz se o motor pode ser chamado agora (e reserva o pedido de teste)."""
+        with self._lock:
+            if self._failures < self.failure_threshold:
+                return True
+            if self._probing or self._clock() < self._open_until:
+                return False
+            self._probing = True
+            return True
+
+    def record_success(self):
+        """O motor respondeu: fecha o disjuntor."""
+        with self._lock:
+            self._failures = 0
+            self._opens = 0
+            self._probing = False
+
+    def record_failure(self):
+        """O motor falhou ou estourou o orçamento."""
+        with self._lock:
+            self._failures += 1
+            self._probing = False
+            if self._failures >= self.failure_threshold:
+                self._opens += 1
+                wait = min(self.backoff * 2 ** (self._opens - 1), self.max_backoff)
+                self._open_until = self._clock() + wait
+
+    def retry_in(self) -> float:
+        """Segundos até o próximo pedido de teste (0 se o disjuntor está fechado)."""
+        with self._lock:
+            if self._failures < self.failure_threshold:
+                return 0.0
+            return max(0.0, self._open_until - self._clock())
+
+
+class TTSChain:
+    """Lista ordenada de motores, cada um com seu orçamento de latência.
+
+    As sínteses rodam em um pool de threads para que o orçamento possa
+    ser respeitado mesmo quando o motor trava (ex: Wi-Fi instável): ao
+    estourar o tempo, a resposta atrasada é abandonada e o próximo
+    motor é tentado.
+    """
+
+    def __init__(self, backends: List[Tuple[TTSBackend, Optional[float]]]):
+        if not backends:
+            raise ValueError("A cadeia de TTS precisa de pelo menos um motor.")
+        self.backends = backends
+        self.breakers = [
+            CircuitBreaker(config.TTS_BREAKER_FAILURES, config.TTS_BREAKER_BACKOFF,
+                           config.TTS_BREAKER_MAX_BACKOFF)
+            for _ in backends
+        ]
+        self._pool = ThreadPoolExecutor(max_workers=8, thread_name_prefix="tts")
+
+    @property
+    def primary(self) -> TTSBackend:
+        """O motor preferido (o primeiro da configuração)."""
+        return self.backends[0][0]
+
+    def synthesize(self, text: str, lang: str, slow: bool,
+                   voice: Optional[str]) -> Tuple[bytes, TTSBackend]:
+        """Gera o áudio com o primeiro motor que responder dentro do orçamento.
+
+        Returns:
+            Uma tupla (bytes do áudio, motor que gerou o áudio).
+
+        Raises:
+            TTSUnavailableError: Se todos os disjuntores estiverem abertos.
+            TTSError: Se todos os motores falharem ou estourarem o orçamento.
+        """
+        errors = []
+        attempted = False
+        for (backend, budget), breaker in zip(self.backends, self.breakers):
+            if not breaker.allow():
+                errors.append(f"{backend.name}: indisponível "
+                              f"(nova tentativa em {breaker.retry_in():.0f}s)")
+                continue
+            attempted = True
+            future = self._pool.submit(backend.synthesize, text, lang, slow, voice, budget)
+            try:
+                audio_bytes = future.result(timeout=budget)
+            except FutureTimeoutError:
+                breaker.record_failure()
+                errors.append(f"{backend.name}: passou de {budget:g}s")
+            except Exception as e:
+                breaker.record_failure()
+                errors.append(f"{backend.name}: {e}")
+            else:
+                breaker.record_success()
+                return audio_bytes, backend
+        if not attempted:
+            raise TTSUnavailableError("; ".join(errors))
+        raise TTSError("; ".join(errors))
+
+
+def parse_backend_spec(spec: str) -> List[Tuple[str, Optional[float]]]:
+    """Interpreta a configuração "nome[:orçamento],..." (ex: "gtts:4,espeak:2,stub").
+
+    Args:
+        spec: A lista de motores separados por vírgula, com orçamento
+              opcional em segundos.
+
+    Returns:
+        Uma lista de tuplas (nome do motor, orçamento ou None).
+
+    Raises:
+        ValueError: Se um motor não existir ou o orçamento for inválido.
+    """
+    parsed = []
+    for item in spec.split(","):
+        item = item.strip()
+        if not item:
+            continue
+        name, _, budget = item.partition(":")
+        if name not in BACKENDS:
+            raise ValueError(
+                f"Motor de TTS desconhecido: '{name}'. Opções: {', '.join(BACKENDS)}"
+            )
+        parsed.append((name, float(budget) if budget else None))
+    return parsed
+
+
+def build_tts_chain(spec: Optional[str] = None) -> TTSChain:
+    """Monta a cadeia de motores a partir da configuração.
+
+    Args:
+        spec: A especificação dos motores (padrão: `config.TTS_BACKENDS`).
+    """
+    spec = config.TTS_BACKENDS if spec is None else spec
+    return TTSChain([(BACKENDS[name](), budget)
+                     for name, budget in parse_backend_spec(spec)])
+
+
+_tts_chain: Optional[TTSChain] = None
+_tts_chain_lock = threading.Lock()
+
+
+def get_tts_chain() -> TTSChain:
+    """Retorna a cadeia de motores única do processo (criada na 1ª chamada)."""
+    global _tts_chain
+    if _tts_chain is None:
+        with _tts_chain_lock:
+            if _tts_chain is None:
+                _tts_chain = build_tts_chain()
+    return _tts_chain
+
+
+def set_tts_chain(chain: Optional[TTSChain]):
+    """Substitui a cadeia do processo (ex: pelo `StubBackend` em testes).
+
+    Args:
+        chain: A nova cadeia, ou None para voltar à da configuração.
+    """
+    global _tts_chain
+    with _tts_chain_lock:
+        _tts_chain = chain
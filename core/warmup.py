@@ -0,0 +1,204 @@
+"""Módulo de aquecimento do processo do servidor.
+
+Um processo recém-iniciado paga, na primeira criança que abre cada
+página, pelas importações (o `gtts` e o `requests`), pela leitura e
+validação dos arquivos de conteúdo, pelo manifesto das imagens e pela
+leitura dos áudios do disco. O aquecimento faz tudo isso de uma vez,
+em segundo plano, logo na primeira abertura da página inicial
+(`start_background_warmup`), enquanto a criança ainda está escolhendo a
+atividade.
+
+Os áudios são carregados na memória na ordem dos mais tocados (pelo
+registro de progresso) e só a partir do pacote e do cache em disco: o
+aquecimento em segundo plano nunca vai à internet.
+
+Uso:
+    python -m core.warmup               # aquece e mostra o tempo de cada etapa
+    python -m core.warmup --synthesize  # também gera os áudios que faltam
+"""
+
+import argparse
+import importlib
+import sys
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+from core import config
+
+# Módulos que as páginas importam na primeira execução
+PAGE_MODULES = (
+    "core.game_logic",
+    "core.audio_utils",
+    "core.audio_sprite",
+    "core.answer_matching",
+    "core.image_utils",
+)
+
+# O campo com o texto falado de cada jogo (o mesmo das páginas)
+AUDIO_FIELDS = {
+    "complete_word": "full_word",
+    "image_to_word": "correct",
+    "scramble_sentence": "correct",
+    "dictation": "sentence",
+}
+
+_started = False
+_started_lock = threading.Lock()
+_report: List[Tuple[str, float, str]] = []
+
+
+def _import_modules() -> str:
+    for name in PAGE_MODULES:
+        importlib.import_module(name)
+    from core.tts_backends import GTTSBackend, get_tts_chain
+
+    # O gtts só é importado se for um dos motores configurados
+    if any(isinstance(backend, GTTSBackend) for backend, _ in get_tts_chain().backends):
+        GTTSBackend.preload()
+    return f"{len(PAGE_MODULES)} módulos"
+
+
+def _load_catalog() -> str:
+    from core.catalog import SCHEMAS, get_catalog
+
+    catalog = get_catalog()
+    catalog.syllables()
+    items = sum(len(catalog.module(name)) for name in SCHEMAS)
+    return f"{items} itens"
+
+
+def _load_image_manifest() -> str:
+    from core.image_utils import preload_image_manifest
+
+    return f"{preload_image_manifest()} imagens"
+
+
+def hot_texts(limit: Optional[int] = None) -> List[str]:
+    """Lista os textos falados pelo app, os mais tocados primeiro.
+
+    A ordem vem do registro de progresso (desafios com mais respostas);
+    sem registro, é a ordem do `core.audio_pack`.
+
+    Args:
+        limit: Quantos textos, no máximo (padrão: `config.WARMUP_AUDIO_LIMIT`).
+    """
+    from core.audio_pack import collect_speakable_texts
+    from core.catalog import get_catalog
+
+    limit = config.WARMUP_AUDIO_LIMIT if limit is None else limit
+    texts: List[str] = []
+    if config.PROGRESS_DB is not None and config.PROGRESS_DB.exists():
+        from core.progress_store import open_readonly
+
+        connection = open_readonly(config.PROGRESS_DB)
+        try:
+            rows = connection.execute(
+                "SELECT game_key, challenge_id FROM attempts "
+                "GROUP BY game_key, challenge_id ORDER BY COUNT(*) DESC LIMIT ?",
+                (limit,),
+            ).fetchall()
+        finally:
+            connection.close()
+        catalog = get_catalog()
+        for game_key, challenge_id in rows:
+            if game_key not in AUDIO_FIELDS:
+                continue
+            item = catalog.module(game_key).get(challenge_id)
+            if item is not None:
+                texts.append(item[AUDIO_FIELDS[game_key]])
+
+    texts.extend(collect_speakable_texts())
+    return list(dict.fromkeys(texts))[:limit]
+
+
+def _load_audio(synthesize: bool = False) -> str:
+    from core.audio_cache import get_audio_cache
+    from core.audio_utils import audio_cache_key, fetch_audio
+
+    lang, voice = config.TTS_LANG, config.TTS_VOICE or None
+    cache = get_audio_cache()
+    loaded = missing = 0
+    for text in hot_texts():
+        if synthesize:
+            try:
+                fetch_audio(text, lang, False, voice)
+                loaded += 1
+            except Exception:
+                missing += 1
+        elif cache.get(audio_cache_key(text, lang, False, voice)) is not None:
+            loaded += 1  # Lido do pacote/disco e promovido para a memória
+        else:
+            missing += 1
+    return f"{loaded} na memória, {missing} sem áudio"
+
+
+def warm_up(synthesize: bool = False) -> List[Tuple[str, float, str]]:
+    """Aquece o processo: importações, conteúdo, imagens e áudios.
+
+    Uma etapa que falha não interrompe as outras; o erro vai para o
+    relatório.
+
+    Args:
+        synthesize: Se True, gera os áudios que não estão no pacote nem
+                    no disco (vai à internet com o gTTS).
+
+    Returns:
+        O relatório: (etapa, segundos, resultado) de cada etapa.
+    """
+    steps: List[Tuple[str, Callable[[], str]]] = [
+        ("importações", _import_modules),
+        ("conteúdo", _load_catalog),
+        ("imagens", _load_image_manifest),
+        ("áudios", lambda: _load_audio(synthesize)),
+    ]
+    report = []
+    for name, step in steps:
+        start = time.perf_counter()
+        try:
+            result = step()
+        except Exception as e:
+            result = f"falhou: {e}"
+        report.append((name, time.perf_counter() - start, result))
+    _report[:] = report
+    return report
+
+
+def start_background_warmup():
+    """Aquece o processo em uma thread, uma única vez por processo.
+
+    Chamado pela página inicial; não faz nada se `config.WARMUP` estiver
+    desativado ou se o aquecimento já foi iniciado.
+    """
+    global _started
+    if not config.WARMUP or _started:
+        return
+    with _started_lock:
+        if _started:
+            return
+        _started = True
+    threading.Thread(target=warm_up, name="warmup", daemon=True).start()
+
+
+def get_warmup_report() -> Dict[str, Tuple[float, str]]:
+    """Retorna o relatório do último aquecimento (vazio se ainda não terminou)."""
+    return {name: (seconds, result) for name, seconds, result in _report}
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Ponto de entrada da linha de comando."""
+    parser = argparse.ArgumentParser(description="Aquece o processo e mede cada etapa.")
+    parser.add_argument("--synthesize", action="store_true",
+                        help="Gera os áudios que faltam (usa a internet)")
+    args = parser.parse_args(argv)
+
+    total = 0.0
+    for name, seconds, result in warm_up(args.synthesize):
+        total += seconds
+        print(f"{name:<12} {seconds * 1000:>9.1f} ms  {result}")
+    print(f"{'total':<12} {total * 1000:>9.1f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -6,9 +6,11 @@ associando cada letra a uma palavra, imagem e som.
 """
 
 import streamlit as st
-import os
 from core.audio_utils import generate_audio_mp3
+from core.media_registry import media_url
+from core.image_utils import resolve_image
 from core.data_manager import LETTER_EXAMPLES
+from core.metrics import page_span, span
 
 
 def main():
@@ -41,9 +43,11 @@ def main():
             unsafe_allow_html=True
         )
 
-        # Mostra a imagem (com verificação se o arquivo existe)
-        if os.path.exists(caminho_imagem):
-            st.image(caminho_imagem, width=300)
+        # Mostra a imagem (versão redimensionada, se o arquivo existir)
+        imagem = resolve_image(caminho_imagem)
+        if imagem:
+            with span("image.render"):
+                st.image(imagem, width=300)
         else:
             st.warning(
                 f"Imagem {caminho_imagem} não encontrada. "
@@ -59,7 +63,7 @@ def main():
                          width=300):
                 audio_bytes = generate_audio_mp3(letra_escolhida)
                 if audio_bytes:
-                    st.audio(audio_bytes, format='audio/mp3')
+                    st.audio(media_url(audio_bytes), format='audio/mp3')
 
         # Botão para ouvir o som da PALAVRA
         with col2:
@@ -67,8 +71,9 @@ def main():
                          width=300):
                 audio_bytes = generate_audio_mp3(palavra)
                 if audio_bytes:
-                    st.audio(audio_bytes, format='audio/mp3')
+                    st.audio(media_url(audio_bytes), format='audio/mp3')
 
 
 if __name__ == "__main__":
-    main()
+    with page_span(__file__):
+        main()
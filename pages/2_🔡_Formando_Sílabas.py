@@ -7,7 +7,10 @@ consoantes e vogais para formar e ouvir sílabas.
 
 import streamlit as st
 from core.audio_utils import generate_audio_mp3
+from core.media_registry import media_url
+from core.audio_sprite import get_syllable_sprite, syllable_player
 from core.data_manager import SYLLABLE_CONSONANTS, SYLLABLE_VOWELS
+from core.metrics import page_span
 
 def main():
     """Função principal para renderizar a página do Módulo 2."""
@@ -48,11 +51,16 @@ def main():
         unsafe_allow_html=True
     )
 
-    # Gera e exibe o player de áudio para a sílaba
-    # O áudio é gerado a cada seleção de botão
-    audio_bytes = generate_audio_mp3(silaba_formada)
-    if audio_bytes:
-        st.audio(audio_bytes, format='audio/mp3')
+    # Toca a sílaba a partir do sprite (um único áudio com todas as
+    # sílabas, baixado uma vez); trocar a seleção só muda o trecho tocado
+    sprite = get_syllable_sprite()
+    if sprite:
+        syllable_player(silaba_formada, sprite)
+    else:
+        # Sem sprite (ex: sem internet na 1ª execução): áudio avulso
+        audio_bytes = generate_audio_mp3(silaba_formada)
+        if audio_bytes:
+            st.audio(media_url(audio_bytes), format='audio/mp3')
 
     # Botão de reforço positivo
     if st.button("Adorei formar esta sílaba! 🎉", width=300):
@@ -60,4 +68,5 @@ def main():
         st.success(f"EBA! Parabéns por formar a sílaba '{silaba_formada}'!")
 
 if __name__ == "__main__":
-    main()
+    with page_span(__file__):
+        main()
@@ -1,15 +1,29 @@
 # pages/3_🧩_Complete_a_Palavra.py
 """Página Módulo 3: Jogo de Completar a Palavra.
 
-O usuário vê uma imagem e uma palavra incompleta (ex: CA___).
-Ele deve clicar no botão da sílaba correta para completar a palavra.
+O usuário vê uma imagem (ou ouve a palavra, nos desafios sem imagem)
+e uma palavra incompleta (ex: CA___). Ele deve clicar no botão da
+sílaba correta para completar a palavra.
+
+O título, a imagem e a palavra incompleta só são desenhados quando
+o desafio muda; os botões e o resultado ficam em um fragmento
+(`st.fragment`), que roda sozinho a cada clique. Os cliques são
+callbacks (ver `core.game_logic`): cada um custa uma única execução.
 """
 
 import streamlit as st
-import os
-from core.game_logic import initialize_game_state, get_new_challenge, check_user_answer
+from core.game_logic import (
+    initialize_game_state,
+    get_new_challenge,
+    get_current_challenge,
+    check_user_answer,
+    next_challenge
+)
 from core.audio_utils import generate_audio_mp3
+from core.media_registry import media_url
+from core.image_utils import resolve_image
 from core.data_manager import COMPLETE_WORD_CHALLENGES
+from core.metrics import page_span, span
 
 # Chave única para este jogo no session_state
 GAME_KEY = "complete_word"
@@ -20,72 +34,91 @@ def main():
 
     # --- 1. Inicialização do Estado ---
     # Isso garante que nosso "cérebro" para este jogo exista
-    initialize_game_state(GAME_KEY, COMPLETE_WORD_CHALLENGES)
+    initialize_game_state(GAME_KEY, COMPLETE_WORD_CHALLENGES, audio_field="full_word")
 
     # --- 2. Lógica de Carregamento do Desafio ---
-    # Se o jogo é novo ou se o usuário acabou de acertar, pegue um novo desafio
-    if st.session_state[f"{GAME_KEY}_status"] in ["new", "correct"]:
+    # Se o jogo é novo, pegue o primeiro desafio (os próximos são
+    # sorteados pelo botão "Próxima Palavra")
+    if st.session_state[f"{GAME_KEY}_status"] == "new":
         get_new_challenge(GAME_KEY)
 
     # Pega o desafio atual do estado para exibir
-    challenge = st.session_state[f"{GAME_KEY}_challenge"]
+    challenge = get_current_challenge(GAME_KEY)
 
     if not challenge:
         st.error("Erro: Não foi possível carregar um desafio.")
         return
 
     # --- 3. Renderização da UI (Visão) ---
-    st.markdown(f"### O que você vê na imagem? Complete a palavra:")
-
-    # Exibe a imagem
-    if os.path.exists(challenge["image"]):
-        st.image(challenge["image"], width=300)
+    if challenge.get("image"):
+        st.markdown(f"### O que você vê na imagem? Complete a palavra:")
+
+        # Exibe a imagem
+        imagem = resolve_image(challenge["image"])
+        if imagem:
+            with span("image.render"):
+                st.image(imagem, width=300)
+        else:
+            st.error(f"Imagem não encontrada em: {challenge['image']}")
     else:
-        st.error(f"Imagem não encontrada em: {challenge['image']}")
+        # Desafios gerados do léxico (`core.lexicon`) podem não ter imagem:
+        # a palavra é ouvida em vez de vista
+        st.markdown(f"### Ouça a palavra e complete:")
+        audio_bytes = generate_audio_mp3(challenge["full_word"])
+        if audio_bytes:
+            st.audio(media_url(audio_bytes))
 
     # Exibe o prompt (ex: "CA ___")
     st.header(challenge["prompt"])
 
     st.divider()
-    st.write("Clique na sílaba correta:")
-
-    # Cria colunas para os botões de opção
-    options = challenge["options"]
-    cols = st.columns(len(options))
-
-    for i, option in enumerate(options):
-        with cols[i]:
-            # --- 4. Lógica de Verificação (Controle) ---
-            if st.button(option, key=f"{GAME_KEY}_{option}", width=300):
-                # O usuário clicou, vamos checar a resposta
-                check_user_answer(GAME_KEY, option)
-                # Força um rerun imediato para mostrar o feedback (Correto/Errado)
-                st.rerun()
-
-    # --- 5. Feedback (Reação ao Estado) ---
-    game_status = st.session_state[f"{GAME_KEY}_status"]
-
-    if game_status == "correct":
-        full_word = challenge["full_word"]
-        st.success(f"**ISSO AÍ!** Você formou a palavra **{full_word}**!")
-        st.balloons()
-
-        # Toca o som da palavra completa
-        audio_bytes = generate_audio_mp3(full_word)
-        if audio_bytes:
-            st.audio(audio_bytes, autoplay=True)
+    answer_area()
+
+
+@st.fragment
+def answer_area():
+    """Botões das sílabas e resultado (roda de novo a cada clique)."""
+    with page_span(__file__, "page.fragment"):
+        challenge = get_current_challenge(GAME_KEY)
+        st.write("Clique na sílaba correta:")
+
+        game_status = st.session_state[f"{GAME_KEY}_status"]
+
+        # Cria colunas para os botões de opção
+        options = challenge["options"]
+        cols = st.columns(len(options))
+
+        for i, option in enumerate(options):
+            with cols[i]:
+                # --- 4. Lógica de Verificação (Controle) ---
+                # O clique checa a resposta antes de a área ser desenhada
+                # (desabilitado depois que o usuário acertou)
+                st.button(option, key=f"{GAME_KEY}_{option}", width=300,
+                          disabled=(game_status == "correct"),
+                          on_click=check_user_answer, args=(GAME_KEY, option))
+
+        # --- 5. Feedback (Reação ao Estado) ---
+
+        if game_status == "correct":
+            full_word = challenge["full_word"]
+            st.success(f"**ISSO AÍ!** Você formou a palavra **{full_word}**!")
+            st.balloons()
+
+            # Toca o som da palavra completa
+            audio_bytes = generate_audio_mp3(full_word)
+            if audio_bytes:
+                st.audio(media_url(audio_bytes), autoplay=True)
 
-        # Botão para ir para o próximo desafio
-        if st.button("Próxima Palavra ➔", width=300, type="primary"):
-            # O status já é "correct", então no próximo rerun ele vai
-            # acionar a lógica no passo 2 e pegar um novo desafio.
-            st.rerun()
+            # Botão para ir para o próximo desafio (a página inteira roda
+            # de novo, já com a nova imagem)
+            st.button("Próxima Palavra ➔", width=300, type="primary",
+                      on_click=next_challenge, args=(GAME_KEY,))
 
-    elif game_status == "wrong":
-        st.error("Ops! Tente de novo. Você consegue!")
-        # Reseta o status para "playing" para permitir nova tentativa
-        st.session_state[f"{GAME_KEY}_status"] = "playing"
+        elif game_status == "wrong":
+            # O aviso fica até a próxima tentativa
+            st.error("Ops! Tente de novo. Você consegue!")
 
 
 if __name__ == "__main__":
-    main()
+    with page_span(__file__):
+        main()
@@ -2,14 +2,30 @@
 """Página Módulo 4: Jogo de Escrita (O que é isso?).
 
 O usuário vê uma imagem e deve escrever o nome do objeto
-em um campo de texto (st.text_input).
+em um campo de texto (st.text_input). Acentos e maiúsculas não são
+exigidos; quando erra, a criança vê onde estão as letras trocadas.
+
+O título e a imagem só são desenhados quando o desafio muda; o campo
+de resposta e o resultado ficam em um fragmento (`st.fragment`), que
+roda sozinho a cada envio.
 """
 
 import streamlit as st
-import os
-from core.game_logic import initialize_game_state, get_new_challenge, check_user_answer
+from core.game_logic import (
+    initialize_game_state,
+    get_new_challenge,
+    get_current_challenge,
+    answer_input_key,
+    get_last_match,
+    next_challenge,
+    submit_typed_answer
+)
+from core.answer_matching import diagnostic_markdown
 from core.audio_utils import generate_audio_mp3
+from core.media_registry import media_url
+from core.image_utils import resolve_image
 from core.data_manager import IMAGE_TO_WORD_CHALLENGES
+from core.metrics import page_span, span
 
 # Chave única para este jogo no session_state
 GAME_KEY = "image_to_word"
@@ -20,13 +36,14 @@ def main():
     st.title("🖼️ O que é isso?")
 
     # --- 1. Inicialização do Estado ---
-    initialize_game_state(GAME_KEY, IMAGE_TO_WORD_CHALLENGES)
+    initialize_game_state(GAME_KEY, IMAGE_TO_WORD_CHALLENGES, audio_field="correct")
 
     # --- 2. Lógica de Carregamento do Desafio ---
-    if st.session_state[f"{GAME_KEY}_status"] in ["new", "correct"]:
+    # (os próximos desafios são sorteados pelo botão "Próxima")
+    if st.session_state[f"{GAME_KEY}_status"] == "new":
         get_new_challenge(GAME_KEY)
 
-    challenge = st.session_state[f"{GAME_KEY}_challenge"]
+    challenge = get_current_challenge(GAME_KEY)
 
     if not challenge:
         st.error("Erro: Não foi possível carregar um desafio.")
@@ -36,60 +53,76 @@ def main():
     st.markdown("### Olhe a imagem e escreva o nome dela abaixo:")
 
     # Exibe a imagem (usando a correção 'use_container_width')
-    if os.path.exists(challenge["image"]):
-        st.image(challenge["image"], width=300)
+    imagem = resolve_image(challenge["image"])
+    if imagem:
+        with span("image.render"):
+            st.image(imagem, width=300)
     else:
         st.error(f"Imagem não encontrada em: {challenge['image']}")
 
-    # --- 4. Lógica de Verificação (Controle) ---
-    # Usamos st.form para agrupar o text_input e o botão
-    # Isso evita que a página recarregue a cada letra digitada
-    with st.form(key=f"{GAME_KEY}_form"):
-        user_answer = st.text_input(
-            "Escreva sua resposta aqui:",
-            placeholder="Digite a palavra...",
-            # Desabilita o campo se o usuário já acertou
-            disabled=(st.session_state[f"{GAME_KEY}_status"] == "correct")
-        )
-
-        submit_button = st.form_submit_button(
-            "Verificar Resposta ✅",
-            width=300,
-            # Desabilita o botão se já acertou
-            disabled=(st.session_state[f"{GAME_KEY}_status"] == "correct")
-        )
-
-        if submit_button:
-            # O formulário foi enviado, vamos checar a resposta
-            check_user_answer(GAME_KEY, user_answer)
-            # st.rerun() não é estritamente necessário aqui
-            # porque o st.form já causa um rerun, mas podemos
-            # garantir o fluxo se precisarmos. Vamos testar sem.
-
-    # --- 5. Feedback (Reação ao Estado) ---
-    game_status = st.session_state[f"{GAME_KEY}_status"]
-
-    if game_status == "correct":
-        correct_word = challenge["correct"]
-        st.success(f"**PERFEITO!** Você escreveu **{correct_word}** corretamente!")
-        st.balloons()
-
-        # Toca o som da palavra correta
-        audio_bytes = generate_audio_mp3(correct_word)
-        if audio_bytes:
-            st.audio(audio_bytes, autoplay=True)
-
-        # Botão para ir para o próximo desafio
-        if st.button("Próxima Imagem ➔", width=300, type="primary"):
-            # O status já é "correct", então no próximo rerun ele vai
-            # acionar a lógica no passo 2 e pegar um novo desafio.
-            st.rerun()
-
-    elif game_status == "wrong":
-        st.error("Ops, não foi bem isso. Tente de novo! Você consegue!")
-        # Reseta o status para "playing" para permitir nova tentativa
-        st.session_state[f"{GAME_KEY}_status"] = "playing"
+    answer_area()
+
+
+@st.fragment
+def answer_area():
+    """Campo de resposta e resultado (roda de novo a cada envio)."""
+    with page_span(__file__, "page.fragment"):
+        challenge = get_current_challenge(GAME_KEY)
+
+        # --- 4. Lógica de Verificação (Controle) ---
+        # Usamos st.form para agrupar o text_input e o botão
+        # Isso evita que a página recarregue a cada letra digitada
+        # O envio é um callback: a resposta é checada antes de a área
+        # ser desenhada, já com o resultado
+        game_status = st.session_state[f"{GAME_KEY}_status"]
+        with st.form(key=f"{GAME_KEY}_form"):
+            st.text_input(
+                "Escreva sua resposta aqui:",
+                placeholder="Digite a palavra...",
+                key=answer_input_key(GAME_KEY),
+                # Desabilita o campo se o usuário já acertou
+                disabled=(game_status == "correct")
+            )
+
+            st.form_submit_button(
+                "Verificar Resposta ✅",
+                width=300,
+                # Desabilita o botão se já acertou
+                disabled=(game_status == "correct"),
+                on_click=submit_typed_answer,
+                args=(GAME_KEY,)
+            )
+
+        # --- 5. Feedback (Reação ao Estado) ---
+        if game_status == "correct":
+            correct_word = challenge["correct"]
+            st.success(f"**PERFEITO!** Você escreveu **{correct_word}** corretamente!")
+            st.balloons()
+
+            # Certo, mas sem os acentos: mostra como se escreve
+            match = get_last_match(GAME_KEY)
+            if match is not None and not match.exact:
+                st.info(f"Repare nos acentos: escrevemos **{correct_word}**.")
+
+            # Toca o som da palavra correta
+            audio_bytes = generate_audio_mp3(correct_word)
+            if audio_bytes:
+                st.audio(media_url(audio_bytes), autoplay=True)
+
+            # Botão para ir para o próximo desafio (a página inteira roda
+            # de novo, já com o novo desafio)
+            st.button("Próxima Imagem ➔", width=300, type="primary",
+                      on_click=next_challenge, args=(GAME_KEY,))
+
+        elif game_status == "wrong":
+            # O aviso fica até a próxima tentativa
+            st.error("Ops, não foi bem isso. Tente de novo! Você consegue!")
+            # Dica: as letras erradas ficam marcadas em vermelho
+            hint = diagnostic_markdown(get_last_match(GAME_KEY))
+            if hint:
+                st.markdown(f"Você escreveu: {hint}")
 
 
 if __name__ == "__main__":
-    main()
+    with page_span(__file__):
+        main()
@@ -2,37 +2,54 @@
 """Página Módulo 5: Jogo de Organizar a Frase.
 
 O usuário vê uma imagem e "peças" (botões) de uma frase.
-Ele deve clicar nos botões na ordem correta para formar a frase.
+Ele deve clicar nos botões na ordem correta para formar a frase;
+"Desfazer" devolve a última peça e "Limpar" devolve todas.
+
+O título e a imagem só são desenhados quando o desafio muda; a frase
+montada, as palavras e os botões de ação ficam em um fragmento
+(`st.fragment`), que roda sozinho a cada clique. Os cliques são
+callbacks (ver `core.game_logic`): cada um custa uma única execução.
 """
 
 import streamlit as st
-import os
 from core.game_logic import (
     initialize_scramble_game,
     setup_scramble_challenge,
+    get_current_challenge,
+    get_scramble_attempt,
+    get_scramble_buttons,
     add_word_to_scramble_attempt,
+    undo_scramble_move,
     clear_scramble_attempt,
-    check_scramble_answer
+    check_scramble_answer,
+    next_scramble_challenge
 )
 from core.audio_utils import generate_audio_mp3
+from core.media_registry import media_url
+from core.image_utils import resolve_image
 from core.data_manager import SENTENCE_SCRAMBLE_CHALLENGES
+from core.metrics import page_span, span
 
 # Chave única para este jogo no session_state
 GAME_KEY = "scramble_sentence"
 
+# Máximo de botões de palavras por linha (frases longas quebram em linhas)
+WORDS_PER_ROW = 6
+
 
 def main():
     """Função principal para renderizar a página do Módulo 5."""
     st.title("✍️ Organize a Frase")
 
     # --- 1. Inicialização do Estado ---
-    initialize_scramble_game(GAME_KEY, SENTENCE_SCRAMBLE_CHALLENGES)
+    initialize_scramble_game(GAME_KEY, SENTENCE_SCRAMBLE_CHALLENGES, audio_field="correct")
 
     # --- 2. Lógica de Carregamento do Desafio ---
-    if st.session_state[f"{GAME_KEY}_status"] in ["new", "correct"]:
+    # (os próximos desafios são sorteados pelo botão "Próxima Frase")
+    if st.session_state[f"{GAME_KEY}_status"] == "new":
         setup_scramble_challenge(GAME_KEY)
 
-    challenge = st.session_state[f"{GAME_KEY}_challenge"]
+    challenge = get_current_challenge(GAME_KEY)
 
     if not challenge:
         st.error("Erro: Não foi possível carregar um desafio.")
@@ -41,69 +58,91 @@ def main():
     # --- 3. Renderização da UI (Visão) ---
     st.markdown("### Olhe a imagem e clique nas palavras na ordem certa:")
 
-    if os.path.exists(challenge["image"]):
-        st.image(challenge["image"], width=300)
+    imagem = resolve_image(challenge["image"])
+    if imagem:
+        with span("image.render"):
+            st.image(imagem, width=300)
     else:
         st.error(f"Imagem não encontrada em: {challenge['image']}")
 
     st.divider()
 
-    # Caixa de "Resposta do Usuário"
-    user_attempt_list = st.session_state[f"{GAME_KEY}_user_attempt"]
-    if not user_attempt_list:
-        st.info("Clique nos botões abaixo para montar sua frase aqui...")
-    else:
-        # Mostra a frase sendo montada
-        st.subheader(" ".join(user_attempt_list))
-
-    st.divider()
-
-    # Botões de Palavras (Palavras Restantes)
-    remaining_words = st.session_state[f"{GAME_KEY}_remaining_words"]
-    if remaining_words:
-        # Exibe os botões em colunas
-        cols = st.columns(len(remaining_words))
-        for i, word in enumerate(remaining_words):
-            with cols[i]:
-                if st.button(word, key=f"word_{word}_{i}", width=300):
-                    add_word_to_scramble_attempt(GAME_KEY, word)
-                    st.rerun()
-
-    # --- 4. Botões de Ação (Controle) ---
-    game_status = st.session_state[f"{GAME_KEY}_status"]
-
-    # Só mostra "Verificar" se o usuário usou todas as palavras
-    if not remaining_words and game_status == "playing":
-        if st.button("Verificar Frase ✅", width=300, type="primary"):
-            check_scramble_answer(GAME_KEY)
-            st.rerun()
-
-    # Botão para Limpar a tentativa
-    if user_attempt_list and game_status == "playing":
-        if st.button("Limpar ❌", width=300):
-            clear_scramble_attempt(GAME_KEY)
-            st.rerun()
-
-    # --- 5. Feedback (Reação ao Estado) ---
-    if game_status == "correct":
-        correct_sentence = challenge["correct"]
-        st.success(f"**EXCELENTE!** A frase está correta: **{correct_sentence}**")
-        st.balloons()
-
-        audio_bytes = generate_audio_mp3(correct_sentence)
-        if audio_bytes:
-            st.audio(audio_bytes, autoplay=True)
-
-        if st.button("Próxima Frase ➔", width=300, type="primary"):
-            st.rerun()
-
-    elif game_status == "wrong":
-        st.error("Ops! Essa não é a ordem correta. Tente de novo!")
-        # Permite ao usuário tentar de novo
-        if st.button("Tentar Novamente 🔄", width=300):
-            clear_scramble_attempt(GAME_KEY)
-            st.rerun()
+    answer_area()
+
+
+@st.fragment
+def answer_area():
+    """Frase montada, palavras e botões de ação (roda de novo a cada clique)."""
+    with page_span(__file__, "page.fragment"):
+        challenge = get_current_challenge(GAME_KEY)
+
+        # Caixa de "Resposta do Usuário"
+        user_attempt_list = get_scramble_attempt(GAME_KEY)
+        if not user_attempt_list:
+            st.info("Clique nos botões abaixo para montar sua frase aqui...")
+        else:
+            # Mostra a frase sendo montada
+            st.subheader(" ".join(user_attempt_list))
+
+        st.divider()
+
+        # Botões de Palavras (Palavras Restantes), identificados pela
+        # posição da palavra no desafio: palavras repetidas são botões diferentes
+        remaining_words = get_scramble_buttons(GAME_KEY)
+        for start in range(0, len(remaining_words), WORDS_PER_ROW):
+            row = remaining_words[start:start + WORDS_PER_ROW]
+            # Exibe os botões em colunas
+            cols = st.columns(len(row))
+            for col, (token, word) in zip(cols, row):
+                with col:
+                    st.button(word, key=f"{GAME_KEY}_token_{token}", width=300,
+                              on_click=add_word_to_scramble_attempt, args=(GAME_KEY, token))
+
+        # --- 4. Botões de Ação (Controle) ---
+        # Todos são callbacks: o estado já muda antes de a área ser desenhada
+        game_status = st.session_state[f"{GAME_KEY}_status"]
+
+        # Só mostra "Verificar" se o usuário usou todas as palavras
+        if not remaining_words and game_status == "playing":
+            st.button("Verificar Frase ✅", width=300, type="primary",
+                      on_click=check_scramble_answer, args=(GAME_KEY,))
+
+        # Botões para desfazer a última palavra ou limpar a tentativa
+        if user_attempt_list and game_status == "playing":
+            col_undo, col_clear = st.columns(2)
+            with col_undo:
+                st.button("Desfazer ↩️", width=300,
+                          on_click=undo_scramble_move, args=(GAME_KEY,))
+            with col_clear:
+                st.button("Limpar ❌", width=300,
+                          on_click=clear_scramble_attempt, args=(GAME_KEY,))
+
+        # --- 5. Feedback (Reação ao Estado) ---
+        if game_status == "correct":
+            correct_sentence = challenge["correct"]
+            st.success(f"**EXCELENTE!** A frase está correta: **{correct_sentence}**")
+            st.balloons()
+
+            audio_bytes = generate_audio_mp3(correct_sentence)
+            if audio_bytes:
+                st.audio(media_url(audio_bytes), autoplay=True)
+
+            # Novo desafio: a página inteira roda de novo
+            st.button("Próxima Frase ➔", width=300, type="primary",
+                      on_click=next_scramble_challenge, args=(GAME_KEY,))
+
+        elif game_status == "wrong":
+            st.error("Ops! Essa não é a ordem correta. Tente de novo!")
+            # Permite ao usuário tentar de novo (do zero ou a partir do fim)
+            col_retry, col_undo = st.columns(2)
+            with col_retry:
+                st.button("Tentar Novamente 🔄", width=300,
+                          on_click=clear_scramble_attempt, args=(GAME_KEY,))
+            with col_undo:
+                st.button("Desfazer ↩️", key=f"{GAME_KEY}_undo_wrong", width=300,
+                          on_click=undo_scramble_move, args=(GAME_KEY,))
 
 
 if __name__ == "__main__":
-    main()
+    with page_span(__file__):
+        main()
@@ -2,14 +2,32 @@
 """Página Módulo 6: Jogo de Ditado de Frases.
 
 O usuário ouve uma frase e deve escrevê-la corretamente
-em um campo de texto.
+em um campo de texto. Acentos, maiúsculas e pontuação não são exigidos;
+quando erra, a criança vê quais palavras e letras precisa corrigir.
+
+O título e a imagem só são desenhados quando o desafio muda; o botão
+de ouvir e o campo de resposta ficam em fragmentos (`st.fragment`),
+que rodam sozinhos a cada clique ou envio. O envio e o botão
+"Próximo" são callbacks (ver `core.game_logic`): cada um custa uma
+única execução.
 """
 
 import streamlit as st
-import os
-from core.game_logic import initialize_game_state, get_new_challenge, check_user_answer
+from core.game_logic import (
+    initialize_game_state,
+    get_new_challenge,
+    get_current_challenge,
+    answer_input_key,
+    get_last_match,
+    next_challenge,
+    submit_typed_answer
+)
+from core.answer_matching import diagnostic_markdown
 from core.audio_utils import generate_audio_mp3
+from core.media_registry import media_url
+from core.image_utils import resolve_image
 from core.data_manager import DICTATION_CHALLENGES
+from core.metrics import page_span, span
 
 # Chave única para este jogo no session_state
 GAME_KEY = "dictation"
@@ -21,13 +39,14 @@ def main():
 
     # --- 1. Inicialização do Estado ---
     # Usando a lógica de jogo PADRÃO (a mesma dos módulos 3 e 4)
-    initialize_game_state(GAME_KEY, DICTATION_CHALLENGES)
+    initialize_game_state(GAME_KEY, DICTATION_CHALLENGES, audio_field="sentence")
 
     # --- 2. Lógica de Carregamento do Desafio ---
-    if st.session_state[f"{GAME_KEY}_status"] in ["new", "correct"]:
+    # (os próximos desafios são sorteados pelo botão "Próxima")
+    if st.session_state[f"{GAME_KEY}_status"] == "new":
         get_new_challenge(GAME_KEY)
 
-    challenge = st.session_state[f"{GAME_KEY}_challenge"]
+    challenge = get_current_challenge(GAME_KEY)
 
     if not challenge:
         st.error("Erro: Não foi possível carregar um desafio.")
@@ -36,51 +55,78 @@ def main():
     # --- 3. Renderização da UI (Visão) ---
     st.markdown("### Ouça a frase e escreva o que você ouviu:")
 
-    if os.path.exists(challenge["image"]):
-        st.image(challenge["image"], width=300)
+    imagem = resolve_image(challenge["image"])
+    if imagem:
+        with span("image.render"):
+            st.image(imagem, width=300)
     else:
         st.warning(f"Imagem de dica não encontrada em: {challenge['image']}")
 
-    # Botão para tocar o áudio
-    sentence_to_say = challenge["sentence"]
-    if st.button("Ouvir a frase 🔊", width=300):
-        audio_bytes = generate_audio_mp3(sentence_to_say)
-        if audio_bytes:
-            st.audio(audio_bytes, autoplay=True)
-
-    # --- 4. Lógica de Verificação (Controle) ---
-    with st.form(key=f"{GAME_KEY}_form"):
-        user_answer = st.text_input(
-            "Escreva a frase aqui:",
-            disabled=(st.session_state[f"{GAME_KEY}_status"] == "correct")
-        )
-
-        submit_button = st.form_submit_button(
-            "Verificar Ditado ✅",
-            width=300,
-            disabled=(st.session_state[f"{GAME_KEY}_status"] == "correct")
-        )
-
-        if submit_button:
-            # Reutilizando a função de checagem padrão
-            check_user_answer(GAME_KEY, user_answer)
-
-    # --- 5. Feedback (Reação ao Estado) ---
-    game_status = st.session_state[f"{GAME_KEY}_status"]
-
-    if game_status == "correct":
-        correct_sentence = challenge["correct"]
-        st.success(f"**MUITO BEM!** Você escreveu: **{correct_sentence}**")
-        st.balloons()
-
-        if st.button("Próximo Ditado ➔", width=300, type="primary"):
-            st.rerun()
-
-    elif game_status == "wrong":
-        st.error("Quase! Ouça de novo e tente corrigir.")
-        # Reseta o status para permitir nova tentativa
-        st.session_state[f"{GAME_KEY}_status"] = "playing"
+    listen_button()
+    answer_area()
+
+
+@st.fragment
+def listen_button():
+    """Botão para tocar o áudio (o clique não redesenha a página)."""
+    with page_span(__file__, "page.fragment"):
+        sentence_to_say = get_current_challenge(GAME_KEY)["sentence"]
+        if st.button("Ouvir a frase 🔊", width=300):
+            audio_bytes = generate_audio_mp3(sentence_to_say)
+            if audio_bytes:
+                st.audio(media_url(audio_bytes), autoplay=True)
+
+
+@st.fragment
+def answer_area():
+    """Campo de resposta e resultado (roda de novo a cada envio)."""
+    with page_span(__file__, "page.fragment"):
+        challenge = get_current_challenge(GAME_KEY)
+
+        # --- 4. Lógica de Verificação (Controle) ---
+        # O envio é um callback: a frase é checada antes de a área ser
+        # desenhada, já com o resultado
+        game_status = st.session_state[f"{GAME_KEY}_status"]
+        with st.form(key=f"{GAME_KEY}_form"):
+            st.text_input(
+                "Escreva a frase aqui:",
+                key=answer_input_key(GAME_KEY),
+                disabled=(game_status == "correct")
+            )
+
+            st.form_submit_button(
+                "Verificar Ditado ✅",
+                width=300,
+                disabled=(game_status == "correct"),
+                on_click=submit_typed_answer,
+                args=(GAME_KEY,)
+            )
+
+        # --- 5. Feedback (Reação ao Estado) ---
+        if game_status == "correct":
+            correct_sentence = challenge["correct"]
+            st.success(f"**MUITO BEM!** Você escreveu: **{correct_sentence}**")
+            st.balloons()
+
+            # Certo, mas sem os acentos: mostra como se escreve
+            match = get_last_match(GAME_KEY)
+            if match is not None and not match.exact:
+                st.info(f"Repare nos acentos: {diagnostic_markdown(match, reveal=True)}")
+
+            # Botão para ir para o próximo desafio (a página inteira roda
+            # de novo, já com o novo desafio)
+            st.button("Próximo Ditado ➔", width=300, type="primary",
+                      on_click=next_challenge, args=(GAME_KEY,))
+
+        elif game_status == "wrong":
+            # O aviso fica até a próxima tentativa
+            st.error("Quase! Ouça de novo e tente corrigir.")
+            # Dica: palavras e letras erradas em vermelho, "_" onde faltou
+            hint = diagnostic_markdown(get_last_match(GAME_KEY))
+            if hint:
+                st.markdown(f"Você escreveu: {hint}")
 
 
 if __name__ == "__main__":
-    main()
+    with page_span(__file__):
+        main()
@@ -0,0 +1,134 @@
+# pages/7_📊_Painel_do_Professor.py
+"""Página do Painel do Professor.
+
+Mostra as estatísticas das respostas gravadas (ver `core.analytics`),
+da turma toda ou de uma criança: acerto por letra e por sílaba, as
+sílabas mais confundidas, o tempo de resposta e as palavras do ditado
+com mais erros.
+"""
+
+import pandas as pd
+import streamlit as st
+from core.analytics import LATENCY_BINS, get_analytics_engine
+from core.metrics import page_span
+
+# Nomes dos jogos como aparecem no menu
+GAME_NAMES = {
+    "complete_word": "Complete a Palavra",
+    "image_to_word": "O que é isso?",
+    "scramble_sentence": "Organize a Frase",
+    "dictation": "Ditado de Frases",
+}
+
+
+def _percent(value):
+    return "—" if value is None else f"{value:.0%}"
+
+
+def main():
+    """Função principal para renderizar o painel."""
+    st.title("📊 Painel do Professor")
+
+    engine = get_analytics_engine()
+    if engine is None:
+        st.warning("O registro de progresso está desativado (ALFABETIZACAO_PROGRESS_DB).")
+        return
+
+    # Só lê do banco as respostas gravadas desde a última visita
+    engine.refresh()
+    if not len(engine):
+        st.info("Ainda não há respostas registradas. Elas aparecem aqui "
+                "assim que as crianças jogarem os módulos 3 a 6.")
+        return
+
+    # --- 1. Filtro: turma toda ou uma criança ---
+    class_label = "Turma toda"
+    choice = st.selectbox("Ver o progresso de:", [class_label] + engine.learner_ids())
+    learner = None if choice == class_label else choice
+    # O clique já roda a página de novo, que lê as respostas novas acima
+    st.button("Atualizar 🔄")
+
+    summary = engine.summary(learner)
+    col1, col2, col3 = st.columns(3)
+    col1.metric("Respostas", f"{summary['attempts']:,}".replace(",", "."))
+    col2.metric("Acertos", _percent(summary["accuracy"]))
+    median = summary["median_latency"]
+    col3.metric("Tempo mediano", "—" if median is None else f"{median:.1f} s")
+
+    st.divider()
+
+    # --- 2. Acerto por letra e por sílaba ---
+    st.subheader("Acerto por letra inicial")
+    by_letter = engine.accuracy_by_letter(learner)
+    if by_letter:
+        table = pd.DataFrame(by_letter).set_index("label").sort_index()
+        st.bar_chart(table["accuracy"], y_label="acerto")
+    else:
+        st.caption("Sem respostas nos jogos de palavras.")
+
+    st.subheader("Acerto por sílaba (Complete a Palavra)")
+    by_syllable = engine.accuracy_by_syllable(learner)
+    if by_syllable:
+        table = pd.DataFrame(by_syllable).set_index("label").sort_index()
+        st.bar_chart(table["accuracy"], y_label="acerto")
+    else:
+        st.caption("Sem respostas no Complete a Palavra.")
+
+    st.subheader("Sílabas mais confundidas")
+    confused = engine.confused_syllables(learner)
+    if confused:
+        st.dataframe(
+            pd.DataFrame(confused).rename(columns={
+                "expected": "Sílaba certa", "chosen": "Escolhida", "count": "Vezes"
+            }),
+            hide_index=True,
+        )
+    else:
+        st.caption("Nenhuma troca de sílaba registrada.")
+
+    st.divider()
+
+    # --- 3. Tempo de resposta ---
+    st.subheader("Tempo de resposta")
+    latency = engine.latency_distribution(learner)
+    if latency:
+        labels = [f"{low}–{high} s" if high != float("inf") else f"{low}+ s"
+                  for low, high in zip(LATENCY_BINS, LATENCY_BINS[1:])]
+        histogram = pd.DataFrame(
+            {GAME_NAMES.get(game, game): stats["histogram"]
+             for game, stats in latency.items()},
+            index=pd.CategoricalIndex(labels, categories=labels, ordered=True),
+        )
+        st.bar_chart(histogram, x_label="tempo", y_label="respostas")
+        st.dataframe(
+            pd.DataFrame([
+                {"Jogo": GAME_NAMES.get(game, game), "Respostas": stats["attempts"],
+                 "Mediana (s)": round(stats["p50"], 1), "90% até (s)": round(stats["p90"], 1)}
+                for game, stats in latency.items()
+            ]),
+            hide_index=True,
+        )
+    else:
+        st.caption("Sem tempos de resposta registrados.")
+
+    st.divider()
+
+    # --- 4. Ditado ---
+    st.subheader("Palavras do ditado com mais erros")
+    words = engine.dictation_word_errors(learner)
+    if words:
+        st.dataframe(
+            pd.DataFrame([
+                {"Palavra": w["label"], "Vezes no ditado": w["attempts"],
+                 "Erros": _percent(w["error_rate"])}
+                for w in words
+            ]),
+            hide_index=True,
+        )
+    else:
+        st.caption("Sem respostas no Ditado de Frases.")
+
+
+if __name__ == "__main__":
+    with page_span(__file__):
+        main()